@@ -1,11 +1,30 @@
-from .analytic_scoring_agent import AnalyticScoringAgent
-from .holistic_scoring_agent import HolisticScoringAgent
-from .off_topic_detection_agent import OffTopicDetectionAgent
-from .score_adjustment_agent import ScoreAdjustmentAgent
+from importlib import import_module
+
+# Loaded on first access, so importing one agent module (e.g. the score
+# adjustment) does not pull in every agent and its client (PEP 562).
+_EXPORTS = {
+    'AnalyticScoringAgent': '.analytic_scoring_agent',
+    'HolisticScoringAgent': '.holistic_scoring_agent',
+    'OffTopicDetectionAgent': '.off_topic_detection_agent',
+    'CombinedScoringAgent': '.combined_scoring_agent',
+    'ScoreAdjustmentAgent': '.score_adjustment_agent',
+    'AgentPool': '.agent_pool'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'AnalyticScoringAgent',
     'HolisticScoringAgent',
     'OffTopicDetectionAgent',
-    'ScoreAdjustmentAgent'
-] 
\ No newline at end of file
+    'CombinedScoringAgent',
+    'ScoreAdjustmentAgent',
+    'AgentPool'
+]
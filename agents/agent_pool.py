@@ -0,0 +1,103 @@
+import sqlite3
+from typing import Callable, Dict, Iterable, Optional
+from agents.analytic_scoring_agent import AnalyticScoringAgent
+from agents.holistic_scoring_agent import HolisticScoringAgent
+from agents.off_topic_detection_agent import OffTopicDetectionAgent
+from agents.combined_scoring_agent import CombinedScoringAgent
+from agents.base_agent import BaseScoringAgent
+from agents.backends import ScoringBackend, create_backend, get_backend_class
+from utils.config_manager import ConfigManager
+from utils.audio_payload import AudioStore
+from utils.audio_preprocessing import AudioPreprocessor
+from utils.result_cache import ResultCache
+
+DEFAULT_PROMPT_CACHE_TTL = 3600
+
+
+class AgentPool:
+    """
+    Builds each enabled scoring agent once per run and hands the same
+    instances to every file.
+
+    Agents configured with the same API key also share one backend. In combined
+    mode a single CombinedScoringAgent replaces the per-dimension agents.
+    """
+    AGENT_CLASSES = {
+        'analytic': AnalyticScoringAgent,
+        'holistic': HolisticScoringAgent,
+        'off_topic': OffTopicDetectionAgent,
+    }
+
+    def __init__(self, scoring_options: dict,
+                 backend_factory: Optional[Callable[[str, str], ScoringBackend]] = None):
+        enabled = {option: agent_class for option, agent_class in self.AGENT_CLASSES.items()
+                   if scoring_options.get(option)}
+        if scoring_options.get('combined') and enabled:
+            enabled = {'combined': CombinedScoringAgent}
+        api_keys = {option: ConfigManager.get_api_key(agent_class.API_KEY_NAME)
+                    for option, agent_class in enabled.items()}
+
+        self._backend_factory = backend_factory or create_backend
+        requires_keys = backend_factory is None and get_backend_class().REQUIRES_API_KEY
+        missing = [enabled[option].API_KEY_NAME for option, key in api_keys.items() if not key]
+        if missing and requires_keys:
+            raise ValueError(f"Missing API key(s) in configuration: {', '.join(missing)}")
+
+        try:
+            self.result_cache = ResultCache.from_config()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Result cache unavailable, scoring without it: {e}")
+            self.result_cache = None
+
+        try:
+            self.audio_preprocessor = AudioPreprocessor.from_config()
+        except OSError as e:
+            print(f"Audio preprocessing unavailable, sending original audio: {e}")
+            self.audio_preprocessor = None
+        # One shared, reference-counted copy of each file's audio for all agents
+        self.audio_store = AudioStore(self.audio_preprocessor)
+
+        self._backends: Dict[tuple, ScoringBackend] = {}
+        self.agents: Dict[str, BaseScoringAgent] = {
+            option: agent_class(api_key=api_keys[option],
+                                backend=self._backend_for(api_keys[option], agent_class.MODEL_NAME),
+                                result_cache=self.result_cache,
+                                audio_store=self.audio_store)
+            for option, agent_class in enabled.items()
+        }
+
+    def _backend_for(self, api_key: str, model_name: str) -> ScoringBackend:
+        key = (api_key, model_name)
+        if key not in self._backends:
+            self._backends[key] = self._backend_factory(api_key, model_name)
+        return self._backends[key]
+
+    async def prepare_prompts(self, tasks: Iterable[tuple]) -> None:
+        """
+        Pre-render every agent's prompt for the (session_id, task_id) pairs in
+        the run and, when PROMPT_CACHE is enabled, cache each agent's rubric on
+        the backend.
+        """
+        settings = ConfigManager.get_setting('PROMPT_CACHE') or {}
+        ttl_seconds = settings.get('ttl_seconds', DEFAULT_PROMPT_CACHE_TTL) if settings.get('enabled', False) else None
+        tasks = sorted(set(tasks))
+        for agent in self.agents.values():
+            await agent.prepare_prompts(tasks, ttl_seconds)
+
+    async def release_prompts(self) -> None:
+        """Delete the prompts cached on the backends by prepare_prompts."""
+        for backend in self._backends.values():
+            await backend.release_cached_prompts()
+
+    def get(self, option: str) -> BaseScoringAgent:
+        """Return the agent for a scoring option ('analytic', 'holistic', 'off_topic' or 'combined')."""
+        return self.agents[option]
+
+    def close(self) -> None:
+        """Release run-wide resources once scoring has finished."""
+        if self.result_cache:
+            self.result_cache.close()
+            self.result_cache = None
+        if self.audio_preprocessor:
+            self.audio_preprocessor.close()
+            self.audio_preprocessor = None
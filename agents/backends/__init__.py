@@ -0,0 +1,40 @@
+from typing import Type
+from utils.config_manager import ConfigManager
+from .base import BackendError, BackendResponse, ScoringBackend
+from .fake_backend import FakeBackend
+
+DEFAULT_BACKEND = 'gemini'
+
+
+def get_backend_class(name: str = None) -> Type[ScoringBackend]:
+    """
+    Return the backend class selected by name or by the SCORING_BACKEND setting.
+
+    'gemini' (the default) calls the real API; 'fake' uses the offline simulator.
+    """
+    name = name or ConfigManager.get_setting('SCORING_BACKEND', DEFAULT_BACKEND)
+    if name == 'fake':
+        return FakeBackend
+    if name == 'gemini':
+        # Imported on demand so offline runs do not need the Google client libraries
+        from .gemini_backend import GeminiBackend
+        return GeminiBackend
+    raise ValueError(f"Unknown scoring backend: {name}")
+
+
+def create_backend(api_key: str, model_name: str) -> ScoringBackend:
+    """Create the configured backend for one API key and model."""
+    backend_class = get_backend_class()
+    if backend_class is FakeBackend:
+        return FakeBackend(**(ConfigManager.get_setting('FAKE_BACKEND') or {}))
+    return backend_class(api_key, model_name)
+
+
+__all__ = [
+    'BackendError',
+    'BackendResponse',
+    'ScoringBackend',
+    'FakeBackend',
+    'get_backend_class',
+    'create_backend'
+]
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+from utils.response_parser import ResponseSchema
+
+
+@dataclass
+class BackendResponse:
+    """Text reply of a generation request and the tokens it was billed for."""
+    text: str
+    total_tokens: Optional[int] = None
+
+
+class BackendError(Exception):
+    """
+    Request failure raised by backends that do not use google.api_core exceptions.
+
+    ``status_code`` follows HTTP conventions (429, 500, 503, ...) so the retry
+    policy can classify it; ``retry_after`` is the delay the server asked for.
+    """
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ScoringBackend:
+    """Model service used by the scoring agents to turn a prompt and a recording into a reply."""
+
+    # Whether agents need an API key from config.json to use this backend
+    REQUIRES_API_KEY = True
+    # Whether replies are real scores that may be kept in the shared result cache
+    CACHE_RESULTS = True
+    # Whether cache_prompt can store prompts server-side
+    SUPPORTS_PROMPT_CACHE = False
+    # Smallest prompt, in tokens, the service accepts as cached content
+    MIN_CACHED_PROMPT_TOKENS = 0
+
+    def prepare_audio(self, audio_bytes: Union[bytes, memoryview], mime_type: str = "audio/mp3") -> Any:
+        """
+        Turn a recording into the form generate_content sends. Agents call
+        this once per request and pass the result to every attempt, so a
+        backend that has to copy the audio does so once rather than per retry.
+        By default the audio is passed through unchanged.
+        """
+        return audio_bytes
+
+    async def generate_content(self, prompt: str, audio_bytes: Any,
+                               mime_type: str = "audio/mp3",
+                               response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        """
+        Send the prompt and inline audio, and await the model's reply.
+
+        audio_bytes is the recording or what prepare_audio made of it, and may
+        be a read-only memoryview of a memory-mapped file; backends must not
+        keep a reference to it after returning. When response_schema is given
+        the reply should be JSON following it.
+        """
+        raise NotImplementedError
+
+    async def generate_text(self, prompt: str,
+                            response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        """Send a text-only prompt, e.g. to repair a malformed reply, and await the model's reply."""
+        raise NotImplementedError
+
+    async def cache_prompt(self, prompt: str, ttl_seconds: float) -> bool:
+        """
+        Store a prompt prefix server-side for ttl_seconds so later requests
+        whose prompt starts with it only send the rest of the prompt and the
+        audio. Returns whether it was stored.
+        """
+        return False
+
+    async def release_cached_prompts(self) -> None:
+        """Delete the prompts stored by cache_prompt."""
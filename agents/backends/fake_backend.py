@@ -0,0 +1,112 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Optional, Union
+from agents.backends.base import BackendError, BackendResponse, ScoringBackend
+from utils.response_parser import ResponseSchema
+from utils.rate_limiter import estimate_request_tokens
+
+MALFORMED_REPLY = "Sure! Here are the scores: {grammar: 4, vocabulary: 3, content"
+
+
+class FakeBackend(ScoringBackend):
+    """
+    Offline stand-in for Gemini used for load testing and reproducible runs.
+
+    Replies are valid for every agent (one JSON object with the analytic,
+    holistic and off-topic fields) after a simulated latency, and a share of
+    requests fail the way the real service does:
+
+    - latency: {"distribution": "constant" | "uniform" | "exponential" | "lognormal", ...}
+      with "value", "low"/"high", "mean" or "median"/"sigma" in seconds
+    - error_rate: share of requests failing with a 500 or 503
+    - timeout_rate: share of requests failing with a 504 after the full latency
+    - malformed_json_rate: share of replies that are not parseable JSON; text-only
+      repair requests get a valid reply after a tenth of the latency
+    - rate_limit_storm: {"every_seconds", "duration_seconds", "retry_after"}; during
+      the last duration_seconds of every period all requests get a 429
+    - seed: makes the sequence of latencies, failures and scores repeatable
+    """
+    REQUIRES_API_KEY = False
+    CACHE_RESULTS = False
+
+    def __init__(self, latency: Optional[dict] = None, error_rate: float = 0.0,
+                 timeout_rate: float = 0.0, malformed_json_rate: float = 0.0,
+                 rate_limit_storm: Optional[dict] = None, seed: Optional[int] = None):
+        self.latency = latency or {'distribution': 'constant', 'value': 0.5}
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.malformed_json_rate = malformed_json_rate
+        self.rate_limit_storm = rate_limit_storm
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self.counts = Counter()
+
+    def _sample_latency(self) -> float:
+        distribution = self.latency.get('distribution', 'constant')
+        if distribution == 'uniform':
+            return self._random.uniform(self.latency.get('low', 0.0), self.latency.get('high', 1.0))
+        if distribution == 'exponential':
+            return self._random.expovariate(1 / self.latency.get('mean', 0.5))
+        if distribution == 'lognormal':
+            median = self.latency.get('median', 0.5)
+            return median * self._random.lognormvariate(0, self.latency.get('sigma', 0.5))
+        return self.latency.get('value', 0.5)
+
+    def _in_rate_limit_storm(self) -> bool:
+        if not self.rate_limit_storm:
+            return False
+        every = self.rate_limit_storm.get('every_seconds', 60)
+        duration = self.rate_limit_storm.get('duration_seconds', 5)
+        return (time.monotonic() - self._started) % every >= every - duration
+
+    def _random_reply(self) -> dict:
+        bands = {domain: self._random.randint(1, 5)
+                 for domain in ('grammar', 'vocabulary', 'content', 'fluency', 'pronunciation', 'overall')}
+        off_topic = self._random.random() < 0.1
+        return {
+            **bands,
+            'overall_score': min(100, max(0, bands['overall'] * 20 - self._random.randint(0, 15))),
+            'off_topic': off_topic,
+            'confidence': round(self._random.uniform(0.5, 1.0), 2),
+            'explanation': "Simulated reply: the response " + ("does not address" if off_topic else "addresses") + " the task."
+        }
+
+    async def generate_content(self, prompt: str, audio_bytes: Union[bytes, memoryview],
+                               mime_type: str = "audio/mp3",
+                               response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        self.counts['requests'] += 1
+        if self._in_rate_limit_storm():
+            self.counts['rate_limited'] += 1
+            raise BackendError(429, "Resource has been exhausted (simulated rate limit storm)",
+                               retry_after=self.rate_limit_storm.get('retry_after'))
+
+        latency = self._sample_latency()
+        roll = self._random.random()
+        if roll < self.timeout_rate:
+            await asyncio.sleep(latency)
+            self.counts['timeouts'] += 1
+            raise BackendError(504, "Deadline exceeded (simulated)")
+        roll -= self.timeout_rate
+        if roll < self.error_rate:
+            await asyncio.sleep(latency / 4)
+            self.counts['server_errors'] += 1
+            raise BackendError(self._random.choice((500, 503)), "Simulated server error")
+        roll -= self.error_rate
+
+        await asyncio.sleep(latency)
+        total_tokens = estimate_request_tokens(prompt, len(audio_bytes))
+        if roll < self.malformed_json_rate:
+            self.counts['malformed'] += 1
+            return BackendResponse(text=MALFORMED_REPLY, total_tokens=total_tokens)
+        self.counts['succeeded'] += 1
+        return BackendResponse(text=json.dumps(self._random_reply()), total_tokens=total_tokens)
+
+    async def generate_text(self, prompt: str,
+                            response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        self.counts['text_requests'] += 1
+        await asyncio.sleep(self._sample_latency() / 10)
+        return BackendResponse(text=json.dumps(self._random_reply()),
+                               total_tokens=estimate_request_tokens(prompt, 0))
@@ -0,0 +1,122 @@
+from typing import Any, Dict, Optional, Union
+from google.ai import generativelanguage as glm
+from google.api_core.client_options import ClientOptions
+from google.generativeai.types import GenerateContentResponse
+from google.protobuf import duration_pb2
+from agents.backends.base import BackendResponse, ScoringBackend
+from utils.response_parser import ResponseSchema
+
+SCHEMA_TYPES = {
+    'integer': glm.Type.INTEGER,
+    'number': glm.Type.NUMBER,
+    'boolean': glm.Type.BOOLEAN,
+    'string': glm.Type.STRING,
+}
+
+
+def to_glm_schema(schema: ResponseSchema) -> glm.Schema:
+    """Convert a response schema to the API's schema type; ranges go into the field descriptions."""
+    properties = {}
+    for name, (field_type, minimum, maximum) in schema.fields.items():
+        description = f"{minimum:g} to {maximum:g}" if minimum is not None and maximum is not None else None
+        properties[name] = glm.Schema(type_=SCHEMA_TYPES[field_type], description=description)
+    return glm.Schema(type_=glm.Type.OBJECT, properties=properties, required=list(schema.fields))
+
+
+class GeminiBackend(ScoringBackend):
+    """
+    Async Gemini client bound to a single API key.
+
+    Unlike ``genai.configure``, which sets one process-wide key, every instance
+    owns its own transport so agents using different keys can share an event loop.
+    Prompt prefixes stored with cache_prompt are sent as cached content, so
+    requests starting with one only carry the rest of the prompt and the
+    audio. With a response schema, replies are requested in JSON mode
+    following it.
+    """
+    SUPPORTS_PROMPT_CACHE = True
+    # Context caching on Gemini 1.5 models needs at least this many prompt tokens
+    MIN_CACHED_PROMPT_TOKENS = 32768
+
+    def __init__(self, api_key: str, model_name: str):
+        self.model_name = model_name
+        client_options = ClientOptions(api_key=api_key)
+        self._client = glm.GenerativeServiceAsyncClient(client_options=client_options)
+        self._cache_client = glm.CacheServiceAsyncClient(client_options=client_options)
+        # prompt prefix -> name of the cached content holding it
+        self._cached_prompts: Dict[str, str] = {}
+        self._generation_configs: Dict[int, glm.GenerationConfig] = {}
+
+    async def cache_prompt(self, prompt: str, ttl_seconds: float) -> bool:
+        """Store a prompt prefix, such as an agent's rubric, as cached content on the server."""
+        if prompt in self._cached_prompts:
+            return True
+        cached_content = await self._cache_client.create_cached_content(
+            glm.CreateCachedContentRequest(
+                cached_content=glm.CachedContent(
+                    model=self.model_name,
+                    contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+                    ttl=duration_pb2.Duration(seconds=int(ttl_seconds)),
+                )
+            )
+        )
+        self._cached_prompts[prompt] = cached_content.name
+        return True
+
+    async def release_cached_prompts(self) -> None:
+        """Delete the cached contents created by this backend; expired ones are ignored."""
+        names, self._cached_prompts = list(self._cached_prompts.values()), {}
+        for name in names:
+            try:
+                await self._cache_client.delete_cached_content(glm.DeleteCachedContentRequest(name=name))
+            except Exception as e:
+                print(f"Could not delete cached prompt {name}: {e}")
+
+    def _generation_config(self, response_schema: ResponseSchema) -> glm.GenerationConfig:
+        key = id(response_schema)
+        if key not in self._generation_configs:
+            self._generation_configs[key] = glm.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=to_glm_schema(response_schema),
+            )
+        return self._generation_configs[key]
+
+    async def _generate(self, request: glm.GenerateContentRequest,
+                        response_schema: Optional[ResponseSchema]) -> BackendResponse:
+        if response_schema is not None:
+            request.generation_config = self._generation_config(response_schema)
+        response = GenerateContentResponse.from_response(await self._client.generate_content(request))
+        return BackendResponse(
+            text=response.text,
+            total_tokens=response.usage_metadata.total_token_count if response.usage_metadata else None
+        )
+
+    def prepare_audio(self, audio_bytes: Union[bytes, memoryview], mime_type: str = "audio/mp3") -> glm.Part:
+        """Wrap the audio in an inline part; the protobuf field needs bytes, so this copies it once."""
+        return glm.Part(inline_data=glm.Blob(mime_type=mime_type, data=bytes(audio_bytes)))
+
+    async def generate_content(self, prompt: str, audio_bytes: Any,
+                               mime_type: str = "audio/mp3",
+                               response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        """Send the prompt and inline audio, and await the model's reply."""
+        audio_part = audio_bytes if isinstance(audio_bytes, glm.Part) else self.prepare_audio(audio_bytes, mime_type)
+        parts = [audio_part]
+        request = glm.GenerateContentRequest(model=self.model_name)
+        for prefix, cached_content in self._cached_prompts.items():
+            if prompt.startswith(prefix):
+                request.cached_content = cached_content
+                prompt = prompt[len(prefix):].lstrip("\n")
+                break
+        if prompt:
+            parts.insert(0, glm.Part(text=prompt))
+        request.contents = [glm.Content(role="user", parts=parts)]
+        return await self._generate(request, response_schema)
+
+    async def generate_text(self, prompt: str,
+                            response_schema: Optional[ResponseSchema] = None) -> BackendResponse:
+        """Send a text-only prompt and await the model's reply."""
+        request = glm.GenerateContentRequest(
+            model=self.model_name,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+        )
+        return await self._generate(request, response_schema)
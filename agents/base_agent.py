@@ -0,0 +1,269 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Optional
+from agents.backends import ScoringBackend, create_backend, get_backend_class
+from prompts.response_repair_prompts import SYSTEM_PROMPT as REPAIR_PROMPT
+from utils.config_manager import ConfigManager
+from utils.audio_payload import AudioPayload, AudioStore
+from utils.metrics import get_metrics
+from utils.rate_limiter import estimate_request_tokens, estimate_text_tokens, get_rate_limiter
+from utils.retry_policy import ErrorKind, RetryPolicy
+from utils.response_parser import ResponseParser, ResponseSchema
+from utils.result_cache import ResultCache
+from utils.task_registry import get_task_registry, parse_task_key
+
+# Text-only requests allowed per reply to fix one that does not match the schema
+DEFAULT_MAX_REPAIRS = 1
+# Lines of SYSTEM_PROMPT holding the task definition; the rest is the same for every task
+TASK_BLOCK = ("<TASK_DEFINITION>", "<<TASK_DEFINITION>>", "</TASK_DEFINITION>")
+
+
+def split_system_prompt(lines: list) -> tuple:
+    """
+    Split a system prompt into its task-independent rubric and the task block.
+
+    Returns:
+        tuple: (rubric text, task block text with the <<TASK_DEFINITION>> placeholder)
+    """
+    start = lines.index(TASK_BLOCK[0])
+    rubric = list(lines[:start]) + list(lines[start + len(TASK_BLOCK):])
+    if 0 < start < len(rubric) and not rubric[start - 1].strip() and not rubric[start].strip():
+        del rubric[start]
+    while rubric and not rubric[-1].strip():
+        rubric.pop()
+    return "\n".join(rubric), "\n".join(TASK_BLOCK)
+
+
+class BaseScoringAgent:
+    """
+    Shared request layer for the scoring agents.
+
+    Subclasses set API_KEY_NAME, SYSTEM_PROMPT and RESPONSE_SCHEMA and expose
+    their own public scoring method on top of _request_scores.
+    """
+    MODEL_NAME = 'models/gemini-1.5-flash-002'
+    API_KEY_NAME: str = None
+    SYSTEM_PROMPT: list = None
+    RESPONSE_SCHEMA: ResponseSchema = None
+
+    def __init__(self, api_key: Optional[str] = None, backend: Optional[ScoringBackend] = None,
+                 result_cache: Optional[ResultCache] = None,
+                 audio_store: Optional[AudioStore] = None):
+        self.api_key = api_key or ConfigManager.get_api_key(self.API_KEY_NAME)
+        self.model = backend
+        if self.model is None:
+            self._initialize_model()
+        self.rate_limiter = get_rate_limiter(self.API_KEY_NAME, self.api_key)
+        self.retry_policy = RetryPolicy.from_config()
+        self.result_cache = result_cache
+        self.audio_store = audio_store or AudioStore()
+        # The rubric is shared by every task and comes first, so it can be cached as a prefix
+        self.rubric_prompt, self.task_prompt_template = split_system_prompt(self.SYSTEM_PROMPT)
+        settings = ConfigManager.get_setting('STRUCTURED_OUTPUT') or {}
+        structured = settings.get('enabled', True) and self.RESPONSE_SCHEMA is not None
+        # Schema the backend is asked to follow and replies are checked against, or None
+        self.response_schema = self.RESPONSE_SCHEMA if structured else None
+        self.max_repairs = settings.get('max_repairs', DEFAULT_MAX_REPAIRS)
+        self.task_registry = get_task_registry()
+        # (session_id, task_id) -> prompt with the task definition filled in
+        self.rendered_prompts: Dict[tuple, str] = {}
+        self._prompts_generation = self.task_registry.generation
+
+    def _initialize_model(self) -> None:
+        """Create the configured backend bound to this agent's API key."""
+        if get_backend_class().REQUIRES_API_KEY and not self.api_key:
+            raise ValueError(f"{self.API_KEY_NAME} not found in configuration")
+        self.model = create_backend(self.api_key, self.MODEL_NAME)
+
+    def _parse_file_name(self, file_path: str) -> tuple[str, str]:
+        """Parse the file name to get session and task IDs."""
+        # Extract session and task IDs from file name (e.g., 231101013-6-t1.mp3)
+        key = parse_task_key(file_path)
+        if key is None:
+            raise ValueError(f"Invalid file name format: {file_path}")
+        return key
+
+    def render_prompt(self, session_id: str, task_id: str) -> str:
+        """
+        Return the prompt for a session and task, rendering it on first use and
+        again after the task definitions were reloaded.
+        """
+        key = (session_id, task_id)
+        task_definition = self.task_registry.get(session_id, task_id)
+        if self.task_registry.generation != self._prompts_generation:
+            self.rendered_prompts.clear()
+            self._prompts_generation = self.task_registry.generation
+        if key not in self.rendered_prompts:
+            task_prompt = self.task_prompt_template.replace("<<TASK_DEFINITION>>", task_definition)
+            self.rendered_prompts[key] = f"{self.rubric_prompt}\n\n{task_prompt}"
+        return self.rendered_prompts[key]
+
+    async def prepare_prompts(self, tasks: Iterable[tuple], ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Render the prompts for the given (session_id, task_id) pairs up front and,
+        when ttl_seconds is given and the backend supports it, store the rubric
+        they all start with as cached content, so requests only send the task
+        definition and the audio.
+
+        Returns whether the rubric was cached on the backend. A rubric that
+        cannot be cached is still sent inline with every request.
+        """
+        for session_id, task_id in tasks:
+            self.render_prompt(session_id, task_id)
+        if ttl_seconds is None or not getattr(self.model, 'SUPPORTS_PROMPT_CACHE', False):
+            return False
+        minimum = getattr(self.model, 'MIN_CACHED_PROMPT_TOKENS', 0)
+        if estimate_text_tokens(self.rubric_prompt) < minimum:
+            # The service would reject it, so do not spend a request finding out
+            print(f"{type(self).__name__}: the rubric is shorter than the {minimum} tokens "
+                  f"the model needs to cache it, sending it inline")
+            cached = False
+        else:
+            try:
+                cached = bool(await self.model.cache_prompt(self.rubric_prompt, ttl_seconds))
+            except Exception as e:
+                print(f"{type(self).__name__}: could not cache the rubric, sending it inline ({e})")
+                cached = False
+        get_metrics().increment('prompt_cached', type(self).__name__, value=int(cached))
+        return cached
+
+    def _build_prompt(self, file_path: str) -> str:
+        """Return the pre-rendered prompt for the file's session and task."""
+        session_id, task_id = self._parse_file_name(file_path)
+        return self.render_prompt(session_id, task_id)
+
+    async def _generate_content_with_retry(self, prompt: str, payload: Optional[AudioPayload]) -> Any:
+        """
+        Generate content, retrying rate limits and transient failures per the retry policy.
+
+        Without a payload the request is text-only.
+        """
+        estimated_tokens = estimate_request_tokens(prompt, len(payload) if payload else 0)
+
+        metrics = get_metrics()
+        agent = type(self).__name__
+
+        # Prepared once so a backend that copies the audio does not do so on every retry
+        audio = self.model.prepare_audio(payload.data, payload.mime_type) if payload else None
+
+        async def attempt():
+            with metrics.timer('rate_limit_wait', agent):
+                await self.rate_limiter.acquire(estimated_tokens)
+            with metrics.timer('api_request', agent):
+                if payload is None:
+                    response = await self.model.generate_text(prompt, response_schema=self.response_schema)
+                else:
+                    response = await self.model.generate_content(prompt, audio, payload.mime_type,
+                                                                 response_schema=self.response_schema)
+            self.rate_limiter.settle(estimated_tokens, response.total_tokens)
+            return response
+
+        return await self.retry_policy.run(attempt, on_retry=self._log_retry)
+
+    def _log_retry(self, kind: ErrorKind, attempt_number: int, delay: float, error: BaseException) -> None:
+        metrics = get_metrics()
+        metrics.increment(f'retry_{kind.value}', type(self).__name__)
+        metrics.record_time('retry_sleep', delay, type(self).__name__)
+        print(f"{type(self).__name__}: {kind.value} error ({error}). Retrying in {delay:.1f} seconds... "
+              f"(Attempt {attempt_number + 1}/{self.retry_policy.max_attempts})")
+
+    async def _request_scores(self, file_path: str, parse: Callable[[str], Optional[dict]]) -> dict:
+        """
+        Send the file with its rendered prompt and return the parsed response.
+
+        The audio comes from the shared audio store, so agents scoring the same
+        file at the same time use one copy of it (converted first when audio
+        preprocessing is enabled).
+        """
+        metrics = get_metrics()
+        agent = type(self).__name__
+        file_name = os.path.basename(file_path)
+
+        with metrics.timer('build_prompt', agent, file=file_name):
+            prompt = self._build_prompt(file_path)
+        payload = await self.audio_store.acquire(file_path)
+        try:
+            return await self._score_audio(file_name, prompt, payload, parse)
+        finally:
+            self.audio_store.release(file_path)
+
+    async def _score_audio(self, file_name: str, prompt: str, payload: AudioPayload,
+                           parse: Callable[[str], Optional[dict]]) -> dict:
+        """
+        Score loaded audio. When a result cache is attached, a previous result
+        for the same audio, prompt, model and agent is returned without calling the API.
+        """
+        metrics = get_metrics()
+        agent = type(self).__name__
+        metrics.observe_size('audio_bytes', len(payload), agent, file=file_name)
+        metrics.observe_size('prompt_chars', len(prompt), agent)
+
+        cache_key = None
+        if self.result_cache and getattr(self.model, 'CACHE_RESULTS', True):
+            cache_key = ResultCache.make_key(payload.data, prompt, self.MODEL_NAME, agent)
+            with metrics.timer('cache_lookup', agent):
+                cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                metrics.increment('cache_hit', agent, file=file_name)
+                return cached
+            metrics.increment('cache_miss', agent, file=file_name)
+
+        with metrics.timer('generate', agent, file=file_name):
+            response = await self._generate_content_with_retry(prompt, payload)
+        metrics.observe_size('response_chars', len(response.text), agent)
+
+        result = await self._parse_reply(file_name, response.text, parse)
+        if cache_key:
+            with metrics.timer('cache_write', agent):
+                self.result_cache.put(cache_key, agent, result)
+        return result
+
+    async def _parse_reply(self, file_name: str, text: str, parse: Callable[[str], Optional[dict]]) -> dict:
+        """
+        Check a reply against the response schema and parse it.
+
+        A reply whose only problems are its format (not JSON, or quoted
+        values) is sent back with them in a text-only repair request, up to
+        max_repairs times, so the audio is not uploaded again. A missing or
+        out-of-range score, or a repair that changes a score that was already
+        valid, fails the file instead: a repair may reformat scores but never
+        make them up.
+        """
+        metrics = get_metrics()
+        agent = type(self).__name__
+        schema = self.response_schema
+        parsed = ResponseParser.load(text) if schema else None
+        problems = schema.problems(parsed) if schema else []
+        fatal, kept = [], {}
+        if problems:
+            metrics.increment('schema_failure', agent, file=file_name)
+            fatal = schema.score_problems(parsed)
+            kept = schema.valid_values(parsed)
+
+        repairs = 0
+        while problems and not fatal and repairs < self.max_repairs:
+            repairs += 1
+            metrics.increment('repair_request', agent, file=file_name)
+            prompt = self._build_repair_prompt(text, problems)
+            with metrics.timer('repair', agent, file=file_name):
+                text = (await self._generate_content_with_retry(prompt, None)).text
+            parsed = ResponseParser.load(text)
+            changed = [f"the repair changed {name} (was {json.dumps(value)})"
+                       for name, value in kept.items() if parsed and name in parsed and parsed[name] != value]
+            problems = schema.problems(parsed) + changed
+            fatal = schema.score_problems(parsed) + changed
+        if repairs and not problems:
+            metrics.increment('repair_success', agent, file=file_name)
+
+        result = None if problems else parse(text)
+        if result is None:
+            metrics.increment('parse_failure', agent, file=file_name)
+            detail = f" ({'; '.join(problems)})" if problems else ""
+            raise ValueError(f"Failed to parse response{detail}: {text}")
+        return result
+
+    def _build_repair_prompt(self, text: str, problems: list) -> str:
+        return ("\n".join(REPAIR_PROMPT)
+                .replace("<<FORMAT>>", self.response_schema.describe())
+                .replace("<<PROBLEMS>>", "\n".join(f"- {problem}" for problem in problems))
+                .replace("<<REPLY>>", text))
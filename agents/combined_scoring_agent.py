@@ -0,0 +1,31 @@
+from models.score_models import AnalyticScores, HolisticScore, OffTopicAnalysis
+from agents.base_agent import BaseScoringAgent
+from utils.response_parser import COMBINED_SCHEMA, ResponseParser
+from prompts.combined_scoring_prompts import SYSTEM_PROMPT
+
+class CombinedScoringAgent(BaseScoringAgent):
+    """
+    Scores the analytic bands, the holistic score and off-topic relevance
+    with a single request per recording.
+    """
+    API_KEY_NAME = "ANALYTIC_SCORING_API_KEY"
+    SYSTEM_PROMPT = SYSTEM_PROMPT
+    RESPONSE_SCHEMA = COMBINED_SCHEMA
+
+    async def score_combined(self, file_path: str) -> dict:
+        """
+        Score the speaking performance on every dimension using Gemini.
+
+        Returns:
+            dict: {'analytic': AnalyticScores, 'holistic': HolisticScore, 'off_topic': OffTopicAnalysis}
+        """
+        try:
+            result = await self._request_scores(file_path, ResponseParser.parse_combined_response)
+            return {
+                'analytic': AnalyticScores(**result['analytic']),
+                'holistic': HolisticScore(**result['holistic']),
+                'off_topic': OffTopicAnalysis(**result['off_topic'])
+            }
+
+        except Exception as e:
+            raise ValueError(f"Error scoring performance: {str(e)}")
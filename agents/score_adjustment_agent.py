@@ -1,25 +1,254 @@
 import numpy as np
-from typing import List
-from models.score_models import SpeakingPerformance
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from utils.config_manager import ConfigManager
+from utils.task_registry import SESSION_TASK_PATTERN
+
+if TYPE_CHECKING:
+    from models.score_models import AnalyticScores, SpeakingPerformance
+
+ANALYTIC_DOMAINS = ('grammar', 'vocabulary', 'content', 'fluency', 'pronunciation', 'overall')
+NORMALIZATION_METHODS = ('zscore', 'equipercentile')
+NORMALIZATION_GROUPS = ('session', 'task')
+# Conversion table key used for sessions without a table of their own
+DEFAULT_TABLE = 'default'
+
+_domain_scores = attrgetter(*ANALYTIC_DOMAINS)
+
+
+class ConversionTable:
+    """
+    Raw-to-scaled score lookup defined by ascending band cut-offs.
+
+    A raw score below cutoffs[0] gets scaled[0], one from cutoffs[i - 1] up to
+    (not including) cutoffs[i] gets scaled[i], and one at or above the last
+    cut-off gets scaled[-1].
+    """
+
+    def __init__(self, cutoffs: List[float], scaled: List[float]):
+        self.cutoffs = np.asarray(cutoffs, dtype=float)
+        self.scaled = np.asarray(scaled, dtype=float)
+        if len(self.scaled) != len(self.cutoffs) + 1:
+            raise ValueError("A conversion table needs one more scaled value than cut-offs")
+        if np.any(np.diff(self.cutoffs) <= 0):
+            raise ValueError("Conversion table cut-offs must be strictly ascending")
+
+    def convert(self, raw: np.ndarray) -> np.ndarray:
+        """Look up the scaled score for every raw score at once; NaN stays NaN."""
+        scaled = self.scaled[np.searchsorted(self.cutoffs, np.nan_to_num(raw), side='right')]
+        return np.where(np.isnan(raw), np.nan, scaled)
+
+
+class ScoreColumns:
+    """
+    Analytic band scores of a batch kept as columns.
+
+    ``scores`` is an (n, 6) float matrix with one row per file in
+    ANALYTIC_DOMAINS order, NaN where a file has no analytic scores. The
+    scoring runner fills a row as each file's analytic result arrives, so
+    adjusting the batch afterwards does not read every performance again.
+    """
+
+    def __init__(self, file_names: Iterable[str]):
+        self.file_names = list(file_names)
+        self._rows: Optional[Dict[str, int]] = None
+        self.scores = np.full((len(self.file_names), len(ANALYTIC_DOMAINS)), np.nan)
+        # Per grouping ('session' or 'task'): the group number of every row, and of every group key seen
+        self._groups = {by: np.zeros(len(self.file_names), dtype=np.intp) for by in NORMALIZATION_GROUPS}
+        self._group_ids: Dict[str, Dict[str, int]] = {by: {} for by in NORMALIZATION_GROUPS}
+        self._grouped = np.zeros(len(self.file_names), dtype=bool)
+
+    @property
+    def rows(self) -> Dict[str, int]:
+        """Row index of every file name."""
+        if self._rows is None:
+            self._rows = {file_name: row for row, file_name in enumerate(self.file_names)}
+        return self._rows
+
+    @classmethod
+    def from_performances(cls, performances: List['SpeakingPerformance']) -> 'ScoreColumns':
+        """Build the columns of a batch in one pass over the performances."""
+        columns = cls([perf.file_name for perf in performances])
+        missing = (np.nan,) * len(ANALYTIC_DOMAINS)
+        values = chain.from_iterable(_domain_scores(perf.analytic_scores) if perf.analytic_scores else missing
+                                     for perf in performances)
+        columns.scores = np.fromiter(values, dtype=float, count=columns.scores.size).reshape(columns.scores.shape)
+        return columns
+
+    def _assign_groups(self, rows: List[int]) -> None:
+        """Number the session and session-task group of each row, parsed from its file name."""
+        matches = map(SESSION_TASK_PATTERN.search, [self.file_names[row] for row in rows])
+        keys = [match.groups() if match else ('', '') for match in matches]
+        sessions = [session_id for session_id, _ in keys]
+        tasks = ["-".join(key) for key in keys]
+        for by, group_keys in (('session', sessions), ('task', tasks)):
+            group_ids = self._group_ids[by]
+            for key in dict.fromkeys(group_keys):
+                group_ids.setdefault(key, len(group_ids))
+            self._groups[by][rows] = list(map(group_ids.__getitem__, group_keys))
+        self._grouped[rows] = True
+
+    def set(self, file_name: str, analytic_scores: 'AnalyticScores') -> None:
+        """Store the analytic scores of one file."""
+        row = self.rows[file_name]
+        self.scores[row] = _domain_scores(analytic_scores)
+        if not self._grouped[row]:
+            self._assign_groups([row])
+
+    def groups(self, by: str) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Return the group number of every row when grouped by 'session' or
+        'task', and the number of each session ID or "session-task" key.
+        Rows with unrecognized file names share the group of key ''.
+        """
+        ungrouped = np.flatnonzero(~self._grouped).tolist()
+        if ungrouped:
+            self._assign_groups(ungrouped)
+        return self._groups[by], self._group_ids[by]
+
+
+def _python_scores(values: np.ndarray) -> list:
+    """Convert adjusted scores to report values: whole numbers as int, others rounded to 4 places, NaN as None."""
+    rounded = np.round(values, 4)
+    converted = rounded.astype(object)
+    whole = rounded == np.trunc(rounded)
+    converted[whole] = rounded[whole].astype(np.int64).tolist()
+    converted[np.isnan(rounded)] = None
+    return converted.tolist()
+
 
 class ScoreAdjustmentAgent:
-    def adjust_scores(self, performances: List[SpeakingPerformance]) -> List[SpeakingPerformance]:
+    """
+    Turns the analytic band scores of a batch into one adjusted score each.
+
+    The six analytic domains are summed into a raw score for all performances
+    at once. The raw scores can then be normalized within each session or
+    task, either to a common mean and standard deviation (z-score) or onto
+    the distribution of the whole batch (equipercentile), and converted to
+    scaled scores with a conversion table, per session or shared.
+    """
+
+    def __init__(self, conversion_tables: Optional[Dict[str, ConversionTable]] = None,
+                 normalization: Optional[str] = None, normalize_by: str = 'session',
+                 target_mean: Optional[float] = None, target_sd: Optional[float] = None):
+        if normalization is not None and normalization not in NORMALIZATION_METHODS:
+            raise ValueError(f"Unknown normalization: {normalization}")
+        if normalize_by not in NORMALIZATION_GROUPS:
+            raise ValueError(f"Unknown normalization group: {normalize_by}")
+        self.conversion_tables = conversion_tables or {}
+        self.normalization = normalization
+        self.normalize_by = normalize_by
+        self.target_mean = target_mean
+        self.target_sd = target_sd
+
+    @classmethod
+    def from_config(cls) -> 'ScoreAdjustmentAgent':
+        """
+        Build the agent from the optional SCORE_ADJUSTMENT setting.
+
+        conversion_tables maps a session ID, or "default", to
+        {"cutoffs": [...], "scaled": [...]}.
         """
-        Calculate adjusted score by summing analytic rubric domains.
+        settings = ConfigManager.get_setting('SCORE_ADJUSTMENT') or {}
+        tables = {str(session_id): ConversionTable(table['cutoffs'], table['scaled'])
+                  for session_id, table in (settings.get('conversion_tables') or {}).items()}
+        return cls(conversion_tables=tables,
+                   normalization=settings.get('normalization'),
+                   normalize_by=settings.get('normalize_by', 'session'),
+                   target_mean=settings.get('target_mean'),
+                   target_sd=settings.get('target_sd'))
+
+    def _zscore(self, raw: np.ndarray, groups: np.ndarray, group_count: int) -> np.ndarray:
+        valid = ~np.isnan(raw)
+        values = np.where(valid, raw, 0.0)
+        counts = np.bincount(groups, weights=valid.astype(float), minlength=group_count)
+        sums = np.bincount(groups, weights=values, minlength=group_count)
+        squares = np.bincount(groups, weights=values ** 2, minlength=group_count)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            sds = np.sqrt(np.maximum(squares / counts - means ** 2, 0.0))
+        target_mean = np.nanmean(raw) if self.target_mean is None else self.target_mean
+        target_sd = np.nanstd(raw) if self.target_sd is None else self.target_sd
+        # A group whose scores are all equal is moved to the target mean
+        z = np.divide(raw - means[groups], sds[groups], out=np.zeros_like(raw), where=sds[groups] > 0)
+        return np.where(valid, target_mean + z * target_sd, np.nan)
+
+    @staticmethod
+    def _equipercentile(raw: np.ndarray, groups: np.ndarray, group_count: int) -> np.ndarray:
+        valid = ~np.isnan(raw)
+        reference = np.sort(raw[valid])
+        equated = np.full_like(raw, np.nan)
+        for group in range(group_count):
+            members = np.flatnonzero((groups == group) & valid)
+            if members.size == 0:
+                continue
+            group_scores = np.sort(raw[members])
+            # Mid-percentile rank, so tied scores share one rank
+            below = np.searchsorted(group_scores, raw[members], side='left')
+            at_or_below = np.searchsorted(group_scores, raw[members], side='right')
+            ranks = (below + at_or_below) / (2 * members.size)
+            equated[members] = np.quantile(reference, ranks)
+        return equated
+
+    def _normalize(self, raw: np.ndarray, columns: ScoreColumns) -> np.ndarray:
+        groups, group_ids = columns.groups(self.normalize_by)
+        group_count = len(group_ids)
+        if self.normalization == 'zscore':
+            return self._zscore(raw, groups, group_count)
+        return self._equipercentile(raw, groups, group_count)
+
+    def _convert(self, values: np.ndarray, columns: ScoreColumns) -> np.ndarray:
+        if set(self.conversion_tables) <= {DEFAULT_TABLE}:
+            return self.conversion_tables[DEFAULT_TABLE].convert(values)
+        sessions, session_ids = columns.groups('session')
+        converted = np.full_like(values, np.nan)
+        default = self.conversion_tables.get(DEFAULT_TABLE)
+        covered = np.zeros(len(values), dtype=bool)
+        for session_id, table in self.conversion_tables.items():
+            if session_id == DEFAULT_TABLE:
+                continue
+            if session_id not in session_ids:
+                continue
+            mask = sessions == session_ids[session_id]
+            converted[mask] = table.convert(values[mask])
+            covered |= mask
+        if default is not None:
+            converted[~covered] = default.convert(values[~covered])
+        else:
+            # Sessions without a table keep their unconverted score
+            converted[~covered] = values[~covered]
+        return converted
+
+    def adjust_columns(self, columns: ScoreColumns) -> np.ndarray:
+        """Return the adjusted score of every row as a float array; NaN where there is none."""
+        raw = columns.scores.sum(axis=1)
+        if np.isnan(raw).all():
+            return raw
+        if self.normalization:
+            raw = self._normalize(raw, columns)
+        if self.conversion_tables:
+            raw = self._convert(raw, columns)
+        return raw
+
+    def adjust_scores(self, performances: List['SpeakingPerformance'],
+                      columns: Optional[ScoreColumns] = None) -> List['SpeakingPerformance']:
+        """
+        Calculate the adjusted score of every performance from its analytic rubric domains.
+
+        Without normalization or conversion tables this is the sum of the six
+        domains. When the batch's scores are already kept in columns, pass them
+        so the performances are only visited to store the results; otherwise
+        the columns are built from the performances first. Normalization uses
+        every row of the columns.
         """
-        # TODO: implement conversion table here when it is ready
-        for perf in performances:
-            if perf.analytic_scores:
-                total_score = sum([
-                    perf.analytic_scores.grammar,
-                    perf.analytic_scores.vocabulary,
-                    perf.analytic_scores.content,
-                    perf.analytic_scores.fluency,
-                    perf.analytic_scores.pronunciation,
-                    perf.analytic_scores.overall
-                ])
-                perf.adjusted_score = total_score
-            else:
-                perf.adjusted_score = None
-        
-        return performances 
\ No newline at end of file
+        if columns is None:
+            columns = ScoreColumns.from_performances(performances)
+            adjusted = self.adjust_columns(columns)
+        else:
+            rows = np.fromiter((columns.rows[perf.file_name] for perf in performances),
+                               dtype=np.intp, count=len(performances))
+            adjusted = self.adjust_columns(columns)[rows]
+        for perf, value in zip(performances, _python_scores(adjusted)):
+            perf.adjusted_score = value
+        return performances
@@ -0,0 +1,52 @@
+import os
+import random
+from datetime import date, timedelta
+from typing import List
+from task_definitions import TASK_DEFINITIONS
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo, no CRC
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_SIZE = 144 * 128000 // 44100
+FRAME_SECONDS = 1152 / 44100
+# An all-zero body is a valid frame that decodes to silence
+SILENT_FRAME = FRAME_HEADER + bytes(FRAME_SIZE - len(FRAME_HEADER))
+
+
+def synthetic_mp3(duration_seconds: float) -> bytes:
+    """Return a silent constant-bitrate MP3 of roughly the given length."""
+    return SILENT_FRAME * max(1, round(duration_seconds / FRAME_SECONDS))
+
+
+def corpus_file_names(file_count: int) -> List[str]:
+    """
+    Name files like real exports (YYMMDDXXX-S-tT.mp3), cycling through every
+    session and task in TASK_DEFINITIONS. Each exam day holds up to 1000 students.
+    """
+    slots = [(session_id, task_id) for session_id, tasks in TASK_DEFINITIONS.items() for task_id in tasks]
+    first_day = date(2023, 11, 1)
+    names = []
+    for index in range(file_count):
+        session_id, task_id = slots[index % len(slots)]
+        exam_day = (first_day + timedelta(days=index // 1000)).strftime('%y%m%d')
+        names.append(f"{exam_day}{index % 1000:03d}-{session_id}-{task_id}.mp3")
+    return names
+
+
+def generate_corpus(folder_path: str, file_count: int, min_duration: float = 30.0,
+                    max_duration: float = 90.0, seed: int = 0) -> List[str]:
+    """
+    Write file_count synthetic recordings into folder_path.
+
+    Durations are drawn uniformly between min_duration and max_duration seconds
+    so payload sizes vary the way real recordings do.
+
+    Returns:
+        list: The generated file names in folder order
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    rng = random.Random(seed)
+    names = corpus_file_names(file_count)
+    for name in names:
+        with open(os.path.join(folder_path, name), 'wb') as f:
+            f.write(synthetic_mp3(rng.uniform(min_duration, max_duration)))
+    return sorted(names)
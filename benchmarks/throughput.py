@@ -0,0 +1,279 @@
+"""
+End-to-end throughput benchmark.
+
+Scores a synthetic corpus with the offline fake backend and records files per
+minute, per-file latency percentiles, peak memory and the time spent in each
+stage. Run from the repository root:
+
+    python -m benchmarks.throughput --files 2000 --concurrency 8
+
+Results are written as JSON under benchmarks/results/ (or --output) and can be
+compared with an earlier result using --compare.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from agents.backends import FakeBackend
+from benchmarks.synthetic_corpus import generate_corpus
+from pipeline.scoring_runner import ScoringRunner
+from utils.config_manager import CONFIG_PATH_ENV, DEFAULT_MAX_CONCURRENT_FILES
+from utils.excel_utils import save_scores_to_excel
+from utils.metrics import get_metrics
+
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+API_KEY_NAMES = ('ANALYTIC_SCORING_API_KEY', 'HOLISTIC_SCORING_API_KEY', 'OFF_TOPIC_DETECTION_API_KEY')
+
+
+class TimedScoringRunner(ScoringRunner):
+    """ScoringRunner that keeps the latency of every file for the percentiles."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.file_latencies: List[float] = []
+
+    async def _score_file(self, audio_file: str):
+        started = time.perf_counter()
+        try:
+            return await super()._score_file(audio_file)
+        finally:
+            self.file_latencies.append(time.perf_counter() - started)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Linearly interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process, or None where the resource module is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end scoring throughput with a simulated backend.")
+    parser.add_argument('--files', type=int, default=200, help="Number of synthetic recordings (default: 200)")
+    parser.add_argument('--corpus-dir', default=None,
+                        help="Reuse or create the corpus here instead of a temporary folder")
+    parser.add_argument('--min-duration', type=float, default=30.0, help="Shortest recording in seconds")
+    parser.add_argument('--max-duration', type=float, default=90.0, help="Longest recording in seconds")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENT_FILES,
+                        help="Files scored at the same time")
+    parser.add_argument('--combined', action='store_true', help="Use one combined request per file")
+    parser.add_argument('--no-holistic', action='store_true', help="Skip holistic scoring")
+    parser.add_argument('--no-off-topic', action='store_true', help="Skip off-topic detection")
+    parser.add_argument('--latency-median', type=float, default=0.5,
+                        help="Median simulated request latency in seconds (lognormal)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="Spread of the simulated latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests failing with a 5xx")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="Share of requests timing out")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="Share of unparseable replies")
+    parser.add_argument('--requests-per-minute', type=int, default=None,
+                        help="Per-key request limit applied during the run (default: unlimited)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the corpus and the simulated backend")
+    parser.add_argument('--label', default=None, help="Free-form name stored with the result")
+    parser.add_argument('--output', default=None, help="Result file (default: benchmarks/results/throughput_<time>.json)")
+    parser.add_argument('--compare', default=None, help="Earlier result file to compare against")
+    parser.add_argument('--verbose', action='store_true', help="Show retry messages from the agents")
+    args = parser.parse_args(argv)
+    if args.files < 1 or args.concurrency < 1:
+        parser.error("--files and --concurrency must be at least 1")
+    return args
+
+
+def write_benchmark_config(path: str, args) -> None:
+    """Config for the run: no result cache, so every file reaches the backend, and optional rate limits."""
+    config = {
+        'MAX_CONCURRENT_FILES': args.concurrency,
+        'RESULT_CACHE': {'enabled': False},
+        'METRICS': {'trace': False},
+        # The synthetic recordings are silent and would all be skipped
+        'PREFLIGHT': {'enabled': False}
+    }
+    if args.requests_per_minute:
+        config['RATE_LIMITS'] = {name: {'requests_per_minute': args.requests_per_minute}
+                                 for name in API_KEY_NAMES}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=4)
+
+
+def run_benchmark(args, corpus_dir: str, work_dir: str) -> dict:
+    if not any(name.endswith('.mp3') for name in os.listdir(corpus_dir)):
+        generate_corpus(corpus_dir, args.files, args.min_duration, args.max_duration, args.seed)
+    file_count = sum(1 for name in os.listdir(corpus_dir) if name.endswith('.mp3'))
+
+    backends = []
+
+    def backend_factory(api_key, model_name):
+        backend = FakeBackend(
+            latency={'distribution': 'lognormal', 'median': args.latency_median, 'sigma': args.latency_sigma},
+            error_rate=args.error_rate,
+            timeout_rate=args.timeout_rate,
+            malformed_json_rate=args.malformed_rate,
+            seed=args.seed + len(backends)
+        )
+        backends.append(backend)
+        return backend
+
+    scoring_options = {
+        'analytic': True,
+        'holistic': not args.no_holistic,
+        'off_topic': not args.no_off_topic,
+        'score_adjustment': True,
+        'combined': args.combined,
+        'resume': False
+    }
+    runner = TimedScoringRunner(corpus_dir, scoring_options, args.concurrency,
+                                backend_factory=backend_factory)
+
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with log:
+        performances = runner.run()
+    scoring_seconds = time.perf_counter() - started
+
+    if performances:
+        # The run's metrics stay current after it ends, so the report time lands in them too
+        save_scores_to_excel(performances, work_dir)
+    wall_seconds = time.perf_counter() - started
+
+    latencies = sorted(runner.file_latencies)
+    snapshot = get_metrics().snapshot()
+    backend_counts = defaultdict(int)
+    for backend in backends:
+        for name, count in backend.counts.items():
+            backend_counts[name] += count
+
+    return {
+        'files': file_count,
+        'scored': len(performances),
+        'failed': len(runner.failed_files),
+        'scoring_seconds': round(scoring_seconds, 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'files_per_minute': round(len(performances) / wall_seconds * 60, 2) if wall_seconds else None,
+        'latency_seconds': {
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else None
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': snapshot['stages'],
+        'counters': snapshot['counters'],
+        'payload_sizes': snapshot['sizes'],
+        'backend_requests': dict(backend_counts)
+    }
+
+
+def compare_results(current: dict, baseline: dict) -> List[str]:
+    """One line per headline metric with the change from the baseline."""
+    lines = []
+    metrics = (
+        ('files/min', lambda r: r['files_per_minute']),
+        ('p50 s', lambda r: r['latency_seconds']['p50']),
+        ('p95 s', lambda r: r['latency_seconds']['p95']),
+        ('p99 s', lambda r: r['latency_seconds']['p99']),
+        ('peak RSS MB', lambda r: r['peak_rss_mb']),
+    )
+    for name, value_of in metrics:
+        new, old = value_of(current['results']), value_of(baseline['results'])
+        if new is None or old is None:
+            lines.append(f"{name:>12}: {old} -> {new}")
+        else:
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            lines.append(f"{name:>12}: {old:.3f} -> {new:.3f} ({change})")
+    return lines
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='scorer_bench_') as work_dir:
+        config_path = os.path.join(work_dir, 'config.json')
+        write_benchmark_config(config_path, args)
+        previous_config = os.environ.get(CONFIG_PATH_ENV)
+        os.environ[CONFIG_PATH_ENV] = config_path
+        try:
+            corpus_dir = args.corpus_dir or os.path.join(work_dir, 'corpus')
+            os.makedirs(corpus_dir, exist_ok=True)
+            results = run_benchmark(args, corpus_dir, work_dir)
+        finally:
+            if previous_config is None:
+                os.environ.pop(CONFIG_PATH_ENV, None)
+            else:
+                os.environ[CONFIG_PATH_ENV] = previous_config
+
+    parameters = {key: value for key, value in vars(args).items()
+                  if key not in ('output', 'compare', 'verbose', 'label')}
+    report = {
+        'benchmark': 'throughput',
+        'label': args.label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': parameters,
+        'results': results
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"throughput_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    latency = results['latency_seconds']
+    print(f"Scored {results['scored']}/{results['files']} files in {results['wall_seconds']:.1f}s "
+          f"({results['files_per_minute']} files/min)")
+    if latency['p50'] is not None:
+        print(f"Per-file latency p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s, p99 {latency['p99']:.3f}s")
+    print(f"Peak RSS: {results['peak_rss_mb']} MB")
+    for stage, times in results['stages'].items():
+        print(f"  {stage:<24} {times['count']:>6} x {times['mean']:.4f}s = {times['total']:.2f}s")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        for line in compare_results(report, baseline):
+            print(line)
+    print(f"Saved results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+EXIT_OK = 0
+EXIT_PARTIAL_FAILURE = 1
+EXIT_USAGE_ERROR = 2
+EXIT_FAILURE = 3
+EXIT_CANCELLED = 130
+
+OUTPUT_FORMATS = ('excel', 'csv', 'json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='speaking-scorer',
+        description="Score a folder of speaking performances without the desktop interface. "
+                    "Audio files should follow the naming convention YYMMDDXXX-S-tT.mp3 "
+                    "(example: 231101013-6-t1.mp3)."
+    )
+    parser.add_argument('folder', help="Folder containing the MP3 files to score")
+    parser.add_argument('--analytic', action='store_true', help="Run analytic scoring")
+    parser.add_argument('--holistic', action='store_true', help="Run holistic scoring")
+    parser.add_argument('--off-topic', action='store_true', help="Run off-topic detection")
+    parser.add_argument('--no-score-adjustment', action='store_true',
+                        help="Skip score adjustment of the analytic scores")
+    parser.add_argument('--combined', action='store_true',
+                        help="Score all selected dimensions with one request per file")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the previous run recorded in the folder's journal")
+    parser.add_argument('--rerun-failed', action='store_true',
+                        help="Re-issue only the agent calls that failed in the previous run, for the files it scored")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Number of files scored at the same time (default: MAX_CONCURRENT_FILES from config.json)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='excel',
+                        help="Report format (default: excel)")
+    parser.add_argument('--output-dir', default=None,
+                        help="Where to write the report (default: the scored folder)")
+    parser.add_argument('--prometheus-file', default=None,
+                        help="Keep Prometheus text-format metrics updated in this file during the run")
+    parser.add_argument('--trace', action='store_true',
+                        help="Write a JSONL trace of every timed stage, counter and payload size "
+                             "(default: METRICS.trace from config.json)")
+    parser.add_argument('--summary', default='-',
+                        help="Where to write the JSON run summary, '-' for stdout (default)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"folder not found: {args.folder}")
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if not (args.analytic or args.holistic or args.off_topic):
+        # Same default as the desktop app
+        args.analytic = True
+    return args
+
+
+def write_report(performances, output_dir: str, output_format: str, agent_status: dict = None,
+                 trimmed: dict = None) -> str:
+    """Write the scored performances in the requested format and return the file path."""
+    from utils.excel_utils import build_score_rows, save_scores_to_excel
+
+    if output_format == 'excel':
+        return save_scores_to_excel(performances, output_dir, agent_status, trimmed)
+
+    rows = build_score_rows(performances, agent_status, trimmed)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filepath = os.path.join(output_dir, f'speaking_scores_{timestamp}.{output_format}')
+    if output_format == 'csv':
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    return filepath
+
+
+def write_summary(summary: dict, destination: str) -> None:
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if destination == '-':
+        sys.stdout.write(text + '\n')
+        sys.stdout.flush()
+    else:
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+def main(argv=None) -> int:
+    """
+    Headless entry point for scoring a folder, e.g. on a server or from cron.
+
+    Progress goes to stderr and a machine-readable JSON summary to stdout (or
+    --summary). Exit codes: 0 all files scored, 1 some files failed, 2 invalid
+    arguments, 3 nothing could be scored, 130 cancelled.
+    """
+    args = parse_args(argv)
+
+    from pipeline.scoring_runner import ScoringRunner
+
+    scoring_options = {
+        'analytic': args.analytic,
+        'holistic': args.holistic,
+        'off_topic': args.off_topic,
+        'score_adjustment': not args.no_score_adjustment,
+        'combined': args.combined,
+        'resume': args.resume,
+        'rerun_failed': args.rerun_failed
+    }
+
+    def log_progress(value, message):
+        print(f"[{value:3d}%] {message}", file=sys.stderr)
+
+    runner = ScoringRunner(args.folder, scoring_options, args.concurrency, on_progress=log_progress,
+                           prometheus_file=args.prometheus_file, trace=args.trace or None)
+    signal.signal(signal.SIGINT, lambda signum, frame: runner.cancel())
+
+    started = time.monotonic()
+    performances = []
+    report_path = None
+    # Agents log retries with print(); keep stdout clean for the summary.
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            performances = runner.run()
+            if performances:
+                report_path = write_report(performances, args.output_dir or args.folder, args.format,
+                                           runner.agent_status, runner.trimmed_silence)
+        except Exception as e:
+            runner.add_error(f"Critical error occurred: {str(e)}")
+
+    error_log = runner.save_error_log() if runner.errors else None
+    snapshot = runner.metrics.snapshot() if runner.metrics else {'stages': {}, 'sizes': {}, 'counters': {}}
+    counters = snapshot['counters']
+    replies = snapshot['stages'].get('generate', {}).get('count', 0)
+
+    if runner.is_cancelled:
+        exit_code = EXIT_CANCELLED
+    elif not performances:
+        exit_code = EXIT_FAILURE
+    elif runner.failed_files or runner.errors:
+        exit_code = EXIT_PARTIAL_FAILURE
+    else:
+        exit_code = EXIT_OK
+
+    write_summary({
+        'folder': os.path.abspath(args.folder),
+        'options': scoring_options,
+        'scored': len(performances),
+        'failed': len(runner.failed_files),
+        'failed_files': runner.failed_files,
+        'partial': len(runner.partial_files),
+        'partial_files': runner.partial_files,
+        'skipped': len(runner.skipped_files),
+        'skipped_files': runner.skipped_files,
+        'skip_report': runner.skip_report,
+        'error_count': len(runner.errors),
+        'error_log': error_log,
+        'report': report_path,
+        'cancelled': runner.is_cancelled,
+        'duration_seconds': round(time.monotonic() - started, 3),
+        'trace': runner.metrics.trace_path if runner.metrics else None,
+        'stage_seconds': {stage: values['total'] for stage, values in snapshot['stages'].items()},
+        'silence_trimmed_seconds': snapshot['sizes'].get('trimmed_seconds', {}).get('total'),
+        'responses': {
+            'replies': replies,
+            'invalid': counters.get('schema_failure', 0),
+            'repair_requests': counters.get('repair_request', 0),
+            'repaired': counters.get('repair_success', 0),
+            'parse_failures': counters.get('parse_failure', 0),
+            'parse_failure_rate': round(counters.get('parse_failure', 0) / replies, 4) if replies else None
+        },
+        'exit_code': exit_code
+    }, args.summary)
+    return exit_code
+
+
+if __name__ == "__main__":
+    # Needed by the audio preprocessing worker processes in the frozen executable
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,25 +1,73 @@
+import multiprocessing
+import os
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+
+MEASURE_STARTUP_FLAG = '--measure-startup'
+STARTUP_PROFILE_FILE = 'startup_profile.txt'
+
+def _startup_profile_path(argv):
+    """
+    Return where --measure-startup[=PATH] should write its report: PATH, a
+    file next to the executable when there is no console, or None for stderr.
+    """
+    for arg in argv:
+        if arg.startswith(MEASURE_STARTUP_FLAG + '='):
+            return arg.split('=', 1)[1]
+    if sys.stderr is None:
+        # Windowed PyInstaller builds have no stderr
+        base_dir = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
+        return os.path.join(base_dir, STARTUP_PROFILE_FILE)
+    return None
 
 def main():
     """
     Main entry point for the Speaking Performance Scorer application.
-    
+
     The application will:
     1. Launch the main scoring interface
     2. Allow configuration of API keys and task definitions through the UI
     3. Process audio files based on user selection
-    
+
     Audio files should follow naming convention: YYMMDDXXX-S-tT.mp3
     Example: 231101013-6-t1.mp3
+
+    Run with --measure-startup[=PATH] to open the window, report how long
+    startup took and what each imported module cost, and exit.
     """
+    profile = None
+    if any(arg.split('=', 1)[0] == MEASURE_STARTUP_FLAG for arg in sys.argv[1:]):
+        from utils.startup_profile import ImportProfile
+        profile = ImportProfile.install()
+        profile_path = _startup_profile_path(sys.argv[1:])
+        sys.argv = [arg for arg in sys.argv if arg.split('=', 1)[0] != MEASURE_STARTUP_FLAG]
+
+    # Imported here so --measure-startup can time them; the scoring pipeline
+    # itself is only loaded when scoring starts.
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    if profile:
+        profile.mark("imports done")
+
     app = QApplication(sys.argv)
-    
+
     window = MainWindow()
     window.show()
-    
+
+    if profile:
+        from PyQt6.QtCore import QTimer
+        profile.mark("window shown")
+
+        def finish_profile():
+            profile.mark("event loop running")
+            profile.uninstall()
+            profile.write_report(path=profile_path)
+            app.quit()
+
+        QTimer.singleShot(0, finish_profile)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Needed by the audio preprocessing worker processes in the frozen executable
+    multiprocessing.freeze_support()
+    main()
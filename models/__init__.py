@@ -0,0 +1,8 @@
+from .score_models import AnalyticScores, HolisticScore, OffTopicAnalysis, SpeakingPerformance
+
+__all__ = [
+    'AnalyticScores',
+    'HolisticScore',
+    'OffTopicAnalysis',
+    'SpeakingPerformance'
+]
@@ -0,0 +1,33 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class AnalyticScores(BaseModel):
+    """Band scores (1-5) for each analytic rubric domain."""
+    grammar: int
+    vocabulary: int
+    content: int
+    fluency: int
+    pronunciation: int
+    overall: int
+
+
+class HolisticScore(BaseModel):
+    """Overall score on a 0-100 scale."""
+    overall_score: float
+
+
+class OffTopicAnalysis(BaseModel):
+    """Whether the response addresses the task, and why."""
+    is_off_topic: bool
+    confidence: float
+    explanation: str
+
+
+class SpeakingPerformance(BaseModel):
+    """Everything scored for one recording; agents that were not run or failed leave None."""
+    file_name: str
+    analytic_scores: Optional[AnalyticScores] = None
+    holistic_score: Optional[HolisticScore] = None
+    off_topic_analysis: Optional[OffTopicAnalysis] = None
+    adjusted_score: Optional[float] = None
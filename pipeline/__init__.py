@@ -0,0 +1,18 @@
+from importlib import import_module
+
+# Loaded on first access so the pre-flight worker processes, which import
+# pipeline.preflight, do not pull in the agents and their clients (PEP 562).
+_EXPORTS = {
+    'ScoringRunner': '.scoring_runner'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ['ScoringRunner']
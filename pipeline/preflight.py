@@ -0,0 +1,136 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.config_manager import ConfigManager
+from utils.file_utils import error_text, peak_level_db
+from utils.audio_probe import probe_audio
+from utils.task_registry import parse_task_key
+
+DEFAULT_SETTINGS = {
+    'enabled': True,
+    'min_duration': 2.0,
+    'silence_threshold_db': -50.0,
+    'decode_check': True,
+    'workers': None
+}
+
+
+def check_recording(file_path: str, task_definitions: Dict[str, List[str]], min_duration: float,
+                    silence_threshold_db: float, decode_check: bool) -> Optional[str]:
+    """
+    Return why a recording cannot be scored, or None if it can.
+
+    Runs in a worker process. The checks go from cheap to expensive: file
+    name, task definition, then the duration from the headers, and only then
+    a decode to catch corrupt audio and recordings whose loudest frame is
+    below silence_threshold_db (dBFS). The decode stops at the first audible
+    frame, so only silent recordings are decoded in full.
+    """
+    key = parse_task_key(os.path.basename(file_path))
+    if key is None:
+        return "File name does not match YYMMDDXXX-S-tT.mp3"
+    session_id, task_id = key
+    if session_id not in task_definitions:
+        return f"No task definitions for session {session_id}"
+    if task_id not in task_definitions[session_id]:
+        return f"No task definition for session {session_id}, task {task_id}"
+
+    if os.path.getsize(file_path) == 0:
+        return "File is empty"
+    try:
+        info = probe_audio(file_path)
+    except Exception as e:
+        return f"Unreadable audio: {error_text(e)}"
+    if info.duration < min_duration:
+        return f"Too short ({info.duration:.1f}s, minimum {min_duration:g}s)"
+    if not decode_check:
+        return None
+
+    try:
+        peak = peak_level_db(file_path, stop_at_db=silence_threshold_db)
+    except Exception as e:
+        return f"Decode error: {error_text(e)}"
+    if peak is None:
+        return "No audio after decoding"
+    if peak < silence_threshold_db:
+        return f"Silent (loudest part {peak:.0f} dBFS, threshold {silence_threshold_db:g} dBFS)"
+    return None
+
+
+class Preflight:
+    """
+    Checks every recording in a folder before any request is sent.
+
+    Recordings with an unusable file name, no task definition, undecodable
+    audio, too little duration or no audible sound are set aside with a
+    reason, so only viable recordings are queued for scoring.
+    """
+
+    def __init__(self, min_duration: float = DEFAULT_SETTINGS['min_duration'],
+                 silence_threshold_db: float = DEFAULT_SETTINGS['silence_threshold_db'],
+                 decode_check: bool = DEFAULT_SETTINGS['decode_check'],
+                 max_workers: Optional[int] = None):
+        self.min_duration = min_duration
+        self.silence_threshold_db = silence_threshold_db
+        self.decode_check = decode_check
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_config(cls) -> Optional['Preflight']:
+        """Create the checks described by the PREFLIGHT setting, or return None when disabled."""
+        settings = {**DEFAULT_SETTINGS, **(ConfigManager.get_setting('PREFLIGHT') or {})}
+        if not settings['enabled']:
+            return None
+        return cls(min_duration=settings['min_duration'],
+                   silence_threshold_db=settings['silence_threshold_db'],
+                   decode_check=settings['decode_check'],
+                   max_workers=settings['workers'])
+
+    def run(self, folder_path: str, audio_files: List[str], task_definitions: dict,
+            is_cancelled: Callable[[], bool] = lambda: False,
+            on_checked: Optional[Callable[[int, int], None]] = None) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Check audio_files in a process pool.
+
+        Returns:
+            tuple: (viable file names in the original order, {skipped file name: reason})
+        """
+        # Plain lists pickle cheaply for the worker processes
+        tasks = {session_id: list(tasks) for session_id, tasks in task_definitions.items()}
+        skipped: Dict[str, str] = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(check_recording, os.path.join(folder_path, audio_file), tasks,
+                                self.min_duration, self.silence_threshold_db, self.decode_check): audio_file
+                for audio_file in audio_files
+            }
+            for checked, future in enumerate(as_completed(futures), 1):
+                if is_cancelled():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                audio_file = futures[future]
+                try:
+                    reason = future.result()
+                except Exception as e:
+                    reason = f"Check failed: {error_text(e)}"
+                if reason:
+                    skipped[audio_file] = reason
+                if on_checked:
+                    on_checked(checked, len(audio_files))
+
+        viable = [audio_file for audio_file in audio_files if audio_file not in skipped]
+        return viable, skipped
+
+    @staticmethod
+    def save_skip_report(folder_path: str, skipped: Dict[str, str]) -> str:
+        """Write the skipped recordings and their reasons to a CSV file in the folder."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = os.path.join(folder_path, f"skipped_recordings_{timestamp}.csv")
+        with open(report_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['File Name', 'Reason'])
+            for audio_file in sorted(skipped):
+                writer.writerow([audio_file, skipped[audio_file]])
+        return report_path
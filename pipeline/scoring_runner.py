@@ -0,0 +1,374 @@
+import os
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from agents.agent_pool import AgentPool
+from agents.backends import ScoringBackend
+from agents.score_adjustment_agent import ScoreAdjustmentAgent, ScoreColumns
+from models.score_models import SpeakingPerformance, AnalyticScores, HolisticScore, OffTopicAnalysis
+from pipeline.preflight import Preflight
+from utils.config_manager import ConfigManager
+from utils.metrics import TRACE_FILE_PREFIX, reset_metrics
+from utils.task_pool import run_bounded
+from utils.rate_limiter import reset_rate_limiters
+from utils.run_journal import JOURNAL_FILE, RunJournal
+from utils.task_registry import get_task_registry
+
+# Minimum seconds between rewrites of the Prometheus metrics file
+PROMETHEUS_WRITE_INTERVAL = 5.0
+
+# (scoring option, SpeakingPerformance field, label, agent method, result model)
+AGENT_STAGES = (
+    ('analytic', 'analytic_scores', "Analytic scoring", 'score_performance', AnalyticScores),
+    ('holistic', 'holistic_score', "Holistic scoring", 'score_performance', HolisticScore),
+    ('off_topic', 'off_topic_analysis', "Off-topic detection", 'analyze_topic_relevance', OffTopicAnalysis),
+)
+
+
+# Per-agent result status kept for every scored file
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+
+
+class ScoringFailed(Exception):
+    """Raised when every agent failed for a file; details are already logged."""
+
+
+class ScoringRunner:
+    """
+    Scores every MP3 in a folder with the enabled agents.
+
+    This is the UI-independent core shared by the desktop app and the command
+    line. Progress and errors are reported through optional callbacks, and
+    errors are collected in ``errors`` rather than raised.
+    """
+
+    def __init__(self, folder_path: str, scoring_options: dict, max_concurrent_files: int = None,
+                 on_progress: Optional[Callable[[int, str], None]] = None,
+                 backend_factory: Optional[Callable[[str, str], ScoringBackend]] = None,
+                 prometheus_file: Optional[str] = None, trace: Optional[bool] = None):
+        self.folder_path = folder_path
+        self.scoring_options = scoring_options
+        self.max_concurrent_files = max_concurrent_files or ConfigManager.get_max_concurrent_files()
+        self.on_progress = on_progress
+        self.backend_factory = backend_factory
+        self._is_cancelled = False
+        self.errors = []
+        # Files without any result, and files where only some agents failed
+        self.failed_files = []
+        self.partial_files = []
+        # file name -> {scoring option: STATUS_OK or STATUS_FAILED}
+        self.agent_status: Dict[str, Dict[str, str]] = {}
+        # file name -> reason, for recordings set aside by the pre-flight checks
+        self.skipped_files = {}
+        self.skip_report = None
+        self.agent_pool = None
+        # file name -> (seconds trimmed at the start, at the end), when silence trimming is on
+        self.trimmed_silence: Dict[str, tuple] = {}
+        # Analytic scores of the run as columns for score adjustment, filled as results arrive
+        self.score_columns: Optional[ScoreColumns] = None
+        self.journal = None
+        self.metrics = None
+        self.prometheus_file = prometheus_file
+        # Whether to write a JSONL trace of the run; None uses METRICS.trace from config.json
+        self.trace = trace
+        self._prometheus_written = 0.0
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    def _report_progress(self, value: int, message: str) -> None:
+        if self.on_progress:
+            self.on_progress(value, message)
+
+    def save_error_log(self):
+        """Save errors to a log file in the selected folder."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_filename = f"error_log_{timestamp}.txt"
+        log_path = os.path.join(self.folder_path, log_filename)
+
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.write(f"Error Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write("=" * 50 + "\n\n")
+            for error in self.errors:
+                f.write(f"• {error}\n")
+
+        return log_path
+
+    def add_error(self, message):
+        """Add error message to the list and emit progress update."""
+        self.errors.append(message)
+        self._report_progress(0, "Error occurred")
+
+    def cancel(self):
+        self._is_cancelled = True
+
+    def _journaled_result(self, audio_file: str, stage):
+        """Return the result of a stage finished in a previous run, or None."""
+        option, _, _, _, model_class = stage
+        result = self.journal.completed_result(audio_file, option) if self.journal else None
+        return model_class(**result) if result is not None else None
+
+    def _record_result(self, audio_file: str, option: str, result) -> None:
+        if self.journal:
+            self.journal.record(audio_file, option, result.model_dump())
+
+    def _record_failure(self, audio_file: str, option: str, error: BaseException) -> None:
+        if self.journal:
+            self.journal.record_failure(audio_file, option, str(error))
+
+    async def _run_agent(self, audio_file: str, file_path: str, stage):
+        option, _, _, method_name, _ = stage
+        result = self._journaled_result(audio_file, stage)
+        if result is None:
+            agent = self.agent_pool.get(option)
+            result = await getattr(agent, method_name)(file_path)
+            self._record_result(audio_file, option, result)
+        return result
+
+    async def _run_combined(self, audio_file: str, file_path: str, stages) -> list:
+        journaled = [self._journaled_result(audio_file, stage) for stage in stages]
+        if all(result is not None for result in journaled):
+            return journaled
+        combined = await self.agent_pool.get('combined').score_combined(file_path)
+        for option, _, _, _, _ in stages:
+            self._record_result(audio_file, option, combined[option])
+        return [combined[option] for option, _, _, _, _ in stages]
+
+    async def _score_file(self, audio_file: str) -> SpeakingPerformance:
+        """
+        Run the enabled agents for one file concurrently, or a single combined
+        request in combined mode. Results already in the run journal are reused
+        instead of calling the agents again.
+
+        When only some agents fail, the performance keeps the other results and
+        the file is listed in partial_files; raises only if every agent failed.
+        """
+        file_path = os.path.join(self.folder_path, audio_file)
+        performance = SpeakingPerformance(
+            file_name=audio_file,
+            analytic_scores=None,
+            holistic_score=None,
+            off_topic_analysis=None,
+            adjusted_score=None
+        )
+
+        stages = [stage for stage in AGENT_STAGES if self.scoring_options[stage[0]]]
+        unfinished = [stage for stage in stages if self._journaled_result(audio_file, stage) is None]
+        if not unfinished:
+            return await self._score_stages(audio_file, file_path, stages, performance)
+
+        # Hold the file's audio so every agent shares one load, released when they are all done
+        audio_store = self.agent_pool.audio_store
+        try:
+            await audio_store.acquire(file_path)
+        except Exception as e:
+            # Journal the failure per agent so a failures-only rerun retries the file
+            status = self.agent_status.setdefault(audio_file, {})
+            for option, _, _, _, _ in unfinished:
+                self._record_failure(audio_file, option, e)
+                status[option] = STATUS_FAILED
+            raise
+        try:
+            return await self._score_stages(audio_file, file_path, stages, performance)
+        finally:
+            audio_store.release(file_path)
+
+    async def _score_stages(self, audio_file: str, file_path: str, stages: list,
+                            performance: SpeakingPerformance) -> SpeakingPerformance:
+        if self.scoring_options.get('combined') and stages:
+            try:
+                results = await self._run_combined(audio_file, file_path, stages)
+            except Exception as e:
+                self.add_error(f"Combined scoring failed for {audio_file}: {str(e)}")
+                # Results journaled by an earlier run are still kept
+                results = [self._journaled_result(audio_file, stage) or e for stage in stages]
+        else:
+            results = await asyncio.gather(
+                *(self._run_agent(audio_file, file_path, stage) for stage in stages),
+                return_exceptions=True
+            )
+
+        status = self.agent_status.setdefault(audio_file, {})
+        for (option, field, label, _, _), result in zip(stages, results):
+            if isinstance(result, BaseException):
+                if not self.scoring_options.get('combined'):
+                    self.add_error(f"{label} failed for {audio_file}: {str(result)}")
+                self._record_failure(audio_file, option, result)
+                status[option] = STATUS_FAILED
+            else:
+                setattr(performance, field, result)
+                status[option] = STATUS_OK
+                if option == 'analytic' and self.score_columns is not None:
+                    self.score_columns.set(audio_file, result)
+
+        if stages and all(value == STATUS_FAILED for value in status.values()):
+            raise ScoringFailed(audio_file)
+        if STATUS_FAILED in status.values():
+            self.partial_files.append(audio_file)
+        return performance
+
+    async def _score_file_timed(self, audio_file: str) -> SpeakingPerformance:
+        with self.metrics.timer('score_file', file=audio_file):
+            return await self._score_file(audio_file)
+
+    def _run_preflight(self, audio_files: List[str]) -> List[str]:
+        """
+        Set aside recordings that cannot be scored and return the rest.
+
+        Every file is matched against the task registry first; the audio
+        checks then run on the remaining files when PREFLIGHT is enabled.
+        """
+        registry = get_task_registry()
+        skipped = registry.validate(audio_files)
+        viable = [audio_file for audio_file in audio_files if audio_file not in skipped]
+
+        preflight = Preflight.from_config()
+        if preflight is not None and viable:
+            self._report_progress(0, "Checking recordings...")
+            with self.metrics.timer('preflight'):
+                viable, audio_skipped = preflight.run(self.folder_path, viable, registry.as_dict(),
+                                                      is_cancelled=lambda: self._is_cancelled)
+            skipped.update(audio_skipped)
+        if skipped:
+            self.skipped_files = skipped
+            for audio_file in sorted(skipped):
+                self.add_error(f"Skipped {audio_file}: {skipped[audio_file]}")
+                self.metrics.increment('file_skipped', file=audio_file, reason=skipped[audio_file])
+            self.skip_report = Preflight.save_skip_report(self.folder_path, skipped)
+        return viable
+
+    def _start_metrics(self) -> None:
+        """
+        Start this run's metrics. A trace is only written when requested, to
+        METRICS.trace_dir or, by default, next to the error log in the folder.
+        """
+        settings = ConfigManager.get_setting('METRICS') or {}
+        trace_path = None
+        if self.trace if self.trace is not None else settings.get('trace', False):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            trace_dir = settings.get('trace_dir') or self.folder_path
+            os.makedirs(trace_dir, exist_ok=True)
+            trace_path = os.path.join(trace_dir, f"{TRACE_FILE_PREFIX}{timestamp}.jsonl")
+        self.metrics = reset_metrics(trace_path)
+        self.prometheus_file = self.prometheus_file or settings.get('prometheus_file')
+
+    def _write_prometheus(self, force: bool = False) -> None:
+        if not self.prometheus_file:
+            return
+        now = time.monotonic()
+        if force or now - self._prometheus_written >= PROMETHEUS_WRITE_INTERVAL:
+            try:
+                self.metrics.write_prometheus(self.prometheus_file)
+            except OSError as e:
+                print(f"Could not write metrics to {self.prometheus_file}: {e}")
+            self._prometheus_written = now
+
+    def _file_done(self, completed: int, total_files: int, audio_file: str, result) -> None:
+        """Record a finished file and report progress."""
+        if isinstance(result, Exception):
+            if not isinstance(result, ScoringFailed):
+                self.add_error(f"Error processing {audio_file}: {str(result)}")
+            self.failed_files.append(audio_file)
+            self.metrics.increment('file_failed', file=audio_file)
+        elif audio_file in self.partial_files:
+            self.metrics.increment('file_partial', file=audio_file)
+        elif result is not None:
+            self.metrics.increment('file_scored', file=audio_file)
+        self._write_prometheus()
+
+        progress = int(completed / total_files * 100)
+        self._report_progress(progress, f"Processing: {audio_file}")
+
+    def run(self) -> List[SpeakingPerformance]:
+        """
+        Score the folder and return the scored performances in file order,
+        including those where only some agents succeeded.
+
+        With the 'rerun_failed' option, the previous run's journal is resumed
+        and only the files it recorded are scored again, so just the agent
+        calls that failed or never finished are re-issued.
+
+        Raises:
+            ValueError: When the run cannot start, e.g. an API key is missing
+        """
+        audio_files = sorted(f for f in os.listdir(self.folder_path) if f.endswith('.mp3'))
+        if not audio_files:
+            self.add_error("No MP3 files found in the selected folder.")
+            return []
+
+        reset_rate_limiters()
+        self._start_metrics()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            rerun_failed = self.scoring_options.get('rerun_failed', False)
+            resume = rerun_failed or self.scoring_options.get('resume', False)
+            journal_path = os.path.join(self.folder_path, JOURNAL_FILE)
+            if resume:
+                RunJournal.check_options(journal_path, self.scoring_options)
+            if rerun_failed:
+                results, failures = RunJournal.load(journal_path)
+                attempted = set(results) | set(failures)
+                audio_files = [audio_file for audio_file in audio_files if audio_file in attempted]
+                if not audio_files:
+                    self.add_error("No previous run to rerun failures from was found in this folder.")
+                    return []
+
+            audio_files = self._run_preflight(audio_files)
+            if self._is_cancelled:
+                self.add_error("Scoring process cancelled by user.")
+                return []
+            if not audio_files:
+                self.add_error("No recordings passed the pre-flight checks.")
+                return []
+
+            total_files = len(audio_files)
+            if self.scoring_options['score_adjustment'] and self.scoring_options['analytic']:
+                self.score_columns = ScoreColumns(audio_files)
+            self.agent_pool = AgentPool(self.scoring_options, self.backend_factory)
+            with self.metrics.timer('prepare_prompts'):
+                loop.run_until_complete(self.agent_pool.prepare_prompts(get_task_registry().tasks_for(audio_files)))
+            # Opened only once scoring can start, so a run that fails to start keeps the previous journal
+            self.journal = RunJournal(self.folder_path, self.scoring_options, resume=resume)
+            if self.journal.rotated_path:
+                self._report_progress(0, f"Previous journal kept as {os.path.basename(self.journal.rotated_path)}")
+            results = loop.run_until_complete(run_bounded(
+                audio_files,
+                self._score_file_timed,
+                self.max_concurrent_files,
+                on_done=lambda completed, index, audio_file, result: self._file_done(
+                    completed, total_files, audio_file, result),
+                is_cancelled=lambda: self._is_cancelled
+            ))
+            performances = [r for r in results if isinstance(r, SpeakingPerformance)]
+
+            if self._is_cancelled:
+                self.add_error("Scoring process cancelled by user.")
+
+            if not self._is_cancelled and self.scoring_options['score_adjustment'] and performances:
+                try:
+                    self._report_progress(100, "Adjusting scores...")
+                    agent = ScoreAdjustmentAgent.from_config()
+                    with self.metrics.timer('score_adjustment'):
+                        performances = agent.adjust_scores(performances, self.score_columns)
+                except Exception as e:
+                    self.add_error(f"Score adjustment failed: {str(e)}")
+
+        finally:
+            if self.agent_pool:
+                if self.agent_pool.audio_preprocessor:
+                    self.trimmed_silence = dict(self.agent_pool.audio_preprocessor.trimmed)
+                loop.run_until_complete(self.agent_pool.release_prompts())
+                self.agent_pool.close()
+            if self.journal:
+                self.journal.close()
+            self.metrics.close()
+            self._write_prometheus(force=True)
+            loop.close()
+
+        return performances
@@ -0,0 +1,16 @@
+"""Prompts for repairing replies that do not match an agent's response format."""
+
+SYSTEM_PROMPT = [
+            "You previously scored a student's speaking performance, but your reply could not be used.",
+            "The problems with the reply are listed below.",
+            "Rewrite the reply so it fixes these problems. Only fix its format: keep every score and judgement exactly as given, and do not add or change any score.",
+            "Reply with JSON only, in this format: <<FORMAT>>",
+            "",
+            "<PROBLEMS>",
+            "<<PROBLEMS>>",
+            "</PROBLEMS>",
+            "",
+            "<PREVIOUS_REPLY>",
+            "<<REPLY>>",
+            "</PREVIOUS_REPLY>"
+        ]
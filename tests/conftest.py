@@ -0,0 +1,23 @@
+import json
+import os
+import sys
+import pytest
+
+# The application modules are imported from the repository root, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config_manager import CONFIG_PATH_ENV
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    """Point ConfigManager at tmp_path/config.json; call the fixture with the settings to write there."""
+    path = tmp_path / 'config.json'
+    monkeypatch.setenv(CONFIG_PATH_ENV, str(path))
+
+    def write(**settings) -> str:
+        path.write_text(json.dumps(settings), encoding='utf-8')
+        return str(path)
+
+    write()
+    return write
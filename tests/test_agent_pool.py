@@ -0,0 +1,98 @@
+import asyncio
+from agents.agent_pool import AgentPool
+from agents.backends import FakeBackend
+
+OPTIONS = {'analytic': True, 'holistic': True, 'off_topic': True, 'combined': False}
+
+
+def make_pool(options, created):
+    def backend_factory(api_key, model_name):
+        created.append(api_key)
+        return FakeBackend(seed=0)
+    return AgentPool(options, backend_factory)
+
+
+def test_agents_with_the_same_key_share_one_backend(write_config):
+    write_config(ANALYTIC_SCORING_API_KEY='shared', HOLISTIC_SCORING_API_KEY='shared',
+                 OFF_TOPIC_DETECTION_API_KEY='own', RESULT_CACHE={'enabled': False})
+    created = []
+    pool = make_pool(OPTIONS, created)
+
+    assert set(pool.agents) == {'analytic', 'holistic', 'off_topic'}
+    assert sorted(created) == ['own', 'shared']
+    assert pool.get('analytic').model is pool.get('holistic').model
+    assert pool.get('off_topic').model is not pool.get('analytic').model
+    # Every agent reads audio through the one store of the run
+    assert len({id(agent.audio_store) for agent in pool.agents.values()}) == 1
+    pool.close()
+
+
+def test_combined_mode_builds_one_agent(write_config):
+    write_config(ANALYTIC_SCORING_API_KEY='key', RESULT_CACHE={'enabled': False})
+    pool = make_pool(dict(OPTIONS, combined=True), [])
+    assert list(pool.agents) == ['combined']
+    pool.close()
+
+
+def test_disabled_agents_are_not_built(write_config):
+    write_config(RESULT_CACHE={'enabled': False})
+    pool = make_pool(dict(OPTIONS, holistic=False, off_topic=False), [])
+    assert list(pool.agents) == ['analytic']
+    pool.close()
+
+
+def test_prepare_prompts_renders_each_task_once(write_config):
+    write_config(RESULT_CACHE={'enabled': False})
+    pool = make_pool(dict(OPTIONS, holistic=False, off_topic=False), [])
+    asyncio.run(pool.prepare_prompts([('1', 't1'), ('1', 't1'), ('2', 't2')]))
+    assert set(pool.get('analytic').rendered_prompts) == {('1', 't1'), ('2', 't2')}
+    pool.close()
+
+
+def test_close_releases_the_result_cache(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': True, 'path': str(tmp_path / 'cache.sqlite3')})
+    pool = make_pool(dict(OPTIONS, holistic=False, off_topic=False), [])
+    assert pool.get('analytic').result_cache is pool.result_cache is not None
+    pool.close()
+    assert pool.result_cache is None
+
+
+class CachingBackend(FakeBackend):
+    SUPPORTS_PROMPT_CACHE = True
+
+    def __init__(self, min_tokens, **kwargs):
+        super().__init__(**kwargs)
+        self.MIN_CACHED_PROMPT_TOKENS = min_tokens
+        self.cached = []
+
+    async def cache_prompt(self, prompt, ttl_seconds):
+        self.cached.append(prompt)
+        return True
+
+
+def test_rubric_below_the_cache_minimum_is_not_sent_for_caching(write_config):
+    write_config(RESULT_CACHE={'enabled': False}, PROMPT_CACHE={'enabled': True})
+    backends = []
+
+    def backend_factory(api_key, model_name):
+        backends.append(CachingBackend(min_tokens=32768, seed=0))
+        return backends[-1]
+
+    pool = AgentPool(dict(OPTIONS, holistic=False, off_topic=False), backend_factory)
+    asyncio.run(pool.prepare_prompts([('1', 't1')]))
+    assert backends[0].cached == []
+    pool.close()
+
+
+def test_rubric_above_the_cache_minimum_is_cached(write_config):
+    write_config(RESULT_CACHE={'enabled': False}, PROMPT_CACHE={'enabled': True})
+    backends = []
+
+    def backend_factory(api_key, model_name):
+        backends.append(CachingBackend(min_tokens=10, seed=0))
+        return backends[-1]
+
+    pool = AgentPool(dict(OPTIONS, holistic=False, off_topic=False), backend_factory)
+    asyncio.run(pool.prepare_prompts([('1', 't1')]))
+    assert backends[0].cached == [pool.get('analytic').rubric_prompt]
+    pool.close()
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from utils.audio_payload import AudioPayload, AudioStore
+from utils.metrics import reset_metrics
+
+
+def test_payload_maps_the_file_without_copying(tmp_path):
+    path = tmp_path / 'a.mp3'
+    path.write_bytes(b'0123456789')
+    payload = AudioPayload(str(path))
+    assert isinstance(payload.data, memoryview) and payload.data.readonly
+    assert bytes(payload.data) == b'0123456789' and len(payload) == 10
+    payload.close()
+
+
+def test_empty_file_falls_back_to_bytes(tmp_path):
+    path = tmp_path / 'empty.mp3'
+    path.write_bytes(b'')
+    payload = AudioPayload(str(path))
+    assert len(payload) == 0
+    payload.close()
+
+
+def test_holders_share_one_load_until_the_last_release(tmp_path):
+    path = str(tmp_path / 'a.mp3')
+    with open(path, 'wb') as f:
+        f.write(b'audio')
+    metrics = reset_metrics()
+    store = AudioStore()
+
+    async def scenario():
+        first, second = await asyncio.gather(store.acquire(path), store.acquire(path))
+        assert first is second
+        store.release(path)
+        assert store.open_files == 1 and bytes(first.data) == b'audio'
+        store.release(path)
+        assert store.open_files == 0
+        with pytest.raises(ValueError):
+            bytes(first.data)
+        async with store.open(path) as third:
+            assert third is not first
+
+    asyncio.run(scenario())
+    # One timed read per load, not per holder
+    assert metrics.snapshot()['stages']['read_audio']['count'] == 2
+
+
+def test_failed_load_is_not_kept(tmp_path):
+    store = AudioStore()
+
+    async def scenario():
+        with pytest.raises(FileNotFoundError):
+            await store.acquire(str(tmp_path / 'missing.mp3'))
+        assert store.open_files == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_holder_does_not_abort_the_others(tmp_path):
+    path = str(tmp_path / 'a.mp3')
+    with open(path, 'wb') as f:
+        f.write(b'audio')
+    store = AudioStore()
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(store.acquire(path))
+        kept = asyncio.ensure_future(store.acquire(path))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        payload = await kept
+        assert bytes(payload.data) == b'audio'
+        assert store.open_files == 1
+        store.release(path)
+        assert store.open_files == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import numpy as np
+import pytest
+import soundfile as sf
+from utils.audio_preprocessing import SOURCE_MIME_TYPE, AudioPreprocessor, convert_audio
+
+
+def write_tone(path, seconds=1.0, sample_rate=22050):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    sf.write(str(path), 0.5 * np.sin(2 * np.pi * 220 * t), sample_rate)
+    return str(path)
+
+
+def cached_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if not name.endswith('.json'))
+
+
+def test_convert_audio_writes_mono_at_the_target_rate(tmp_path):
+    source = write_tone(tmp_path / 'source.wav', seconds=2.0)
+    target = str(tmp_path / 'out.flac')
+    info = convert_audio(source, target, 16000, 'flac', 0.7)
+    data, sample_rate = sf.read(target)
+    assert sample_rate == 16000 and data.ndim == 1
+    assert info['duration'] == pytest.approx(2.0, abs=0.01)
+    assert info['size'] == os.path.getsize(target)
+    assert os.path.exists(target + '.json')
+
+
+def test_prepare_converts_each_file_once(tmp_path):
+    source = write_tone(tmp_path / 'source.wav')
+    preprocessor = AudioPreprocessor(str(tmp_path / 'cache'), codec='flac', max_workers=1)
+
+    async def prepare_concurrently():
+        return await asyncio.gather(*(preprocessor.prepare(source) for _ in range(3)))
+
+    try:
+        results = asyncio.run(prepare_concurrently())
+        assert len({path for path, _ in results}) == 1
+        assert results[0][1] == 'audio/flac'
+        assert len(cached_files(preprocessor.cache_dir)) == 1
+
+        mtime = os.path.getmtime(results[0][0])
+        again, _ = asyncio.run(preprocessor.prepare(source))
+        assert again == results[0][0]
+        assert os.path.getmtime(again) >= mtime
+    finally:
+        preprocessor.close()
+
+
+def test_settings_are_part_of_the_cache_key(tmp_path):
+    source = write_tone(tmp_path / 'source.wav')
+    cache_dir = str(tmp_path / 'cache')
+    paths = set()
+    for sample_rate in (16000, 8000):
+        preprocessor = AudioPreprocessor(cache_dir, sample_rate=sample_rate, codec='flac', max_workers=1)
+        paths.add(asyncio.run(preprocessor.prepare(source))[0])
+        preprocessor.close()
+    assert len(paths) == 2
+
+
+def test_unreadable_file_falls_back_to_the_original(tmp_path):
+    source = tmp_path / 'broken.mp3'
+    source.write_bytes(b'not audio at all')
+    preprocessor = AudioPreprocessor(str(tmp_path / 'cache'), codec='flac', max_workers=1)
+    try:
+        assert asyncio.run(preprocessor.prepare(str(source))) == (str(source), SOURCE_MIME_TYPE)
+    finally:
+        preprocessor.close()
+
+
+def test_evict_removes_the_least_recently_used(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    preprocessor = AudioPreprocessor(str(cache_dir), codec='flac', max_cache_mb=2.5 / 1024)
+    for index, name in enumerate(('old.flac', 'middle.flac', 'new.flac')):
+        path = cache_dir / name
+        path.write_bytes(bytes(1024))
+        (cache_dir / (name + '.json')).write_text('{}')
+        os.utime(path, (1000 + index, 1000 + index))
+
+    assert preprocessor.evict() == 1
+    assert cached_files(cache_dir) == ['middle.flac', 'new.flac']
+    assert not (cache_dir / 'old.flac.json').exists()
+
+
+def test_invalid_codec_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        AudioPreprocessor(str(tmp_path), codec='mp4')
+    with pytest.raises(ValueError):
+        AudioPreprocessor(str(tmp_path), codec='opus', sample_rate=22050)
@@ -0,0 +1,72 @@
+import struct
+import pytest
+from benchmarks.synthetic_corpus import FRAME_HEADER, FRAME_SECONDS, FRAME_SIZE, SILENT_FRAME
+from utils.audio_probe import parse_frame_header, probe_audio
+
+# MPEG-1 Layer III, 64 kbps, 44.1 kHz, joint stereo: a different bitrate for VBR streams
+FRAME_HEADER_64K = bytes([0xFF, 0xFB, 0x50, 0x64])
+FRAME_SIZE_64K = 144 * 64000 // 44100
+# The VBR tags follow the 32 bytes of stereo side information
+TAG_OFFSET = 4 + 32
+
+
+def tagged_frame(tag: bytes) -> bytes:
+    frame = bytearray(SILENT_FRAME)
+    frame[TAG_OFFSET:TAG_OFFSET + len(tag)] = tag
+    return bytes(frame)
+
+
+def write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "231101001-1-t1.mp3"
+    path.write_bytes(data)
+    return str(path)
+
+
+def vbr_frames(count: int) -> bytes:
+    low = FRAME_HEADER_64K + bytes(FRAME_SIZE_64K - 4)
+    return b"".join(SILENT_FRAME if index % 2 else low for index in range(count))
+
+
+def test_parse_frame_header():
+    frame = parse_frame_header(FRAME_HEADER, 0)
+    assert (frame.version, frame.layer, frame.bitrate, frame.sample_rate) == (1, 3, 128, 44100)
+    assert (frame.channels, frame.samples, frame.length) == (2, 1152, FRAME_SIZE)
+    assert parse_frame_header(b"\x00\x00\x00\x00", 0) is None
+
+
+def test_cbr_duration_from_file_size(tmp_path):
+    info = probe_audio(write(tmp_path, SILENT_FRAME * 200))
+    assert info.method == 'cbr'
+    assert (info.sample_rate, info.channels, info.bitrate) == (44100, 2, 128)
+    assert info.duration == pytest.approx(200 * FRAME_SIZE * 8 / 128000)
+
+
+def test_cbr_after_id3_tag(tmp_path):
+    id3 = b"ID3\x04\x00\x00" + bytes([0, 0, 0x02, 0x00]) + bytes(256)
+    info = probe_audio(write(tmp_path, id3 + SILENT_FRAME * 100))
+    assert info.method == 'cbr'
+    assert info.duration == pytest.approx(100 * FRAME_SIZE * 8 / 128000)
+
+
+def test_xing_tag_gives_frame_count(tmp_path):
+    # Frames and bytes fields present; the tag frame itself is not counted
+    xing = b"Xing" + struct.pack('>III', 0x3, 300, 300 * FRAME_SIZE)
+    info = probe_audio(write(tmp_path, tagged_frame(xing) + vbr_frames(300)))
+    assert info.method == 'xing'
+    assert info.duration == pytest.approx(300 * FRAME_SECONDS)
+    assert info.bitrate == round(300 * FRAME_SIZE * 8 / (300 * FRAME_SECONDS) / 1000)
+
+
+def test_vbri_tag_gives_frame_count(tmp_path):
+    # version, delay, quality, then byte and frame counts
+    vbri = b"VBRI" + struct.pack('>HHHII', 1, 0, 75, 120 * FRAME_SIZE, 120)
+    info = probe_audio(write(tmp_path, tagged_frame(vbri) + vbr_frames(120)))
+    assert info.method == 'vbri'
+    assert info.duration == pytest.approx(120 * FRAME_SECONDS)
+
+
+def test_untagged_vbr_walks_the_frames(tmp_path):
+    info = probe_audio(write(tmp_path, vbr_frames(100)))
+    assert info.method == 'frame_scan'
+    assert info.duration == pytest.approx(100 * FRAME_SECONDS)
+    assert info.bitrate == round((FRAME_SIZE + FRAME_SIZE_64K) * 50 * 8 / (100 * FRAME_SECONDS) / 1000)
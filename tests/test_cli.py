@@ -0,0 +1,70 @@
+import json
+import pytest
+import cli
+from benchmarks.synthetic_corpus import corpus_file_names, synthetic_mp3
+
+
+@pytest.fixture(autouse=True)
+def keep_sigint_handler(monkeypatch):
+    """main() routes Ctrl+C to the runner; leave pytest's own handler in place."""
+    monkeypatch.setattr(cli.signal, 'signal', lambda signum, handler: None)
+
+
+@pytest.fixture
+def folder(tmp_path, write_config):
+    write_config(SCORING_BACKEND='fake',
+                 FAKE_BACKEND={'latency': {'distribution': 'constant', 'value': 0.0}, 'seed': 0},
+                 RESULT_CACHE={'enabled': False}, PREFLIGHT={'enabled': False})
+    recordings = tmp_path / 'recordings'
+    recordings.mkdir()
+    for name in corpus_file_names(3):
+        (recordings / name).write_bytes(synthetic_mp3(1.0))
+    return recordings
+
+
+def run(folder, tmp_path, *flags):
+    summary = tmp_path / 'summary.json'
+    exit_code = cli.main([str(folder), '--summary', str(summary), *flags])
+    return exit_code, json.loads(summary.read_text(encoding='utf-8'))
+
+
+def test_all_files_scored(folder, tmp_path):
+    exit_code, summary = run(folder, tmp_path, '--holistic', '--format', 'json')
+    assert exit_code == cli.EXIT_OK == summary['exit_code']
+    assert (summary['scored'], summary['failed'], summary['error_count']) == (3, 0, 0)
+    assert summary['options']['holistic'] and not summary['options']['analytic']
+    with open(summary['report'], encoding='utf-8') as f:
+        rows = json.load(f)
+    assert len(rows) == 3 and all(row['Holistic Score'] is not None for row in rows)
+    assert summary['responses']['replies'] == 3
+
+
+def test_defaults_to_analytic_scoring(folder, tmp_path):
+    exit_code, summary = run(folder, tmp_path, '--format', 'csv')
+    assert exit_code == cli.EXIT_OK
+    assert summary['options']['analytic'] and summary['report'].endswith('.csv')
+
+
+def test_skipped_file_is_a_partial_failure(folder, tmp_path):
+    (folder / 'not-a-recording.mp3').write_bytes(synthetic_mp3(1.0))
+    exit_code, summary = run(folder, tmp_path, '--format', 'json')
+    assert exit_code == cli.EXIT_PARTIAL_FAILURE
+    assert summary['scored'] == 3 and list(summary['skipped_files']) == ['not-a-recording.mp3']
+    assert summary['error_log']
+
+
+def test_nothing_to_score(tmp_path, write_config):
+    empty = tmp_path / 'empty'
+    empty.mkdir()
+    exit_code, summary = run(empty, tmp_path)
+    assert exit_code == cli.EXIT_FAILURE
+    assert summary['scored'] == 0 and summary['report'] is None
+
+
+def test_invalid_arguments(tmp_path, folder):
+    with pytest.raises(SystemExit) as exited:
+        cli.main([str(tmp_path / 'missing')])
+    assert exited.value.code == cli.EXIT_USAGE_ERROR
+    with pytest.raises(SystemExit) as exited:
+        cli.main([str(folder), '--concurrency', '0'])
+    assert exited.value.code == cli.EXIT_USAGE_ERROR
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from agents.backends import BackendError, FakeBackend
+from agents.combined_scoring_agent import CombinedScoringAgent
+from benchmarks.synthetic_corpus import corpus_file_names, synthetic_mp3
+from models.score_models import AnalyticScores, HolisticScore, OffTopicAnalysis
+from pipeline.scoring_runner import ScoringRunner
+from utils.response_parser import ResponseParser
+
+REPLY = {'grammar': 4, 'vocabulary': 3, 'content': 5, 'fluency': 4, 'pronunciation': 3, 'overall': 4,
+         'overall_score': 78, 'off_topic': False, 'confidence': 0.9, 'explanation': "Addresses the task."}
+
+
+def test_combined_reply_is_split_per_agent():
+    assert ResponseParser.parse_combined_response(json.dumps(REPLY)) == {
+        'analytic': {'grammar': 4, 'vocabulary': 3, 'content': 5, 'fluency': 4, 'pronunciation': 3, 'overall': 4},
+        'holistic': {'overall_score': 78},
+        'off_topic': {'is_off_topic': False, 'confidence': 0.9, 'explanation': "Addresses the task."},
+    }
+
+
+def test_combined_reply_missing_a_dimension_is_rejected():
+    reply = {key: value for key, value in REPLY.items() if key != 'overall_score'}
+    assert ResponseParser.parse_combined_response(json.dumps(reply)) is None
+
+
+def test_combined_agent_scores_everything_in_one_request(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False})
+    recording = tmp_path / '231101001-1-t1.mp3'
+    recording.write_bytes(synthetic_mp3(1.0))
+    backend = FakeBackend(latency={'distribution': 'constant', 'value': 0.0}, seed=0)
+    agent = CombinedScoringAgent(api_key='key', backend=backend)
+
+    result = asyncio.run(agent.score_combined(str(recording)))
+
+    assert isinstance(result['analytic'], AnalyticScores)
+    assert isinstance(result['holistic'], HolisticScore)
+    assert isinstance(result['off_topic'], OffTopicAnalysis)
+    assert backend.counts['requests'] == 1
+
+
+def test_combined_run_sends_one_request_per_file(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False}, PREFLIGHT={'enabled': False})
+    folder = tmp_path / 'recordings'
+    folder.mkdir()
+    for name in corpus_file_names(3):
+        (folder / name).write_bytes(synthetic_mp3(1.0))
+    backends = []
+
+    def backend_factory(api_key, model_name):
+        backends.append(FakeBackend(latency={'distribution': 'constant', 'value': 0.0}, seed=0))
+        return backends[-1]
+
+    options = {'analytic': True, 'holistic': True, 'off_topic': True, 'score_adjustment': False,
+               'combined': True}
+    performances = ScoringRunner(str(folder), options, backend_factory=backend_factory).run()
+
+    assert len(performances) == 3
+    assert all(p.analytic_scores and p.holistic_score and p.off_topic_analysis for p in performances)
+    assert len(backends) == 1 and backends[0].counts['requests'] == 3
+
+
+class FlakyBackend(FakeBackend):
+    """Fails the first request with a server error and counts how often the audio is prepared."""
+
+    def prepare_audio(self, audio_bytes, mime_type="audio/mp3"):
+        self.counts['prepared_audio'] += 1
+        return audio_bytes
+
+    async def generate_content(self, prompt, audio_bytes, mime_type="audio/mp3", response_schema=None):
+        if not self.counts['requests']:
+            self.counts['requests'] += 1
+            raise BackendError(503, "Simulated server error")
+        return await super().generate_content(prompt, audio_bytes, mime_type, response_schema)
+
+
+def test_audio_is_prepared_once_for_all_attempts(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False}, RETRY_POLICY={'base_delay': 0.0})
+    recording = tmp_path / '231101001-1-t1.mp3'
+    recording.write_bytes(synthetic_mp3(1.0))
+    backend = FlakyBackend(latency={'distribution': 'constant', 'value': 0.0}, seed=0)
+    agent = CombinedScoringAgent(api_key='key', backend=backend)
+
+    asyncio.run(agent.score_combined(str(recording)))
+
+    assert backend.counts['requests'] == 2
+    assert backend.counts['prepared_audio'] == 1
@@ -0,0 +1,59 @@
+import json
+import os
+import pytest
+from utils.config_manager import ConfigManager
+
+
+def test_snapshot_is_read_once_and_is_read_only(write_config):
+    write_config(MAX_CONCURRENT_FILES=3, PREFLIGHT={'checks': ['decode']})
+    config = ConfigManager.load_config()
+
+    assert ConfigManager.load_config() is config
+    assert config['PREFLIGHT']['checks'] == ('decode',)
+    with pytest.raises(TypeError):
+        config['MAX_CONCURRENT_FILES'] = 8
+    with pytest.raises(TypeError):
+        config['PREFLIGHT']['checks'] = ()
+
+
+def test_changed_file_is_read_again(write_config):
+    path = write_config(MAX_CONCURRENT_FILES=3)
+    assert ConfigManager.get_max_concurrent_files() == 3
+
+    # Same size, so only the new mtime shows the change
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'MAX_CONCURRENT_FILES': 5}, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert ConfigManager.get_max_concurrent_files() == 5
+
+
+def test_unreadable_file_keeps_the_previous_config(write_config):
+    path = write_config(MAX_CONCURRENT_FILES=3)
+    assert ConfigManager.get_max_concurrent_files() == 3
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"MAX_CONCURRENT_FILES": ')
+    assert ConfigManager.get_max_concurrent_files() == 3
+
+
+def test_save_replaces_the_file_and_the_snapshot(write_config, tmp_path):
+    path = write_config(MAX_CONCURRENT_FILES=3)
+    config = ConfigManager.load_config()
+
+    ConfigManager.save_config({**config, 'MAX_CONCURRENT_FILES': 6, 'PREFLIGHT': {'checks': ['decode']}})
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'MAX_CONCURRENT_FILES': 6, 'PREFLIGHT': {'checks': ['decode']}}
+    assert ConfigManager.load_config()['MAX_CONCURRENT_FILES'] == 6
+    assert sorted(os.listdir(tmp_path)) == ['config.json']
+
+
+def test_failed_save_leaves_the_file_and_no_temp_file(write_config, tmp_path):
+    path = write_config(MAX_CONCURRENT_FILES=3)
+
+    with pytest.raises(TypeError):
+        ConfigManager.save_config({'MAX_CONCURRENT_FILES': object()})
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'MAX_CONCURRENT_FILES': 3}
+    assert sorted(os.listdir(tmp_path)) == ['config.json']
@@ -0,0 +1,93 @@
+import json
+import os
+import pytest
+from benchmarks.synthetic_corpus import corpus_file_names, synthetic_mp3
+from agents.backends import FakeBackend
+from pipeline.scoring_runner import ScoringRunner
+from utils.metrics import TRACE_FILE_PREFIX, Metrics, get_metrics, reset_metrics, timed
+
+
+def test_snapshot_sums_over_agents_and_keeps_each_agent():
+    metrics = Metrics()
+    metrics.record_time('generate', 2.0, 'AnalyticScoringAgent')
+    metrics.record_time('generate', 1.0, 'HolisticScoringAgent')
+    metrics.increment('cache_hit', 'AnalyticScoringAgent', value=3)
+    metrics.observe_size('audio_bytes', 1000, 'AnalyticScoringAgent')
+    metrics.observe_size('audio_bytes', 3000, 'AnalyticScoringAgent')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['stages']['generate'] == {'count': 2, 'total': 3.0, 'mean': 1.5, 'max': 2.0}
+    assert snapshot['counters'] == {'cache_hit': 3}
+    assert snapshot['sizes']['audio_bytes']['mean'] == 2000
+    assert snapshot['by_agent']['HolisticScoringAgent']['stages']['generate']['total'] == 1.0
+
+
+def test_timer_records_failed_blocks():
+    metrics = Metrics()
+    with pytest.raises(RuntimeError):
+        with metrics.timer('api_request', 'Agent'):
+            raise RuntimeError("boom")
+    assert metrics.snapshot()['stages']['api_request']['count'] == 1
+
+
+def test_timed_decorator_uses_the_current_run():
+    @timed('parse')
+    def parse():
+        return 42
+
+    metrics = reset_metrics()
+    assert parse() == 42
+    assert get_metrics() is metrics
+    assert metrics.snapshot()['stages']['parse']['count'] == 1
+
+
+def test_prometheus_exposition(tmp_path):
+    metrics = Metrics()
+    metrics.record_time('generate', 1.5, 'Agent')
+    metrics.increment('retry_rate_limit', 'Agent')
+    metrics.increment('file_skipped', reason='say "hi"\nagain')
+    metrics.observe_size('prompt_chars', 120)
+    path = str(tmp_path / 'scorer.prom')
+    metrics.write_prometheus(path)
+
+    lines = open(path, encoding='utf-8').read().splitlines()
+    assert 'scorer_stage_duration_seconds_sum{stage="generate",agent="Agent"} 1.500000' in lines
+    assert 'scorer_stage_duration_seconds_count{stage="generate",agent="Agent"} 1' in lines
+    assert 'scorer_events_total{event="retry_rate_limit",agent="Agent"} 1' in lines
+    assert 'scorer_events_total{event="file_skipped"} 1' in lines
+    assert 'scorer_payload_size_sum{payload="prompt_chars"} 120' in lines
+    assert '# TYPE scorer_events_total counter' in lines
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_trace_records_each_event_and_a_summary(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    metrics = Metrics(path)
+    metrics.record_time('read_audio', 0.25, 'Agent', file='a.mp3')
+    metrics.increment('cache_miss', 'Agent', file='a.mp3')
+    metrics.close()
+
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['type'] for record in records] == ['timer', 'count', 'summary']
+    assert records[0]['file'] == 'a.mp3' and records[0]['seconds'] == 0.25
+    assert records[-1]['counters'] == {'cache_miss': 1}
+
+
+@pytest.mark.parametrize('trace', [None, True])
+def test_run_writes_a_trace_only_when_asked(write_config, tmp_path, trace):
+    write_config(RESULT_CACHE={'enabled': False}, PREFLIGHT={'enabled': False})
+    folder = tmp_path / 'recordings'
+    folder.mkdir()
+    for name in corpus_file_names(2):
+        (folder / name).write_bytes(synthetic_mp3(1.0))
+    options = {'analytic': True, 'holistic': False, 'off_topic': False, 'score_adjustment': True, 'combined': False}
+    runner = ScoringRunner(str(folder), options, trace=trace,
+                           backend_factory=lambda api_key, model_name: FakeBackend(
+                               latency={'distribution': 'constant', 'value': 0.0}, seed=0))
+    assert len(runner.run()) == 2
+
+    traces = [name for name in os.listdir(folder) if name.startswith(TRACE_FILE_PREFIX)]
+    assert len(traces) == (1 if trace else 0)
+    stages = runner.metrics.snapshot()['stages']
+    assert {'score_file', 'generate', 'read_audio', 'score_adjustment'} <= set(stages)
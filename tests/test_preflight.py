@@ -0,0 +1,78 @@
+import csv
+import numpy as np
+import pytest
+import soundfile as sf
+from benchmarks.synthetic_corpus import synthetic_mp3
+from pipeline.preflight import Preflight, check_recording
+
+TASKS = {'1': ['t1', 't2']}
+SAMPLE_RATE = 16000
+
+
+def write_tone(path, seconds=3.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    sf.write(str(path), 0.5 * np.sin(2 * np.pi * 220 * t), SAMPLE_RATE, format='WAV')
+
+
+def check(path, **overrides):
+    settings = {'min_duration': 2.0, 'silence_threshold_db': -50.0, 'decode_check': True, **overrides}
+    return check_recording(str(path), TASKS, **settings)
+
+
+def test_audible_recording_passes(tmp_path):
+    path = tmp_path / '231101001-1-t1.mp3'
+    write_tone(path)
+    assert check(path) is None
+
+
+@pytest.mark.parametrize('name, reason', [
+    ('recording.mp3', "File name does not match"),
+    ('231101001-9-t1.mp3', "No task definitions for session 9"),
+    ('231101001-1-t3.mp3', "No task definition for session 1, task t3"),
+])
+def test_names_without_a_task_are_skipped(tmp_path, name, reason):
+    path = tmp_path / name
+    write_tone(path)
+    assert check(path).startswith(reason)
+
+
+def test_unusable_audio_is_skipped(tmp_path):
+    empty = tmp_path / '231101001-1-t1.mp3'
+    empty.write_bytes(b'')
+    assert check(empty) == "File is empty"
+
+    short = tmp_path / '231101002-1-t1.mp3'
+    short.write_bytes(synthetic_mp3(1.0))
+    assert check(short).startswith("Too short")
+
+    silent = tmp_path / '231101003-1-t1.mp3'
+    silent.write_bytes(synthetic_mp3(3.0))
+    assert check(silent).startswith("Silent")
+    assert check(silent, decode_check=False) is None
+
+    garbage = tmp_path / '231101004-1-t1.mp3'
+    garbage.write_bytes(b'\x01' * 4096)
+    assert check(garbage).startswith("Unreadable audio")
+
+
+def test_run_keeps_order_and_writes_the_skip_report(tmp_path):
+    names = ['231101001-1-t1.mp3', '231101002-1-t2.mp3', '231101003-1-t1.mp3', '231101004-1-t2.mp3']
+    for index, name in enumerate(names):
+        if index == 2:
+            (tmp_path / name).write_bytes(synthetic_mp3(3.0))
+        else:
+            write_tone(tmp_path / name)
+
+    viable, skipped = Preflight(max_workers=2).run(str(tmp_path), names, TASKS)
+    assert viable == [names[0], names[1], names[3]]
+    assert list(skipped) == [names[2]]
+
+    with open(Preflight.save_skip_report(str(tmp_path), skipped), newline='', encoding='utf-8') as f:
+        assert list(csv.reader(f)) == [['File Name', 'Reason'], [names[2], skipped[names[2]]]]
+
+
+def test_disabled_in_config(write_config):
+    write_config(PREFLIGHT={'enabled': False})
+    assert Preflight.from_config() is None
+    write_config(PREFLIGHT={'min_duration': 5})
+    assert Preflight.from_config().min_duration == 5
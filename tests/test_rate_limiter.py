@@ -0,0 +1,50 @@
+import pytest
+from utils.rate_limiter import TokenBucket, estimate_request_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reservations_within_capacity_do_not_wait():
+    clock = FakeClock()
+    bucket = TokenBucket(10, 1.0, clock=clock)
+    assert [bucket.reserve(5), bucket.reserve(5)] == [0.0, 0.0]
+
+
+def test_deficit_is_waited_for_in_order():
+    clock = FakeClock()
+    bucket = TokenBucket(2, 0.5, clock=clock)
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    assert bucket.reserve(1) == pytest.approx(4.0)
+    clock.now += 4.0
+    assert bucket.reserve(1) == pytest.approx(2.0)
+
+
+def test_refill_stops_at_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(3, 1.0, clock=clock)
+    bucket.reserve(3)
+    clock.now += 1000.0
+    assert bucket.reserve(3) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_adjust_charges_and_refunds():
+    clock = FakeClock()
+    bucket = TokenBucket(100, 10.0, clock=clock)
+    bucket.reserve(50)
+    bucket.adjust(70)
+    assert bucket.tokens == pytest.approx(-20)
+    bucket.adjust(-500)
+    assert bucket.tokens == 100
+
+
+def test_estimate_request_tokens():
+    # One second of audio is 32 tokens, four characters are one token, plus the expected reply
+    assert estimate_request_tokens("x" * 400, 16000) == 32 + 100 + 200
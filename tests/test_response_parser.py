@@ -0,0 +1,123 @@
+import asyncio
+import json
+from agents.analytic_scoring_agent import AnalyticScoringAgent
+from agents.backends import BackendResponse, FakeBackend
+from benchmarks.synthetic_corpus import synthetic_mp3
+from utils.response_parser import (ANALYTIC_SCHEMA, COMBINED_SCHEMA, HOLISTIC_SCHEMA, OFF_TOPIC_SCHEMA,
+                                   ResponseParser)
+
+ANALYTIC_REPLY = {'grammar': 4, 'vocabulary': 3, 'content': 5, 'fluency': 4, 'pronunciation': 3, 'overall': 4}
+
+
+def test_valid_reply_has_no_problems():
+    assert ANALYTIC_SCHEMA.problems(dict(ANALYTIC_REPLY)) == []
+    assert HOLISTIC_SCHEMA.problems({'overall_score': 72.5}) == []
+
+
+def test_problems_name_every_bad_field():
+    reply = dict(ANALYTIC_REPLY, grammar=6, vocabulary="3", content=2.5, fluency=True)
+    del reply['overall']
+    assert ANALYTIC_SCHEMA.problems(reply) == [
+        "grammar must be at most 5 (got 6)",
+        'vocabulary must be an integer (got "3")',
+        "content must be an integer (got 2.5)",
+        "fluency must be an integer (got true)",
+        "overall is missing",
+    ]
+
+
+def test_problems_check_types_and_bounds():
+    assert HOLISTIC_SCHEMA.problems({'overall_score': -1}) == ["overall_score must be at least 0 (got -1)"]
+    assert OFF_TOPIC_SCHEMA.problems({'off_topic': 'no', 'confidence': 0.5, 'explanation': 3}) == [
+        'off_topic must be true or false (got "no")',
+        "explanation must be a string (got 3)",
+    ]
+    assert HOLISTIC_SCHEMA.problems(None) == ["the reply is not a JSON object"]
+
+
+def test_combined_schema_holds_every_field():
+    assert set(COMBINED_SCHEMA.fields) == (set(ANALYTIC_SCHEMA.fields) | set(HOLISTIC_SCHEMA.fields)
+                                           | set(OFF_TOPIC_SCHEMA.fields))
+
+
+def test_validate_reads_json_embedded_in_text():
+    reply = 'Here you go:\n```json\n{"overall_score": 80}\n```\nThanks {not json}'
+    assert ResponseParser.validate(reply, HOLISTIC_SCHEMA) == []
+    assert ResponseParser.parse_holistic_response(reply) == {'overall_score': 80}
+    assert ResponseParser.validate("no JSON here", HOLISTIC_SCHEMA) == ["the reply is not a JSON object"]
+
+
+def test_parse_rejects_reply_that_does_not_match_schema():
+    assert ResponseParser.parse_analytic_response('{"grammar": 4}') is None
+
+
+def test_only_format_problems_are_repairable():
+    assert ANALYTIC_SCHEMA.score_problems(None) == []
+    assert ANALYTIC_SCHEMA.score_problems(dict(ANALYTIC_REPLY, grammar="4", extra="ignored")) == []
+    reply = dict(ANALYTIC_REPLY, grammar=6, content=2.5)
+    del reply['overall']
+    assert ANALYTIC_SCHEMA.score_problems(reply) == [
+        "grammar must be at most 5 (got 6)",
+        "content must be an integer (got 2.5)",
+        "overall is missing",
+    ]
+
+
+def test_valid_values_leave_out_bad_fields():
+    reply = dict(ANALYTIC_REPLY, grammar="4")
+    assert ANALYTIC_SCHEMA.valid_values(reply) == {k: v for k, v in ANALYTIC_REPLY.items() if k != 'grammar'}
+    assert ANALYTIC_SCHEMA.valid_values(None) == {}
+
+
+class ScriptedBackend(FakeBackend):
+    """Gives the scripted replies in order: the first to the audio request, the rest to repair requests."""
+
+    def __init__(self, replies):
+        super().__init__(latency={'distribution': 'constant', 'value': 0.0})
+        self.replies = list(replies)
+
+    async def generate_content(self, prompt, audio_bytes, mime_type="audio/mp3", response_schema=None):
+        self.counts['requests'] += 1
+        return BackendResponse(text=self.replies.pop(0))
+
+    async def generate_text(self, prompt, response_schema=None):
+        self.counts['text_requests'] += 1
+        return BackendResponse(text=self.replies.pop(0))
+
+
+def score(tmp_path, replies, max_repairs=2):
+    recording = tmp_path / '231101001-1-t1.mp3'
+    recording.write_bytes(synthetic_mp3(0.5))
+    backend = ScriptedBackend(replies)
+    agent = AnalyticScoringAgent(api_key='key', backend=backend)
+    agent.max_repairs = max_repairs
+    try:
+        return asyncio.run(agent.score_performance(str(recording))), backend
+    except ValueError as e:
+        return e, backend
+
+
+def test_malformed_reply_is_repaired(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False})
+    quoted = json.dumps(dict(ANALYTIC_REPLY, grammar="4"))
+    result, backend = score(tmp_path, [quoted, json.dumps(ANALYTIC_REPLY)])
+    assert result.grammar == 4
+    assert backend.counts['text_requests'] == 1
+
+
+def test_missing_or_out_of_range_score_fails_without_repair(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False})
+    result, backend = score(tmp_path, [json.dumps(dict(ANALYTIC_REPLY, grammar=6))])
+    assert isinstance(result, ValueError) and "grammar must be at most 5" in str(result)
+    missing = {k: v for k, v in ANALYTIC_REPLY.items() if k != 'fluency'}
+    result, backend = score(tmp_path, [json.dumps(missing)])
+    assert isinstance(result, ValueError) and "fluency is missing" in str(result)
+    assert backend.counts['text_requests'] == 0
+
+
+def test_repair_that_changes_a_valid_score_fails(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False})
+    quoted = json.dumps(dict(ANALYTIC_REPLY, grammar="4"))
+    result, backend = score(tmp_path, [quoted, json.dumps(dict(ANALYTIC_REPLY, content=1)), "unused"])
+    assert isinstance(result, ValueError) and "the repair changed content (was 5)" in str(result)
+    assert backend.counts['text_requests'] == 1
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from agents.analytic_scoring_agent import AnalyticScoringAgent
+from agents.backends import FakeBackend
+from benchmarks.synthetic_corpus import synthetic_mp3
+from utils.result_cache import ResultCache
+
+
+def test_key_depends_on_every_input():
+    key = ResultCache.make_key(b"audio", "prompt", "model", "Agent")
+    assert key == ResultCache.make_key(b"audio", "prompt", "model", "Agent")
+    assert key != ResultCache.make_key(b"audio2", "prompt", "model", "Agent")
+    assert key != ResultCache.make_key(b"audio", "prompt 2", "model", "Agent")
+    assert key != ResultCache.make_key(b"audio", "prompt", "model 2", "Agent")
+    assert key != ResultCache.make_key(b"audio", "prompt", "model", "Other")
+    # Parts are length-prefixed, so moving bytes between them changes the key
+    assert ResultCache.make_key(b"ab", "c", "m", "A") != ResultCache.make_key(b"a", "bc", "m", "A")
+
+
+def test_results_persist_across_connections(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ResultCache(path)
+    cache.put('key', 'Agent', {'grammar': 4})
+    cache.close()
+
+    reopened = ResultCache(path)
+    assert reopened.get('key') == {'grammar': 4}
+    assert reopened.get('other') is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+    reopened.close()
+
+
+def test_eviction_by_count_keeps_the_recently_used(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), max_entries=2, max_age_days=None)
+    clock = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: clock[0])
+    for key in ('a', 'b', 'c'):
+        clock[0] += 1
+        cache.put(key, 'Agent', {'key': key})
+    clock[0] += 1
+    cache.get('a')
+    assert cache.evict() == 1
+    assert cache.get('a') is not None and cache.get('b') is None and cache.get('c') is not None
+    cache.close()
+
+
+def test_eviction_by_age_and_invalidation(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), max_entries=None, max_age_days=1)
+    monkeypatch.setattr(time, 'time', lambda: 0.0)
+    cache.put('old', 'Agent', {})
+    monkeypatch.setattr(time, 'time', lambda: 2 * 86400.0)
+    cache.put('new', 'Agent', {})
+    cache.put('other', 'Other', {})
+    assert cache.evict() == 1
+    assert cache.invalidate('Agent') == 1
+    assert cache.get('other') == {}
+    cache.close()
+
+
+class CachingFakeBackend(FakeBackend):
+    CACHE_RESULTS = True
+
+
+def test_agent_reuses_a_cached_result(write_config, tmp_path):
+    recording = tmp_path / '231101001-1-t1.mp3'
+    recording.write_bytes(synthetic_mp3(1.0))
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    backend = CachingFakeBackend(latency={'distribution': 'constant', 'value': 0.0}, seed=0)
+    agent = AnalyticScoringAgent(api_key='key', backend=backend, result_cache=cache)
+
+    first = asyncio.run(agent.score_performance(str(recording)))
+    second = asyncio.run(agent.score_performance(str(recording)))
+
+    assert first == second
+    assert backend.counts['requests'] == 1
+    assert cache.hits == 1
+    cache.close()
@@ -0,0 +1,94 @@
+import asyncio
+from datetime import timedelta
+import pytest
+from agents.backends import BackendError
+from utils import retry_policy
+from utils.retry_policy import ErrorKind, RetryPolicy, classify_error, server_retry_delay
+
+
+class RetryInfo:
+    def __init__(self, retry_delay):
+        self.retry_delay = retry_delay
+
+
+class ServiceError(Exception):
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
+
+
+@pytest.mark.parametrize('error, kind', [
+    (BackendError(429, "Resource has been exhausted"), ErrorKind.RATE_LIMIT),
+    (BackendError(503, "Simulated server error"), ErrorKind.TRANSIENT),
+    (BackendError(504, "Deadline exceeded"), ErrorKind.DEADLINE),
+    (BackendError(400, "Invalid argument"), ErrorKind.PERMANENT),
+    (asyncio.TimeoutError(), ErrorKind.DEADLINE),
+    (ConnectionResetError(), ErrorKind.TRANSIENT),
+    (Exception("Quota exceeded for this project"), ErrorKind.RATE_LIMIT),
+    (Exception("The request timed out"), ErrorKind.DEADLINE),
+    (Exception("502 Bad Gateway"), ErrorKind.TRANSIENT),
+    (Exception("API key not valid"), ErrorKind.PERMANENT),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_server_retry_delay_sources():
+    assert server_retry_delay(ServiceError("429", [RetryInfo(timedelta(seconds=12))])) == 12
+    assert server_retry_delay(BackendError(429, "Slow down", retry_after=7)) == 7
+    assert server_retry_delay(Exception("429 Please retry in 3.5s.")) == 3.5
+    assert server_retry_delay(Exception("retry_delay { seconds: 40 }")) == 40
+    assert server_retry_delay(Exception("503 Unavailable")) is None
+
+
+def run_policy(policy, errors, monkeypatch):
+    """Run the policy over an attempt raising each error in turn, without really sleeping."""
+    slept = []
+
+    async def sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(retry_policy.asyncio, 'sleep', sleep)
+    errors = iter(errors)
+
+    async def attempt():
+        error = next(errors, None)
+        if error is not None:
+            raise error
+        return "ok"
+
+    return asyncio.run(policy.run(attempt)), slept
+
+
+def test_server_delay_takes_precedence_over_backoff(monkeypatch):
+    policy = RetryPolicy(base_delay=1.0, rate_limit_base_delay=2.0)
+    result, slept = run_policy(policy, [BackendError(429, "Slow down", retry_after=30)], monkeypatch)
+    assert result == "ok"
+    assert len(slept) == 1 and 30 <= slept[0] <= 32
+
+
+def test_backoff_stays_within_bounds(monkeypatch):
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0, max_total_delay=100.0)
+    result, slept = run_policy(policy, [BackendError(503, "Unavailable")] * 4, monkeypatch)
+    assert result == "ok"
+    assert len(slept) == 4
+    assert all(1.0 <= delay <= 4.0 for delay in slept)
+
+
+def test_total_time_budget_stops_retrying(monkeypatch):
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_total_delay=25.0)
+    errors = [BackendError(503, "Unavailable", retry_after=10)] * 10
+    with pytest.raises(ValueError, match="time budget"):
+        run_policy(policy, errors, monkeypatch)
+
+
+def test_permanent_error_is_not_retried(monkeypatch):
+    policy = RetryPolicy()
+    with pytest.raises(ValueError, match="Error generating content"):
+        run_policy(policy, [BackendError(400, "Invalid argument")], monkeypatch)
+
+
+def test_attempts_run_out(monkeypatch):
+    policy = RetryPolicy(max_attempts=2, max_total_delay=1000.0)
+    with pytest.raises(ValueError, match=r"Max retries \(2\)"):
+        run_policy(policy, [BackendError(500, "Internal error")] * 2, monkeypatch)
@@ -0,0 +1,59 @@
+import json
+import os
+import pytest
+from utils.run_journal import JOURNAL_FILE, RunJournal
+
+OPTIONS = {'analytic': True, 'holistic': True, 'off_topic': False, 'combined': False}
+
+
+def test_resume_round_trip(tmp_path):
+    journal = RunJournal(str(tmp_path), OPTIONS)
+    journal.record('a.mp3', 'analytic', {'grammar': 4})
+    journal.record_failure('a.mp3', 'holistic', "503 Unavailable")
+    journal.record_failure('b.mp3', 'analytic', "ValueError")
+    journal.close()
+
+    resumed = RunJournal(str(tmp_path), OPTIONS, resume=True)
+    assert resumed.attempted_files() == {'a.mp3', 'b.mp3'}
+    assert resumed.completed_result('a.mp3', 'analytic') == {'grammar': 4}
+    assert resumed.completed_result('a.mp3', 'holistic') is None
+    assert resumed.failed == {'a.mp3': {'holistic': "503 Unavailable"}, 'b.mp3': {'analytic': "ValueError"}}
+
+    resumed.record('a.mp3', 'holistic', {'overall_score': 70})
+    resumed.close()
+    completed, failed = RunJournal.load(os.path.join(str(tmp_path), JOURNAL_FILE))
+    assert completed['a.mp3'] == {'analytic': {'grammar': 4}, 'holistic': {'overall_score': 70}}
+    assert failed == {'b.mp3': {'analytic': "ValueError"}}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = RunJournal(str(tmp_path), OPTIONS)
+    journal.record('a.mp3', 'analytic', {'grammar': 4})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "result", "file": "b.mp3", "ag')
+
+    resumed = RunJournal(str(tmp_path), OPTIONS, resume=True)
+    resumed.close()
+    assert resumed.attempted_files() == {'a.mp3'}
+
+
+def test_resume_refuses_other_options(tmp_path):
+    RunJournal(str(tmp_path), OPTIONS).close()
+    with pytest.raises(ValueError, match="different scoring options"):
+        RunJournal(str(tmp_path), dict(OPTIONS, off_topic=True), resume=True)
+
+
+def test_new_run_keeps_the_previous_journal(tmp_path):
+    journal = RunJournal(str(tmp_path), OPTIONS)
+    journal.record('a.mp3', 'analytic', {'grammar': 4})
+    journal.close()
+
+    fresh = RunJournal(str(tmp_path), OPTIONS)
+    fresh.close()
+    assert fresh.rotated_path and os.path.exists(fresh.rotated_path)
+    assert fresh.attempted_files() == set()
+    with open(fresh.path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['type'] for record in records] == ['run']
+    assert RunJournal.load(fresh.rotated_path)[0] == {'a.mp3': {'analytic': {'grammar': 4}}}
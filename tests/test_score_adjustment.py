@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from agents.score_adjustment_agent import ConversionTable, ScoreAdjustmentAgent, ScoreColumns
+
+
+def columns(file_names, raw_scores):
+    """Columns whose rows sum to the given raw scores (all in the overall domain)."""
+    result = ScoreColumns(file_names)
+    result.scores[:] = 0.0
+    result.scores[:, -1] = raw_scores
+    return result
+
+
+def test_convert_at_cutoffs():
+    table = ConversionTable([10, 20, 30], [1, 2, 3, 4])
+    raw = np.array([9.99, 10, 19.99, 20, 30, 45, np.nan])
+    np.testing.assert_array_equal(table.convert(raw), [1, 2, 2, 3, 4, 4, np.nan])
+
+
+def test_conversion_table_rejects_bad_cutoffs():
+    with pytest.raises(ValueError):
+        ConversionTable([10, 20], [1, 2])
+    with pytest.raises(ValueError):
+        ConversionTable([10, 10], [1, 2, 3])
+
+
+def test_zscore_moves_zero_variance_group_to_target_mean():
+    agent = ScoreAdjustmentAgent(normalization='zscore', target_mean=50, target_sd=10)
+    names = ['231101001-1-t1.mp3', '231101002-1-t1.mp3', '231101003-2-t1.mp3', '231101004-2-t1.mp3']
+    adjusted = agent.adjust_columns(columns(names, [12, 12, 10, 20]))
+    np.testing.assert_allclose(adjusted, [50, 50, 40, 60])
+
+
+def test_zscore_keeps_missing_scores_missing():
+    agent = ScoreAdjustmentAgent(normalization='zscore', target_mean=50, target_sd=10)
+    names = ['231101001-1-t1.mp3', '231101002-1-t1.mp3', '231101003-1-t1.mp3']
+    adjusted = agent.adjust_columns(columns(names, [10, np.nan, 20]))
+    np.testing.assert_allclose(adjusted, [40, np.nan, 60])
+
+
+def test_equipercentile_gives_ties_equal_scores():
+    agent = ScoreAdjustmentAgent(normalization='equipercentile')
+    names = ['231101001-1-t1.mp3', '231101002-1-t1.mp3', '231101003-1-t1.mp3',
+             '231101004-2-t1.mp3', '231101005-2-t1.mp3', '231101006-2-t1.mp3']
+    adjusted = agent.adjust_columns(columns(names, [5, 5, 9, 20, 22, 24]))
+    assert adjusted[0] == adjusted[1]
+    assert adjusted[1] < adjusted[2]
+    assert adjusted[3] < adjusted[4] < adjusted[5]
+
+
+def test_session_conversion_tables_with_default():
+    tables = {'1': ConversionTable([10], [0, 1]), 'default': ConversionTable([10], [5, 6])}
+    agent = ScoreAdjustmentAgent(conversion_tables=tables)
+    names = ['231101001-1-t1.mp3', '231101002-1-t2.mp3', '231101003-2-t1.mp3']
+    np.testing.assert_array_equal(agent.adjust_columns(columns(names, [9, 10, 10])), [0, 1, 6])
+
+
+def test_set_fills_a_row_and_its_groups():
+    names = ['231101001-1-t1.mp3', '231101002-2-t1.mp3']
+    result = ScoreColumns(names)
+
+    class Scores:
+        grammar = vocabulary = content = fluency = pronunciation = overall = 2
+
+    result.set(names[1], Scores())
+    assert np.isnan(result.scores[0]).all()
+    np.testing.assert_array_equal(result.scores[1], [2] * 6)
+    sessions, session_ids = result.groups('session')
+    assert sessions[1] == session_ids['2']
+    assert sessions[0] == session_ids['1']
@@ -0,0 +1,120 @@
+import json
+import os
+import pytest
+from agents.backends import FakeBackend
+from benchmarks.synthetic_corpus import corpus_file_names, synthetic_mp3
+from pipeline.scoring_runner import STATUS_FAILED, STATUS_OK, ScoringRunner
+from utils.config_manager import CONFIG_PATH_ENV
+from utils.run_journal import RunJournal
+
+API_KEYS = {
+    'ANALYTIC_SCORING_API_KEY': 'analytic-key',
+    'HOLISTIC_SCORING_API_KEY': 'holistic-key',
+    'OFF_TOPIC_DETECTION_API_KEY': 'off-topic-key',
+}
+OPTIONS = {'analytic': True, 'holistic': True, 'off_topic': True, 'score_adjustment': True,
+           'combined': False, 'resume': False}
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    """A folder of silent recordings and a config that scores them without retries or caching."""
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({
+        **API_KEYS,
+        'RESULT_CACHE': {'enabled': False},
+        'PREFLIGHT': {'enabled': False},
+        'RETRY_POLICY': {'max_attempts': 1},
+        'STRUCTURED_OUTPUT': {'enabled': True, 'max_repairs': 0},
+        'METRICS': {'trace': False},
+    }), encoding='utf-8')
+    monkeypatch.setenv(CONFIG_PATH_ENV, str(config_path))
+    recordings = tmp_path / 'recordings'
+    recordings.mkdir()
+    for name in corpus_file_names(4):
+        (recordings / name).write_bytes(synthetic_mp3(1.0))
+    return str(recordings)
+
+
+def backend_factory(failing_key):
+    def create(api_key, model_name):
+        return FakeBackend(latency={'distribution': 'constant', 'value': 0.0},
+                           error_rate=1.0 if api_key == failing_key else 0.0, seed=0)
+    return create
+
+
+def test_failed_agent_keeps_the_other_results(folder):
+    runner = ScoringRunner(folder, dict(OPTIONS), backend_factory=backend_factory('holistic-key'))
+    performances = runner.run()
+
+    assert len(performances) == 4
+    assert runner.failed_files == []
+    assert sorted(runner.partial_files) == sorted(p.file_name for p in performances)
+    for performance in performances:
+        assert performance.holistic_score is None
+        assert performance.analytic_scores is not None
+        assert performance.off_topic_analysis is not None
+        scores = performance.analytic_scores
+        assert performance.adjusted_score == (scores.grammar + scores.vocabulary + scores.content
+                                              + scores.fluency + scores.pronunciation + scores.overall)
+        assert runner.agent_status[performance.file_name] == {
+            'analytic': STATUS_OK, 'holistic': STATUS_FAILED, 'off_topic': STATUS_OK}
+
+    completed, failed = RunJournal.load(os.path.join(folder, 'scoring_journal.jsonl'))
+    assert all(set(errors) == {'holistic'} for errors in failed.values())
+    assert all(set(results) == {'analytic', 'off_topic'} for results in completed.values())
+
+
+def test_rerun_failed_only_retries_the_failed_agent(folder):
+    ScoringRunner(folder, dict(OPTIONS), backend_factory=backend_factory('holistic-key')).run()
+    backends = []
+
+    def create(api_key, model_name):
+        backends.append(FakeBackend(latency={'distribution': 'constant', 'value': 0.0}, seed=0))
+        return backends[-1]
+
+    runner = ScoringRunner(folder, dict(OPTIONS, rerun_failed=True), backend_factory=create)
+    performances = runner.run()
+
+    assert len(performances) == 4 and runner.partial_files == []
+    assert all(p.holistic_score is not None for p in performances)
+    assert sum(backend.counts['requests'] for backend in backends) == 4
+
+
+def test_file_fails_when_every_agent_fails(folder):
+    runner = ScoringRunner(folder, dict(OPTIONS, holistic=False, off_topic=False),
+                           backend_factory=backend_factory('analytic-key'))
+    assert runner.run() == []
+    assert len(runner.failed_files) == 4
+
+
+def read_journal(folder):
+    with open(os.path.join(folder, 'scoring_journal.jsonl'), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_failed_start_keeps_the_journal_to_resume(folder, monkeypatch):
+    ScoringRunner(folder, dict(OPTIONS), backend_factory=backend_factory('holistic-key')).run()
+    journal = read_journal(folder)
+
+    def broken_backend(api_key, model_name):
+        raise ValueError("Missing API key(s) in configuration")
+
+    with pytest.raises(ValueError):
+        ScoringRunner(folder, dict(OPTIONS), backend_factory=broken_backend).run()
+
+    # Every recording is rejected by the pre-flight checks
+    monkeypatch.setattr(ScoringRunner, '_run_preflight', lambda self, audio_files: [])
+    runner = ScoringRunner(folder, dict(OPTIONS), backend_factory=backend_factory(None))
+    assert runner.run() == []
+    assert runner.errors == ["No recordings passed the pre-flight checks."]
+
+    assert read_journal(folder) == journal
+    assert not [name for name in os.listdir(folder) if name.startswith('scoring_journal_')]
+
+
+def test_resume_refuses_other_options_before_scoring(folder):
+    ScoringRunner(folder, dict(OPTIONS), backend_factory=backend_factory('holistic-key')).run()
+    with pytest.raises(ValueError, match="different scoring options"):
+        ScoringRunner(folder, dict(OPTIONS, off_topic=False, rerun_failed=True),
+                      backend_factory=backend_factory(None)).run()
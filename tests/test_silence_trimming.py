@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from agents.backends import FakeBackend
+from models.score_models import SpeakingPerformance
+from pipeline.scoring_runner import ScoringRunner
+from utils.excel_utils import TRIM_COLUMNS, build_score_rows
+from utils.file_utils import detect_speech_bounds, trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def speech_between(silence_before: float, speech: float, silence_after: float) -> np.ndarray:
+    """A 220 Hz tone standing in for speech, with faint noise around it."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(speech * SAMPLE_RATE)) / SAMPLE_RATE
+    return np.concatenate([
+        rng.normal(0, 1e-4, int(silence_before * SAMPLE_RATE)),
+        0.5 * np.sin(2 * np.pi * 220 * t),
+        rng.normal(0, 1e-4, int(silence_after * SAMPLE_RATE)),
+    ]).astype(np.float32)
+
+
+def test_bounds_keep_the_speech_and_the_padding():
+    audio = speech_between(2.0, 1.0, 3.0)
+    start, end = detect_speech_bounds(audio, SAMPLE_RATE, frame_ms=30.0, padding_ms=300.0)
+    assert start / SAMPLE_RATE == pytest.approx(1.7, abs=0.04)
+    assert end / SAMPLE_RATE == pytest.approx(3.3, abs=0.04)
+
+
+def test_silence_only_and_empty_signals_are_kept_whole():
+    silent = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    assert detect_speech_bounds(silent, SAMPLE_RATE) == (0, SAMPLE_RATE)
+    assert detect_speech_bounds(np.zeros(10, dtype=np.float32), SAMPLE_RATE) == (0, 10)
+
+
+def test_floor_ignores_a_quiet_recording():
+    quiet = speech_between(1.0, 1.0, 1.0) * 1e-3
+    assert detect_speech_bounds(quiet, SAMPLE_RATE, floor_db=-60.0) == (0, len(quiet))
+
+
+def test_trim_silence_reports_the_seconds_removed(tmp_path):
+    path = str(tmp_path / 'speech.wav')
+    sf.write(path, speech_between(2.0, 1.0, 3.0), SAMPLE_RATE)
+    audio, sample_rate, trimmed_start, trimmed_end = trim_silence(path, padding_ms=0.0)
+    assert sample_rate == SAMPLE_RATE
+    assert trimmed_start == pytest.approx(2.0, abs=0.04)
+    assert trimmed_end == pytest.approx(3.0, abs=0.04)
+    assert len(audio) / sample_rate == pytest.approx(1.0, abs=0.08)
+
+
+def test_report_rows_get_trim_columns_only_when_trimming():
+    performances = [SpeakingPerformance(file_name='231101001-1-t1.mp3'),
+                    SpeakingPerformance(file_name='231101002-1-t1.mp3')]
+    assert TRIM_COLUMNS[0] not in build_score_rows(performances)[0]
+    rows = build_score_rows(performances, trimmed={'231101001-1-t1.mp3': (1.5, 0.25)})
+    assert [(row[TRIM_COLUMNS[0]], row[TRIM_COLUMNS[1]]) for row in rows] == [(1.5, 0.25), (None, None)]
+
+
+def test_run_reports_the_trim_per_file(write_config, tmp_path):
+    write_config(RESULT_CACHE={'enabled': False}, PREFLIGHT={'enabled': False},
+                 AUDIO_PREPROCESSING={'enabled': True, 'codec': 'flac', 'cache_dir': str(tmp_path / 'cache'),
+                                      'trim_silence': {'enabled': True, 'padding_ms': 0.0}})
+    folder = tmp_path / 'recordings'
+    folder.mkdir()
+    sf.write(str(folder / '231101001-1-t1.mp3'), speech_between(2.0, 1.0, 3.0), SAMPLE_RATE, format='WAV')
+    options = {'analytic': True, 'holistic': False, 'off_topic': False, 'score_adjustment': False,
+               'combined': False}
+    runner = ScoringRunner(str(folder), options,
+                           backend_factory=lambda api_key, model_name: FakeBackend(
+                               latency={'distribution': 'constant', 'value': 0.0}, seed=0))
+    assert len(runner.run()) == 1
+    trimmed_start, trimmed_end = runner.trimmed_silence['231101001-1-t1.mp3']
+    assert trimmed_start == pytest.approx(2.0, abs=0.04)
+    assert trimmed_end == pytest.approx(3.0, abs=0.04)
@@ -0,0 +1,46 @@
+import asyncio
+from utils import task_pool
+from utils.task_pool import run_bounded
+
+
+def test_run_bounded_limits_concurrency_and_keeps_order():
+    in_flight = peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item == 3:
+            raise ValueError("bad item")
+        return item * 2
+
+    done = []
+    results = asyncio.run(run_bounded(list(range(10)), worker, 3,
+                                      on_done=lambda completed, index, item, result: done.append(index)))
+    assert peak == 3
+    assert results[:3] == [0, 2, 4]
+    assert isinstance(results[3], ValueError)
+    assert results[4:] == [8, 10, 12, 14, 16, 18]
+    assert sorted(done) == list(range(10))
+
+
+def test_run_bounded_cancellation_stops_new_and_running_items(monkeypatch):
+    monkeypatch.setattr(task_pool, 'CANCEL_POLL_INTERVAL', 0.01)
+    started = []
+    cancelled = False
+
+    async def worker(item):
+        started.append(item)
+        await asyncio.sleep(0.01 if item == 0 else 10)
+        return item
+
+    def on_done(completed, index, item, result):
+        nonlocal cancelled
+        cancelled = True
+
+    results = asyncio.run(asyncio.wait_for(run_bounded(list(range(20)), worker, 2, on_done=on_done,
+                                                       is_cancelled=lambda: cancelled), timeout=5))
+    assert started == [0, 1]
+    assert results == [0] + [None] * 19
@@ -0,0 +1,51 @@
+import json
+from task_definitions import TASK_DEFINITIONS
+from utils.task_registry import TaskRegistry, normalize_task_definitions, parse_task_key
+
+
+def test_file_names_give_session_and_task():
+    assert parse_task_key('231101013-6-t1.mp3') == ('6', 't1')
+    assert parse_task_key('/data/231101013-12-t3.mp3') == ('12', 't3')
+    assert parse_task_key('231101013-6-t1.wav') is None
+    assert parse_task_key('notes.mp3') is None
+
+
+def test_config_definitions_replace_built_in_ones_per_task(write_config):
+    write_config(TASK_DEFINITIONS={'1': {'t1': "Configured task"}, '99': {'t1': "New session"}})
+    registry = TaskRegistry()
+
+    assert registry.get('1', 't1') == "Configured task"
+    assert registry.get('1', 't2') == TASK_DEFINITIONS['1']['t2']
+    assert registry.get('99', 't1') == "New session"
+    assert ('99', 't2') not in registry
+
+
+def test_legacy_string_sessions_are_decoded():
+    legacy = {'7': json.dumps({'t1': "Line one\\nLine two"}) + ','}
+    assert normalize_task_definitions(legacy) == {'7': {'t1': "Line one\nLine two"}}
+
+
+def test_definitions_are_reloaded_when_the_config_changes(write_config):
+    write_config(TASK_DEFINITIONS={'99': {'t1': "First"}})
+    registry = TaskRegistry()
+    assert registry.get('99', 't1') == "First"
+    generation = registry.generation
+
+    registry.get('99', 't1')
+    assert registry.generation == generation
+
+    write_config(TASK_DEFINITIONS={'99': {'t1': "Second version"}})
+    assert registry.get('99', 't1') == "Second version"
+    assert registry.generation == generation + 1
+
+
+def test_files_are_matched_to_defined_tasks(write_config):
+    write_config(TASK_DEFINITIONS={'99': {'t1': "Only task"}})
+    registry = TaskRegistry()
+    files = ['231101001-99-t1.mp3', '231101002-99-t2.mp3', '231101003-98-t1.mp3', 'notes.mp3']
+
+    assert registry.tasks_for(files) == {('99', 't1')}
+    problems = registry.validate(files)
+    assert set(problems) == set(files[1:])
+    assert 'task t2' in problems['231101002-99-t2.mp3']
+    assert 'session 98' in problems['231101003-98-t1.mp3']
@@ -1,15 +1,9 @@
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
-import os
-from typing import List
-import asyncio
-from agents.analytic_scoring_agent import AnalyticScoringAgent
-from agents.holistic_scoring_agent import HolisticScoringAgent
-from agents.off_topic_detection_agent import OffTopicDetectionAgent
-from agents.score_adjustment_agent import ScoreAdjustmentAgent
-from models.score_models import SpeakingPerformance
-from utils.excel_utils import save_scores_to_excel
+from typing import TYPE_CHECKING, List
 from utils.config_manager import ConfigManager
-from datetime import datetime
+
+if TYPE_CHECKING:
+    from models.score_models import SpeakingPerformance
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
@@ -24,138 +18,39 @@ class ScoringWorker(QThread):
     finished = pyqtSignal(list)
     error = pyqtSignal(tuple)  
     
-    def __init__(self, folder_path: str, scoring_options: dict):
+    def __init__(self, folder_path: str, scoring_options: dict, max_concurrent_files: int = None):
         super().__init__()
+        # The scoring pipeline (agents, Google client, librosa) is loaded when
+        # scoring starts, so the window opens without it.
+        from pipeline.scoring_runner import ScoringRunner
         self.folder_path = folder_path
         self.scoring_options = scoring_options
-        self._is_cancelled = False
-        self.errors = [] 
-        
-    def save_error_log(self):
-        """Save errors to a log file in the selected folder."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"error_log_{timestamp}.txt"
-        log_path = os.path.join(self.folder_path, log_filename)
-        
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write(f"Error Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 50 + "\n\n")
-            for error in self.errors:
-                f.write(f"• {error}\n")
-        
-        return log_path
-        
-    def add_error(self, message):
-        """Add error message to the list and emit progress update."""
-        self.errors.append(message)
-        self.progress.emit(0, "Error occurred")
+        self.runner = ScoringRunner(folder_path, scoring_options, max_concurrent_files,
+                                    on_progress=self.progress.emit)
+        self.errors = self.runner.errors
+        self.failed_files = self.runner.failed_files
         
     def cancel(self):
-        self._is_cancelled = True
+        self.runner.cancel()
         
     def run(self):
         try:
-            audio_files = [f for f in os.listdir(self.folder_path) if f.endswith('.mp3')]
-            if not audio_files:
-                self.add_error("No MP3 files found in the selected folder.")
-                self.error.emit((len(self.errors), self.save_error_log()))
-                return
-                
-            performances = []
-            failed_files = []
-            total_files = len(audio_files)
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                for i, audio_file in enumerate(audio_files):
-                    if self._is_cancelled:
-                        self.add_error("Scoring process cancelled by user.")
-                        break
-                        
-                    try:
-                        file_path = os.path.join(self.folder_path, audio_file)
-                        performance = SpeakingPerformance(
-                            file_name=audio_file,
-                            analytic_scores=None,
-                            holistic_score=None,
-                            off_topic_analysis=None,
-                            adjusted_score=None
-                        )
-                        
-                        scoring_failed = False
-                        
-                        if self.scoring_options['analytic']:
-                            try:
-                                agent = AnalyticScoringAgent()
-                                performance.analytic_scores = loop.run_until_complete(
-                                    agent.score_performance(file_path)
-                                )
-                            except Exception as e:
-                                self.add_error(f"Analytic scoring failed for {audio_file}: {str(e)}")
-                                scoring_failed = True
-                        
-                        if self.scoring_options['holistic']:
-                            try:
-                                agent = HolisticScoringAgent()
-                                performance.holistic_score = loop.run_until_complete(
-                                    agent.score_performance(file_path)
-                                )
-                            except Exception as e:
-                                self.add_error(f"Holistic scoring failed for {audio_file}: {str(e)}")
-                                scoring_failed = True
-                        
-                        if self.scoring_options['off_topic']:
-                            try:
-                                agent = OffTopicDetectionAgent()
-                                performance.off_topic_analysis = loop.run_until_complete(
-                                    agent.analyze_topic_relevance(file_path)
-                                )
-                            except Exception as e:
-                                self.add_error(f"Off-topic detection failed for {audio_file}: {str(e)}")
-                                scoring_failed = True
-                        
-                        if scoring_failed:
-                            failed_files.append(audio_file)
-                        else:
-                            performances.append(performance)
-                        
-                        progress = int((i + 1) / total_files * 100)
-                        self.progress.emit(progress, f"Processing: {audio_file}")
-                        
-                    except Exception as e:
-                        self.add_error(f"Error processing {audio_file}: {str(e)}")
-                        failed_files.append(audio_file)
-                        continue
-                
-                if not self._is_cancelled and self.scoring_options['score_adjustment'] and performances:
-                    try:
-                        self.progress.emit(100, "Adjusting scores...")
-                        agent = ScoreAdjustmentAgent()
-                        performances = agent.adjust_scores(performances)
-                    except Exception as e:
-                        self.add_error(f"Score adjustment failed: {str(e)}")
-                
-            finally:
-                loop.close()
+            performances = self.runner.run()
             
             if self.errors:
-                log_path = self.save_error_log()
+                log_path = self.runner.save_error_log()
                 self.error.emit((len(self.errors), log_path))
             
             if performances:
                 self.finished.emit(performances)
             elif not self.errors: 
-                self.add_error("No performances were successfully processed.")
-                log_path = self.save_error_log()
+                self.runner.add_error("No performances were successfully processed.")
+                log_path = self.runner.save_error_log()
                 self.error.emit((len(self.errors), log_path))
             
         except Exception as e:
-            self.add_error(f"Critical error occurred: {str(e)}")
-            self.error.emit((len(self.errors), self.save_error_log()))
-            if 'loop' in locals() and loop is not None:
-                loop.close()
+            self.runner.add_error(f"Critical error occurred: {str(e)}")
+            self.error.emit((len(self.errors), self.runner.save_error_log()))
 
 
 
@@ -329,11 +224,17 @@ class MainWindow(QMainWindow):
         self.holistic_checkbox = QCheckBox("Holistic Scoring")
         self.off_topic_checkbox = QCheckBox("Off-topic Detection")
         self.score_adjustment_checkbox = QCheckBox("Score Adjustment")
+        self.combined_checkbox = QCheckBox("Combined Request (one request per file)")
+        self.resume_checkbox = QCheckBox("Resume Previous Run")
+        self.rerun_failed_checkbox = QCheckBox("Rerun Failures Only")
         
         checkbox_grid.addWidget(self.analytic_checkbox, 0, 0)
         checkbox_grid.addWidget(self.holistic_checkbox, 0, 1)
         checkbox_grid.addWidget(self.off_topic_checkbox, 1, 0)
         checkbox_grid.addWidget(self.score_adjustment_checkbox, 1, 1)
+        checkbox_grid.addWidget(self.combined_checkbox, 2, 0)
+        checkbox_grid.addWidget(self.resume_checkbox, 2, 1)
+        checkbox_grid.addWidget(self.rerun_failed_checkbox, 3, 1)
         
         options_layout.addLayout(checkbox_grid)
         main_layout.addWidget(options_group)
@@ -476,10 +377,14 @@ class MainWindow(QMainWindow):
             'analytic': self.analytic_checkbox.isChecked(),
             'holistic': self.holistic_checkbox.isChecked(),
             'off_topic': self.off_topic_checkbox.isChecked(),
-            'score_adjustment': self.score_adjustment_checkbox.isChecked()
+            'score_adjustment': self.score_adjustment_checkbox.isChecked(),
+            'combined': self.combined_checkbox.isChecked(),
+            'resume': self.resume_checkbox.isChecked(),
+            'rerun_failed': self.rerun_failed_checkbox.isChecked()
         }
         
-        if not any(scoring_options.values()):
+        if not any(value for option, value in scoring_options.items()
+                   if option not in ('combined', 'resume', 'rerun_failed')):
             QMessageBox.warning(self, "Error", "Please select at least one scoring option.")
             return
         
@@ -506,6 +411,9 @@ class MainWindow(QMainWindow):
         self.holistic_checkbox.setEnabled(False)
         self.off_topic_checkbox.setEnabled(False)
         self.score_adjustment_checkbox.setEnabled(False)
+        self.combined_checkbox.setEnabled(False)
+        self.resume_checkbox.setEnabled(False)
+        self.rerun_failed_checkbox.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.progress_label.setText("Starting...")
@@ -521,6 +429,9 @@ class MainWindow(QMainWindow):
         self.holistic_checkbox.setEnabled(True)
         self.off_topic_checkbox.setEnabled(True)
         self.score_adjustment_checkbox.setEnabled(True)
+        self.combined_checkbox.setEnabled(True)
+        self.resume_checkbox.setEnabled(True)
+        self.rerun_failed_checkbox.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.progress_label.setText("Ready")
         self.status_light.setStyleSheet("color: #a6e3a1;")  
@@ -540,13 +451,16 @@ class MainWindow(QMainWindow):
         elif "Cancelling" in message:
             self.status_light.setStyleSheet("color: #f9e2af;")  # Yellow
     
-    def generate_summary(self, performances: List[SpeakingPerformance], failed_files: List[str] = None) -> str:
+    def generate_summary(self, performances: List['SpeakingPerformance'], failed_files: List[str] = None,
+                         partial_files: List[str] = None) -> str:
         """Generate a summary of scoring results."""
         summary = []
         summary.append("=== Scoring Summary ===\n")
         
         total_attempted = len(performances) + (len(failed_files) if failed_files else 0)
         summary.append(f"Success Rate: {len(performances)} / {total_attempted}")
+        if partial_files:
+            summary.append(f"Partly scored files: {len(partial_files)} (tick \"Rerun Failures Only\" to retry the failed agents)")
         if failed_files:
             summary.append(f"Failed files: {len(failed_files)}")
             summary.append("\nThere were some issues with the following files:\n")
@@ -566,15 +480,20 @@ class MainWindow(QMainWindow):
         """Handle completion of scoring process."""
         try:
             failed_files = getattr(self.worker, 'failed_files', []) if hasattr(self, 'worker') else []
+            partial_files = self.worker.runner.partial_files if hasattr(self, 'worker') else []
+            agent_status = self.worker.runner.agent_status if hasattr(self, 'worker') else None
+            trimmed = self.worker.runner.trimmed_silence if hasattr(self, 'worker') else None
             
-            summary = self.generate_summary(performances, failed_files)
+            summary = self.generate_summary(performances, failed_files, partial_files)
             self.summary_text.setVisible(True)
             self.summary_text.setText(summary)
             
-            filepath = save_scores_to_excel(performances, self.folder_path)
+            # pandas is only needed here, so it is imported when the first report is saved
+            from utils.excel_utils import save_scores_to_excel
+            filepath = save_scores_to_excel(performances, self.folder_path, agent_status, trimmed)
             
-            if failed_files:
-                message = (f"Scoring completed with {len(failed_files)} failures.\n"
+            if failed_files or partial_files:
+                message = (f"Scoring completed with {len(failed_files) + len(partial_files)} failures.\n"
                           f"Successful results saved to:\n{filepath}")
             else:
                 message = f"Scoring completed successfully!\nResults saved to:\n{filepath}"
@@ -1,13 +1,34 @@
-from .file_utils import (
-    get_audio_files,
-    load_audio,
-    get_audio_duration,
-    validate_audio_file
-)
+from importlib import import_module
+
+# Re-exports are loaded on first access so importing any utils module does
+# not pull in librosa and soundfile (PEP 562).
+_EXPORTS = {
+    'get_audio_files': '.file_utils',
+    'load_audio': '.file_utils',
+    'get_audio_duration': '.file_utils',
+    'validate_audio_file': '.file_utils',
+    'AudioInfo': '.audio_probe',
+    'probe_audio': '.audio_probe',
+    'probe_audio_files': '.audio_probe',
+    'probe_folder': '.audio_probe'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'get_audio_files',
     'load_audio',
     'get_audio_duration',
-    'validate_audio_file'
-] 
\ No newline at end of file
+    'validate_audio_file',
+    'AudioInfo',
+    'probe_audio',
+    'probe_audio_files',
+    'probe_folder'
+]
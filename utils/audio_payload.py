@@ -0,0 +1,112 @@
+import asyncio
+import mmap
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from utils.audio_preprocessing import SOURCE_MIME_TYPE, AudioPreprocessor
+from utils.metrics import get_metrics
+
+
+class AudioPayload:
+    """
+    Read-only audio of one file, memory-mapped where possible.
+
+    ``data`` is a memoryview, so hashing it or handing it to a backend does
+    not copy the file. Empty files and file systems without mmap support
+    fall back to a single in-memory copy.
+    """
+
+    def __init__(self, path: str, mime_type: str = SOURCE_MIME_TYPE):
+        self.path = path
+        self.mime_type = mime_type
+        self._mmap: Optional[mmap.mmap] = None
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = memoryview(self._mmap)
+            except (ValueError, OSError):
+                # Zero-length files cannot be mapped
+                self.data = memoryview(f.read())
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def close(self) -> None:
+        try:
+            self.data.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # Something still holds a view of the data; the mapping closes when it is collected
+            pass
+
+
+class AudioStore:
+    """
+    Hands out one shared AudioPayload per file to every agent scoring it.
+
+    The payload is loaded (and preprocessed, when an AudioPreprocessor is
+    attached) by the first acquire() for a file and closed when the last
+    holder calls release(). Use from a single event loop.
+    """
+
+    def __init__(self, audio_preprocessor: Optional[AudioPreprocessor] = None):
+        self.audio_preprocessor = audio_preprocessor
+        # file path -> [loading task, number of holders]
+        self._entries: Dict[str, list] = {}
+
+    async def _load(self, file_path: str) -> AudioPayload:
+        # Timed here, once per load, rather than in every holder that only waits for it
+        with get_metrics().timer('read_audio', file=os.path.basename(file_path)):
+            if self.audio_preprocessor:
+                upload_path, mime_type = await self.audio_preprocessor.prepare(file_path)
+            else:
+                upload_path, mime_type = file_path, SOURCE_MIME_TYPE
+            return await asyncio.to_thread(AudioPayload, upload_path, mime_type)
+
+    async def acquire(self, file_path: str) -> AudioPayload:
+        """Return the payload for a file, loading it if no one holds it yet."""
+        entry = self._entries.get(file_path)
+        if entry is None:
+            entry = [asyncio.ensure_future(self._load(file_path)), 0]
+            self._entries[file_path] = entry
+        entry[1] += 1
+        try:
+            # Shielded so a cancelled holder does not abort the load for the others
+            return await asyncio.shield(entry[0])
+        except BaseException:
+            self.release(file_path)
+            raise
+
+    def release(self, file_path: str) -> None:
+        """Drop one hold on a file's payload and close it when no holders remain."""
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del self._entries[file_path]
+        loading = entry[0]
+
+        def close(task):
+            if not task.cancelled() and task.exception() is None:
+                task.result().close()
+
+        if loading.done():
+            close(loading)
+        else:
+            loading.add_done_callback(close)
+
+    @asynccontextmanager
+    async def open(self, file_path: str):
+        """Hold a file's payload for the duration of the block."""
+        payload = await self.acquire(file_path)
+        try:
+            yield payload
+        finally:
+            self.release(file_path)
+
+    @property
+    def open_files(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+import soundfile as sf
+from utils.config_manager import ConfigManager
+from utils.file_utils import load_audio, trim_silence
+from utils.metrics import get_metrics
+
+CACHE_DIR = 'audio_cache'
+SOURCE_MIME_TYPE = 'audio/mp3'
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_CODEC = 'vorbis'
+DEFAULT_COMPRESSION_LEVEL = 0.7
+DEFAULT_MAX_CACHE_MB = 2048
+DEFAULT_TRIM_SILENCE = {'threshold_db': -35.0, 'floor_db': -60.0, 'frame_ms': 30.0, 'padding_ms': 300.0}
+
+# codec: (soundfile format, subtype, file extension, mime type)
+CODECS = {
+    'vorbis': ('OGG', 'VORBIS', 'ogg', 'audio/ogg'),
+    'opus': ('OGG', 'OPUS', 'ogg', 'audio/ogg'),
+    'flac': ('FLAC', 'PCM_16', 'flac', 'audio/flac'),
+}
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """Hash a file in chunks; returns (hex digest, size in bytes)."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def convert_audio(source_path: str, target_path: str, sample_rate: int, codec: str,
+                  compression_level: float, trim_silence_settings: Optional[dict] = None) -> dict:
+    """
+    Decode a recording, mix it down to mono, resample it and encode it with codec.
+
+    With trim_silence_settings the silence before and after the speech is
+    cropped first (see utils.file_utils.detect_speech_bounds for the keys).
+    Runs in a worker process. The output is written to a temporary file first
+    and then renamed, so a cached file is never seen half written; what was
+    trimmed is stored next to it in a .json file.
+
+    Returns:
+        dict: 'size' in bytes, 'duration' of the original in seconds, and
+        'trimmed_start'/'trimmed_end' in seconds
+    """
+    if trim_silence_settings is not None:
+        audio_data, _, trimmed_start, trimmed_end = trim_silence(source_path, sr=sample_rate,
+                                                                 **trim_silence_settings)
+    else:
+        audio_data, _ = load_audio(source_path, sr=sample_rate, mono=True)
+        trimmed_start = trimmed_end = 0.0
+
+    file_format, subtype, _, _ = CODECS[codec]
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    sf.write(temp_path, audio_data, sample_rate, format=file_format, subtype=subtype,
+             compression_level=compression_level if codec != 'flac' else None)
+    info = {
+        'size': os.path.getsize(temp_path),
+        'duration': round(len(audio_data) / sample_rate + trimmed_start + trimmed_end, 3),
+        'trimmed_start': round(trimmed_start, 3),
+        'trimmed_end': round(trimmed_end, 3)
+    }
+    with open(f"{temp_path}.json", 'w', encoding='utf-8') as f:
+        json.dump(info, f)
+    os.replace(f"{temp_path}.json", f"{target_path}.json")
+    os.replace(temp_path, target_path)
+    return info
+
+
+class AudioPreprocessor:
+    """
+    Converts recordings to compact mono speech audio before they are uploaded.
+
+    Conversions run in a process pool and are cached on disk by the hash of
+    the source file and the conversion settings, so re-runs and the other
+    agents scoring the same file reuse the converted audio. When a file cannot
+    be converted, its original bytes are sent instead.
+
+    With trim_silence set, leading and trailing silence is cropped as well and
+    the seconds removed per file are collected in ``trimmed``.
+    """
+
+    def __init__(self, cache_dir: str, sample_rate: int = DEFAULT_SAMPLE_RATE, codec: str = DEFAULT_CODEC,
+                 compression_level: float = DEFAULT_COMPRESSION_LEVEL, max_workers: Optional[int] = None,
+                 max_cache_mb: Optional[float] = DEFAULT_MAX_CACHE_MB,
+                 trim_silence: Optional[dict] = None):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown audio codec: {codec} (expected one of {', '.join(CODECS)})")
+        if codec == 'opus' and sample_rate not in OPUS_SAMPLE_RATES:
+            raise ValueError(f"Opus does not support a sample rate of {sample_rate} Hz")
+        self.cache_dir = cache_dir
+        self.sample_rate = sample_rate
+        self.codec = codec
+        self.compression_level = compression_level
+        self.max_workers = max_workers
+        self.max_cache_mb = max_cache_mb
+        self.trim_silence = trim_silence
+        self.mime_type = CODECS[codec][3]
+        # file name -> (seconds trimmed at the start, seconds trimmed at the end)
+        self.trimmed: Dict[str, Tuple[float, float]] = {}
+        settings = [sample_rate, codec, compression_level, trim_silence]
+        self._settings_key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls) -> Optional['AudioPreprocessor']:
+        """
+        Create the preprocessor described by the AUDIO_PREPROCESSING setting, or None when disabled.
+
+        Converted files are kept in an audio_cache folder next to config.json
+        unless AUDIO_PREPROCESSING.cache_dir is set.
+        """
+        settings = ConfigManager.get_setting('AUDIO_PREPROCESSING') or {}
+        if not settings.get('enabled', False):
+            return None
+        cache_dir = settings.get('cache_dir') or os.path.join(
+            os.path.dirname(ConfigManager.get_config_path()), CACHE_DIR)
+        trim_settings = settings.get('trim_silence') or {}
+        trim_silence_settings = None
+        if trim_settings.get('enabled', False):
+            trim_silence_settings = {key: trim_settings.get(key, default)
+                                     for key, default in DEFAULT_TRIM_SILENCE.items()}
+        return cls(cache_dir,
+                   sample_rate=settings.get('sample_rate', DEFAULT_SAMPLE_RATE),
+                   codec=settings.get('codec', DEFAULT_CODEC),
+                   compression_level=settings.get('compression_level', DEFAULT_COMPRESSION_LEVEL),
+                   max_workers=settings.get('workers'),
+                   max_cache_mb=settings.get('max_cache_mb', DEFAULT_MAX_CACHE_MB),
+                   trim_silence=trim_silence_settings)
+
+    def _cache_path(self, source_hash: str) -> str:
+        extension = CODECS[self.codec][2]
+        return os.path.join(self.cache_dir, f"{source_hash}_{self._settings_key}.{extension}")
+
+    async def _convert(self, file_path: str, target_path: str) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        with get_metrics().timer('preprocess_audio', file=os.path.basename(file_path)):
+            await loop.run_in_executor(self._executor, convert_audio, file_path, target_path,
+                                       self.sample_rate, self.codec, self.compression_level,
+                                       self.trim_silence)
+
+    async def prepare(self, file_path: str) -> Tuple[str, str]:
+        """
+        Return the path of the audio to upload for a file and its mime type.
+
+        Concurrent calls for the same recording share a single conversion.
+        """
+        metrics = get_metrics()
+        source_hash, source_size = await asyncio.to_thread(file_sha256, file_path)
+        metrics.observe_size('source_audio_bytes', source_size)
+        target_path = self._cache_path(source_hash)
+
+        if os.path.exists(target_path):
+            metrics.increment('preprocess_cache_hit')
+        else:
+            metrics.increment('preprocess_cache_miss')
+            conversion = self._pending.get(target_path)
+            if conversion is None:
+                conversion = asyncio.ensure_future(self._convert(file_path, target_path))
+                self._pending[target_path] = conversion
+                conversion.add_done_callback(lambda _: self._pending.pop(target_path, None))
+            try:
+                # Shielded so a cancelled caller does not abort the conversion for the others
+                await asyncio.shield(conversion)
+            except Exception as e:
+                metrics.increment('preprocess_failed', file=os.path.basename(file_path))
+                print(f"Could not preprocess {os.path.basename(file_path)}, sending the original audio: {e}")
+                return file_path, SOURCE_MIME_TYPE
+
+        # Marks the file as recently used for eviction
+        os.utime(target_path)
+        if self.trim_silence is not None:
+            self._report_trim(os.path.basename(file_path), target_path)
+        return target_path, self.mime_type
+
+    def _report_trim(self, file_name: str, target_path: str) -> None:
+        """Record the trimmed seconds of a file once per run, from the conversion's .json file."""
+        if file_name in self.trimmed:
+            return
+        try:
+            with open(f"{target_path}.json", 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.trimmed[file_name] = (info['trimmed_start'], info['trimmed_end'])
+        get_metrics().observe_size('trimmed_seconds', info['trimmed_start'] + info['trimmed_end'],
+                                   file=file_name, trimmed_start=info['trimmed_start'],
+                                   trimmed_end=info['trimmed_end'], duration=info['duration'])
+
+    def evict(self) -> int:
+        """Remove the least recently used converted files beyond max_cache_mb; returns how many were removed."""
+        if not self.max_cache_mb:
+            return 0
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(('.tmp', '.json')) or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        budget = self.max_cache_mb * 1024 * 1024
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            try:
+                os.remove(path)
+                if os.path.exists(f"{path}.json"):
+                    os.remove(f"{path}.json")
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def close(self) -> None:
+        """Stop the worker processes and trim the cache."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        try:
+            self.evict()
+        except OSError as e:
+            print(f"Could not trim the audio cache: {e}")
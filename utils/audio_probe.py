@@ -0,0 +1,258 @@
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+# Bytes read from the start of the file to find the first frame and its tag
+HEAD_SIZE = 64 * 1024
+# Frames compared to tell constant from variable bitrate when there is no tag
+CBR_CHECK_FRAMES = 8
+DEFAULT_PROBE_WORKERS = 8
+
+# MPEG version bits -> version (1, 2 or 2.5)
+VERSIONS = {0b11: 1, 0b10: 2, 0b00: 2.5}
+# Layer bits -> layer
+LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+# Bitrates in kbps by (version 1 or not, layer); index 0 is "free" and 15 is invalid
+BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+
+@dataclass
+class AudioInfo:
+    """Basic properties of an audio file and how they were obtained."""
+    duration: float
+    sample_rate: int
+    channels: int
+    bitrate: Optional[int]  # average kbps
+    # 'xing' or 'vbri' (VBR tag), 'cbr' (constant bitrate), 'frame_scan' (all headers read) or 'decode'
+    method: str
+
+
+@dataclass
+class FrameHeader:
+    version: float
+    layer: int
+    bitrate: int  # kbps
+    sample_rate: int
+    channels: int
+    samples: int  # per frame
+    length: int  # bytes, including the header
+
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[FrameHeader]:
+    """Decode the 4-byte MPEG audio frame header at offset, or return None if there is none."""
+    if offset + 4 > len(data):
+        return None
+    header, = struct.unpack('>I', data[offset:offset + 4])
+    if header >> 21 != 0x7FF:
+        return None
+    version = VERSIONS.get((header >> 19) & 0b11)
+    layer = LAYERS.get((header >> 17) & 0b11)
+    bitrate_index = (header >> 12) & 0b1111
+    sample_rate_index = (header >> 10) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = BITRATES[(version == 1, layer)][bitrate_index]
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (header >> 9) & 1
+    channels = 1 if (header >> 6) & 0b11 == 0b11 else 2
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 1152 if layer == 2 or version == 1 else 576
+        length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    return FrameHeader(version, layer, bitrate, sample_rate, channels, samples, length)
+
+
+def _audio_start(data: bytes) -> int:
+    """Skip an ID3v2 tag at the start of the file."""
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _find_first_frame(data: bytes, start: int) -> Optional[int]:
+    """Find the first frame header that is followed by another valid header."""
+    offset = data.find(b'\xff', start)
+    while offset != -1 and offset + 4 <= len(data):
+        frame = parse_frame_header(data, offset)
+        if frame:
+            following = offset + frame.length
+            # A frame right at the end of the head cannot be confirmed; accept it
+            if following + 4 > len(data) or parse_frame_header(data, following):
+                return offset
+        offset = data.find(b'\xff', offset + 1)
+    return None
+
+
+def _vbr_tag(data: bytes, offset: int, frame: FrameHeader) -> Optional[tuple]:
+    """Return (method, frame count, byte count) from a Xing/Info or VBRI tag in the first frame."""
+    if frame.version == 1:
+        side_info = 17 if frame.channels == 1 else 32
+    else:
+        side_info = 9 if frame.channels == 1 else 17
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info') and len(data) >= xing + 16:
+        flags, = struct.unpack('>I', data[xing + 4:xing + 8])
+        position = xing + 8
+        frames = byte_count = None
+        if flags & 0x1:
+            frames, = struct.unpack('>I', data[position:position + 4])
+            position += 4
+        if flags & 0x2:
+            byte_count, = struct.unpack('>I', data[position:position + 4])
+        if frames:
+            return 'xing', frames, byte_count
+
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b'VBRI' and len(data) >= vbri + 18:
+        byte_count, frames = struct.unpack('>II', data[vbri + 10:vbri + 18])
+        if frames:
+            return 'vbri', frames, byte_count
+    return None
+
+
+def _scan_frames(path: str, first_offset: int, audio_end: int) -> Optional[AudioInfo]:
+    """Walk every frame header in the file; returns None when the stream loses sync."""
+    with open(path, 'rb') as f:
+        data = f.read(audio_end)
+    offset = first_offset
+    frames = samples = 0
+    first = None
+    while offset + 4 <= audio_end:
+        frame = parse_frame_header(data, offset)
+        if frame is None:
+            break
+        first = first or frame
+        frames += 1
+        samples += frame.samples
+        offset += frame.length
+    # Allow a truncated last frame, but not garbage in the middle of the stream
+    if first is None or audio_end - offset > first.length:
+        return None
+    duration = samples / first.sample_rate
+    bitrate = round((offset - first_offset) * 8 / duration / 1000) if duration else None
+    return AudioInfo(duration, first.sample_rate, first.channels, bitrate, 'frame_scan')
+
+
+def _decode_probe(path: str) -> AudioInfo:
+    # Imported here because utils.file_utils uses this module
+    from utils.file_utils import load_audio
+
+    audio_data, sample_rate = load_audio(path, sr=None, mono=False)
+    channels = 1 if audio_data.ndim == 1 else audio_data.shape[0]
+    samples = audio_data.shape[-1]
+    if samples == 0:
+        raise ValueError(f"No audio in {path}")
+    duration = samples / sample_rate
+    bitrate = round(os.path.getsize(path) * 8 / duration / 1000)
+    return AudioInfo(duration, sample_rate, channels, bitrate, 'decode')
+
+
+def probe_mp3(path: str) -> Optional[AudioInfo]:
+    """
+    Read an MP3's properties from its frame headers without decoding it.
+
+    Uses the Xing/Info or VBRI tag when present, the bitrate of the first
+    frames for constant bitrate files, and otherwise walks every frame
+    header. Returns None when the file does not look like a consistent MP3.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        # head holds the file from base on, after any ID3v2 tag (cover art can be large)
+        base = _audio_start(f.read(10))
+        f.seek(base)
+        head = f.read(HEAD_SIZE)
+        audio_end = file_size
+        if file_size >= 128:
+            f.seek(file_size - 128)
+            if f.read(3) == b'TAG':
+                audio_end -= 128
+
+    first_offset = _find_first_frame(head, 0)
+    if first_offset is None:
+        return None
+    frame = parse_frame_header(head, first_offset)
+    first_offset += base
+
+    tag = _vbr_tag(head, first_offset - base, frame)
+    if tag:
+        method, frames, byte_count = tag
+        duration = frames * frame.samples / frame.sample_rate
+        byte_count = byte_count or audio_end - first_offset
+        bitrate = round(byte_count * 8 / duration / 1000) if duration else None
+        return AudioInfo(duration, frame.sample_rate, frame.channels, bitrate, method)
+
+    # Without a tag the duration follows from the bitrate only if it is constant
+    offset = first_offset - base
+    constant = True
+    for _ in range(CBR_CHECK_FRAMES):
+        following = parse_frame_header(head, offset)
+        if following is None:
+            break
+        if following.bitrate != frame.bitrate or following.sample_rate != frame.sample_rate:
+            constant = False
+            break
+        offset += following.length
+    if constant:
+        duration = (audio_end - first_offset) * 8 / (frame.bitrate * 1000)
+        return AudioInfo(duration, frame.sample_rate, frame.channels, frame.bitrate, 'cbr')
+    return _scan_frames(path, first_offset, audio_end)
+
+
+def probe_audio(path: str) -> AudioInfo:
+    """
+    Return the duration, sample rate, channels and bitrate of an audio file.
+
+    MP3 headers are read when they can be trusted; anything else is decoded.
+
+    Raises:
+        ValueError: If the file cannot be read as audio
+    """
+    try:
+        info = probe_mp3(path)
+    except OSError as e:
+        raise ValueError(f"Error reading {path}: {str(e)}")
+    if info is not None and info.duration > 0:
+        return info
+    return _decode_probe(path)
+
+
+def probe_audio_files(paths: Iterable[str],
+                      max_workers: int = DEFAULT_PROBE_WORKERS) -> Dict[str, Union[AudioInfo, Exception]]:
+    """
+    Probe many files in parallel threads.
+
+    Returns:
+        dict: {path: AudioInfo, or the exception raised for that file}, in input order
+    """
+    paths = list(paths)
+
+    def probe(path):
+        try:
+            return probe_audio(path)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(probe, paths)))
+
+
+def probe_folder(folder_path: str, max_workers: int = DEFAULT_PROBE_WORKERS) -> Dict[str, Union[AudioInfo, Exception]]:
+    """Probe every MP3 in a folder; keys are file names, in sorted order."""
+    names = sorted(f for f in os.listdir(folder_path) if f.lower().endswith('.mp3'))
+    results = probe_audio_files((os.path.join(folder_path, name) for name in names), max_workers)
+    return {name: results[os.path.join(folder_path, name)] for name in names}
@@ -1,6 +1,7 @@
 import pandas as pd
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from models.score_models import SpeakingPerformance
+from utils.metrics import get_metrics, timed
 import os
 from datetime import datetime
 import re
@@ -13,17 +14,33 @@ def _parse_file_name(file_name: str) -> tuple[str, str, str]:
         return ('Unknown', 'Unknown', 'Unknown')
     return match.groups()  # Returns (student_id, session_id, task_number)
 
-def save_scores_to_excel(performances: List[SpeakingPerformance], output_dir: str) -> str:
+# Report column for each scoring option's per-agent status
+STATUS_COLUMNS = {
+    'analytic': 'Analytic Status',
+    'holistic': 'Holistic Status',
+    'off_topic': 'Off Topic Status'
+}
+# Report columns for the seconds of silence cropped before upload
+TRIM_COLUMNS = ('Trimmed Start (s)', 'Trimmed End (s)')
+
+def build_score_rows(performances: List[SpeakingPerformance],
+                     agent_status: Optional[Dict[str, Dict[str, str]]] = None,
+                     trimmed: Optional[Dict[str, Tuple[float, float]]] = None) -> List[dict]:
     """
-    Save speaking performance scores to an Excel file.
+    Flatten performances into one report row each.
     
     Args:
         performances: List of SpeakingPerformance objects
-        output_dir: Directory to save the Excel file (same as audio files directory)
+        agent_status: Optional {file name: {scoring option: status}}; adds a
+            status column for every option that has one
+        trimmed: Optional {file name: (seconds trimmed at the start, at the end)};
+            adds the trim columns when silence trimming was on
         
     Returns:
-        str: Path to the saved Excel file
+        list: One dict per performance, keyed by report column name
     """
+    # Options with a status anywhere get a column in every row
+    options = {option for statuses in (agent_status or {}).values() for option in statuses}
     data = []
     for perf in performances:
         student_id, session_id, task_id = _parse_file_name(perf.file_name)
@@ -45,7 +62,33 @@ def save_scores_to_excel(performances: List[SpeakingPerformance], output_dir: st
             'Off Topic Confidence': perf.off_topic_analysis.confidence if perf.off_topic_analysis else None,
             'Off Topic Explanation': perf.off_topic_analysis.explanation if perf.off_topic_analysis else None
         }
+        if agent_status:
+            status = agent_status.get(perf.file_name, {})
+            for option, column in STATUS_COLUMNS.items():
+                if option in options:
+                    row[column] = status.get(option)
+        if trimmed:
+            row.update(zip(TRIM_COLUMNS, trimmed.get(perf.file_name, (None, None))))
         data.append(row)
+    return data
+
+@timed('write_excel')
+def save_scores_to_excel(performances: List[SpeakingPerformance], output_dir: str,
+                         agent_status: Optional[Dict[str, Dict[str, str]]] = None,
+                         trimmed: Optional[Dict[str, Tuple[float, float]]] = None) -> str:
+    """
+    Save speaking performance scores to an Excel file.
+    
+    Args:
+        performances: List of SpeakingPerformance objects
+        output_dir: Directory to save the Excel file (same as audio files directory)
+        agent_status: Optional {file name: {scoring option: status}} written as status columns
+        trimmed: Optional {file name: (start, end)} seconds of silence trimmed, written as trim columns
+        
+    Returns:
+        str: Path to the saved Excel file
+    """
+    data = build_score_rows(performances, agent_status, trimmed)
     
     df = pd.DataFrame(data)
     
@@ -117,6 +160,12 @@ def save_scores_to_excel(performances: List[SpeakingPerformance], output_dir: st
         for col_range in text_cols:
             scores_worksheet.set_column(col_range, None, text_format)
         
+        status_count = sum(1 for column in STATUS_COLUMNS.values() if column in df.columns)
+        if status_count:
+            scores_worksheet.set_column(15, 14 + status_count, 15, text_format)  # Status columns
+        if TRIM_COLUMNS[0] in df.columns:
+            scores_worksheet.set_column(15 + status_count, 16 + status_count, 16, score_format)  # Trim columns
+        
         for col_num, value in enumerate(conversions_df.columns.values):
             conversions_worksheet.write(0, col_num, value, header_format)
         
@@ -128,4 +177,5 @@ def save_scores_to_excel(performances: List[SpeakingPerformance], output_dir: st
         conversions_worksheet.set_column('A:A', None, text_format)   # Student ID
         conversions_worksheet.set_column('D:D', None, text_format)   # Off Topic Count
     
+    get_metrics().observe_size('excel_bytes', os.path.getsize(filepath))
     return filepath 
\ No newline at end of file
@@ -1,8 +1,15 @@
 import os
 import soundfile as sf
-import librosa
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from utils.audio_probe import probe_audio
+
+# Seconds of audio decoded at a time by peak_level_db
+LEVEL_BLOCK_SECONDS = 10.0
+
+def error_text(error: BaseException) -> str:
+    """Return an exception's message, or its type name when the message is empty."""
+    return str(error) or type(error).__name__
 
 def read_file_as_bytes(file_path: str) -> bytes:
     """Read an audio file as bytes."""
@@ -17,28 +24,110 @@ def get_audio_files(folder_path: str) -> List[str]:
             audio_files.append(os.path.join(folder_path, file))
     return audio_files
 
-def load_audio(file_path: str) -> Tuple[np.ndarray, int]:
-    """Load an audio file and return the audio data and sample rate."""
+def load_audio(file_path: str, sr: Optional[int] = None, mono: bool = True) -> Tuple[np.ndarray, int]:
+    """Load an audio file and return the audio data and sample rate, resampled to sr if given."""
+    # Imported here because librosa is slow to import and most callers never decode
+    import librosa
     try:
-        audio_data, sample_rate = librosa.load(file_path, sr=None)
+        audio_data, sample_rate = librosa.load(file_path, sr=sr, mono=mono)
         return audio_data, sample_rate
     except Exception as e:
-        raise ValueError(f"Error loading audio file {file_path}: {str(e)}")
+        raise ValueError(f"Error loading audio file {file_path}: {error_text(e)}")
+
+def frame_levels_db(audio_data: np.ndarray, sample_rate: int, frame_ms: float = 30.0) -> np.ndarray:
+    """RMS level in dBFS of each complete frame_ms frame of a mono signal."""
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    frame_count = len(audio_data) // frame_length
+    frames = audio_data[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+def peak_level_db(file_path: str, stop_at_db: Optional[float] = None, frame_ms: float = 30.0) -> Optional[float]:
+    """
+    Return the RMS level in dBFS of the loudest frame_ms frame of a file, or
+    None when it holds no complete frame.
+
+    The file is decoded block by block at its own sample rate, and decoding
+    stops at the first frame reaching stop_at_db, so an audible recording is
+    usually settled after its first block. Files soundfile cannot open are
+    decoded whole with load_audio.
+
+    Raises:
+        ValueError: If the file cannot be decoded
+    """
+    peak = None
+    try:
+        with sf.SoundFile(file_path) as f:
+            frame_length = max(1, int(f.samplerate * frame_ms / 1000))
+            block_frames = max(1, int(LEVEL_BLOCK_SECONDS * 1000 / frame_ms))
+            for block in f.blocks(blocksize=frame_length * block_frames, dtype='float32', always_2d=True):
+                levels = frame_levels_db(block.mean(axis=1), f.samplerate, frame_ms)
+                if levels.size:
+                    peak = float(levels.max()) if peak is None else max(peak, float(levels.max()))
+                if peak is not None and stop_at_db is not None and peak >= stop_at_db:
+                    break
+        return peak
+    except RuntimeError:
+        if peak is not None:
+            raise ValueError(f"Error decoding audio file {file_path}: stream is corrupt") from None
+    levels = frame_levels_db(*load_audio(file_path), frame_ms)
+    return float(levels.max()) if levels.size else None
+
+def detect_speech_bounds(audio_data: np.ndarray, sample_rate: int, threshold_db: float = -35.0,
+                         floor_db: float = -60.0, frame_ms: float = 30.0,
+                         padding_ms: float = 300.0) -> Tuple[int, int]:
+    """
+    Find where speech starts and ends using frame energy.
+
+    The signal is cut into frame_ms frames and a frame counts as speech when
+    its RMS level is within threshold_db of the loudest frame and above the
+    absolute floor_db (dBFS). padding_ms of context is kept on both sides.
+
+    Returns:
+        tuple: (first sample, one past the last sample) to keep; the whole
+        signal when no frame counts as speech
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    level_db = frame_levels_db(audio_data, sample_rate, frame_ms)
+    if level_db.size == 0:
+        return 0, len(audio_data)
+
+    voiced = np.flatnonzero((level_db >= level_db.max() + threshold_db) & (level_db >= floor_db))
+    if voiced.size == 0:
+        return 0, len(audio_data)
+
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, int(voiced[0]) * frame_length - padding)
+    end = min(len(audio_data), (int(voiced[-1]) + 1) * frame_length + padding)
+    return start, end
+
+def trim_silence(file_path: str, sr: Optional[int] = None, **thresholds) -> Tuple[np.ndarray, int, float, float]:
+    """
+    Load an audio file and crop the silence before and after the speech.
+
+    Args:
+        file_path: Audio file to load
+        sr: Sample rate to resample to, or None to keep the file's own
+        **thresholds: threshold_db, floor_db, frame_ms and padding_ms for detect_speech_bounds
+
+    Returns:
+        tuple: (audio data, sample rate, seconds trimmed at the start, seconds trimmed at the end)
+    """
+    audio_data, sample_rate = load_audio(file_path, sr=sr)
+    start, end = detect_speech_bounds(audio_data, sample_rate, **thresholds)
+    return (audio_data[start:end], sample_rate,
+            start / sample_rate, (len(audio_data) - end) / sample_rate)
 
 def get_audio_duration(file_path: str) -> float:
-    """Get the duration of an audio file in seconds."""
+    """Get the duration of an audio file in seconds, from its headers when possible."""
     try:
-        audio_data, sample_rate = load_audio(file_path)
-        return len(audio_data) / sample_rate
+        return probe_audio(file_path).duration
     except Exception as e:
         raise ValueError(f"Error getting audio duration for {file_path}: {str(e)}")
 
 def validate_audio_file(file_path: str) -> bool:
     """Validate if the audio file is properly formatted and readable."""
     try:
-        audio_data, sample_rate = load_audio(file_path)
-        if len(audio_data) == 0:
-            return False
-        return True
+        return probe_audio(file_path).duration > 0
     except Exception:
-        return False 
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -0,0 +1,191 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+TRACE_FILE_PREFIX = 'scoring_trace_'
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """
+    Timers, counters and payload sizes collected during one scoring run.
+
+    Values are aggregated per (name, agent). When a trace path is given, every
+    timing, count and size is also appended to a JSONL trace as it happens,
+    together with any extra context such as the file name, and a final
+    summary record is written on close().
+    """
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # (name, agent) -> [count, total, max]
+        self.timers: Dict[Tuple[str, Optional[str]], list] = {}
+        self.sizes: Dict[Tuple[str, Optional[str]], list] = {}
+        self.counters: Dict[Tuple[str, Optional[str]], int] = {}
+        self._trace = open(trace_path, 'w', encoding='utf-8') if trace_path else None
+
+    @staticmethod
+    def _accumulate(table: dict, key: tuple, value: float) -> None:
+        entry = table.get(key)
+        if entry is None:
+            table[key] = [1, value, value]
+        else:
+            entry[0] += 1
+            entry[1] += value
+            entry[2] = max(entry[2], value)
+
+    def _write_trace(self, record: dict) -> None:
+        # Called with the lock held
+        if self._trace and not self._trace.closed:
+            record = {'t': round(time.monotonic() - self._started, 4), **record}
+            self._trace.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def record_time(self, stage: str, seconds: float, agent: Optional[str] = None, **context) -> None:
+        with self._lock:
+            self._accumulate(self.timers, (stage, agent), seconds)
+            self._write_trace({'type': 'timer', 'stage': stage, 'agent': agent,
+                               'seconds': round(seconds, 6), **context})
+
+    @contextmanager
+    def timer(self, stage: str, agent: Optional[str] = None, **context):
+        """Time the enclosed block, including any awaits inside it; failures are timed too."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(stage, time.perf_counter() - started, agent, **context)
+
+    def increment(self, name: str, agent: Optional[str] = None, value: int = 1, **context) -> None:
+        with self._lock:
+            self.counters[(name, agent)] = self.counters.get((name, agent), 0) + value
+            self._write_trace({'type': 'count', 'name': name, 'agent': agent, 'value': value, **context})
+
+    def observe_size(self, name: str, size: int, agent: Optional[str] = None, **context) -> None:
+        with self._lock:
+            self._accumulate(self.sizes, (name, agent), size)
+            self._write_trace({'type': 'size', 'name': name, 'agent': agent, 'size': size, **context})
+
+    def snapshot(self) -> dict:
+        """
+        Return the aggregated values as plain data.
+
+        Returns:
+            dict: 'stages' and 'sizes' ({name: {count, total, mean, max}}) and
+            'counters' ({name: total}) summed over agents, plus 'by_agent' with
+            the same three tables for each agent
+        """
+        def stats(entry):
+            count, total, largest = entry
+            return {'count': count, 'total': round(total, 6), 'mean': round(total / count, 6),
+                    'max': round(largest, 6)}
+
+        def merge(table):
+            merged = {}
+            for (name, _), entry in table.items():
+                current = merged.setdefault(name, [0, 0, 0])
+                current[0] += entry[0]
+                current[1] += entry[1]
+                current[2] = max(current[2], entry[2])
+            return merged
+
+        with self._lock:
+            by_agent = {}
+            for table_name, table in (('stages', self.timers), ('sizes', self.sizes)):
+                for (name, agent), entry in table.items():
+                    if agent:
+                        by_agent.setdefault(agent, {}).setdefault(table_name, {})[name] = stats(entry)
+            for (name, agent), value in self.counters.items():
+                if agent:
+                    by_agent.setdefault(agent, {}).setdefault('counters', {})[name] = value
+            counters = {}
+            for (name, _), value in self.counters.items():
+                counters[name] = counters.get(name, 0) + value
+            return {
+                'stages': {name: stats(entry) for name, entry in merge(self.timers).items()},
+                'sizes': {name: stats(entry) for name, entry in merge(self.sizes).items()},
+                'counters': counters,
+                'by_agent': by_agent
+            }
+
+    def prometheus_text(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        def labels(**values):
+            pairs = [f'{key}="{_escape_label(value)}"' for key, value in values.items() if value is not None]
+            return '{' + ','.join(pairs) + '}' if pairs else ''
+
+        lines = []
+        with self._lock:
+            lines.append('# HELP scorer_stage_duration_seconds Time spent in each scoring stage.')
+            lines.append('# TYPE scorer_stage_duration_seconds summary')
+            for (stage, agent), (count, total, _) in sorted(self.timers.items(), key=str):
+                lines.append(f'scorer_stage_duration_seconds_sum{labels(stage=stage, agent=agent)} {total:.6f}')
+                lines.append(f'scorer_stage_duration_seconds_count{labels(stage=stage, agent=agent)} {count}')
+            lines.append('# HELP scorer_stage_duration_seconds_max Longest single duration of each stage.')
+            lines.append('# TYPE scorer_stage_duration_seconds_max gauge')
+            for (stage, agent), (_, _, largest) in sorted(self.timers.items(), key=str):
+                lines.append(f'scorer_stage_duration_seconds_max{labels(stage=stage, agent=agent)} {largest:.6f}')
+            lines.append('# HELP scorer_events_total Number of scoring events such as cache hits and retries.')
+            lines.append('# TYPE scorer_events_total counter')
+            for (name, agent), value in sorted(self.counters.items(), key=str):
+                lines.append(f'scorer_events_total{labels(event=name, agent=agent)} {value}')
+            lines.append('# HELP scorer_payload_size Size of payloads (bytes or characters, see the name).')
+            lines.append('# TYPE scorer_payload_size summary')
+            for (name, agent), (count, total, _) in sorted(self.sizes.items(), key=str):
+                lines.append(f'scorer_payload_size_sum{labels(payload=name, agent=agent)} {total}')
+                lines.append(f'scorer_payload_size_count{labels(payload=name, agent=agent)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the exposition atomically, e.g. for the node_exporter textfile collector."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+    def close(self) -> None:
+        """Write the summary record and close the trace. Values can still be recorded afterwards."""
+        summary = self.snapshot()
+        with self._lock:
+            self._write_trace({'type': 'summary', **summary})
+            if self._trace and not self._trace.closed:
+                self._trace.close()
+
+
+_metrics = Metrics()
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Return the metrics of the current run."""
+    return _metrics
+
+
+def reset_metrics(trace_path: Optional[str] = None) -> Metrics:
+    """Start collecting a new run, optionally traced to trace_path, and close the previous one."""
+    global _metrics
+    with _metrics_lock:
+        _metrics.close()
+        _metrics = Metrics(trace_path)
+        return _metrics
+
+
+def timed(stage: Optional[str] = None):
+    """Decorator that times every call of a function under stage (default: the function name)."""
+    def decorator(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
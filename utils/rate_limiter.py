@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+from utils.config_manager import ConfigManager
+
+# Rough token costs used to reserve quota before the real usage is known.
+# Gemini bills audio at 32 tokens per second; 16,000 bytes is one second at 128 kbps.
+AUDIO_BYTES_PER_SECOND = 16000
+AUDIO_TOKENS_PER_SECOND = 32
+CHARS_PER_TEXT_TOKEN = 4
+EXPECTED_OUTPUT_TOKENS = 200
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the input tokens of a piece of text."""
+    return int(len(text) / CHARS_PER_TEXT_TOKEN)
+
+
+def estimate_request_tokens(prompt: str, audio_size: int) -> int:
+    """Estimate the tokens a prompt plus inline audio will be billed for."""
+    audio_tokens = audio_size / AUDIO_BYTES_PER_SECOND * AUDIO_TOKENS_PER_SECOND
+    text_tokens = len(prompt) / CHARS_PER_TEXT_TOKEN
+    return int(audio_tokens + text_tokens) + EXPECTED_OUTPUT_TOKENS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously up to ``capacity``.
+
+    Reservations are taken immediately and may drive the balance negative; the
+    caller then waits until the deficit has been refilled. This keeps requests
+    first-come first-served without holding a lock across an await.
+    ``clock`` returns the current time in seconds.
+    """
+
+    def __init__(self, capacity: float, per_second: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them."""
+        self._refill()
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.per_second
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one API key."""
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request of ``tokens`` estimated tokens fits the quota.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            delay = 0.0
+            if self.requests:
+                delay = max(delay, self.requests.reserve(1))
+            if self.tokens and tokens:
+                delay = max(delay, self.tokens.reserve(tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct a reservation once the response reports real token usage."""
+        if not self.tokens or actual_tokens is None:
+            return
+        with self._lock:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+# Limiters by the API key value they pace, so names configured with the same key share one quota
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _strictest(values) -> Optional[float]:
+    values = [value for value in values if value]
+    return min(values) if values else None
+
+
+def get_rate_limiter(key_name: str, api_key: Optional[str] = None) -> RateLimiter:
+    """
+    Return the run-wide limiter for an API key, creating it from config.json.
+
+    Limits are read from the RATE_LIMITS setting by config key name, e.g.
+    {"ANALYTIC_SCORING_API_KEY": {"requests_per_minute": 15, "tokens_per_minute": 1000000}}.
+    The limiter is shared by every name configured with the same key value
+    (``api_key``, or the one stored under ``key_name``), and when several of
+    those names have limits the strictest ones apply. Keys without an entry
+    are not limited.
+    """
+    api_key = api_key or ConfigManager.get_api_key(key_name)
+    with _limiters_lock:
+        bucket_key = api_key or key_name
+        limiter = _limiters.get(bucket_key)
+        if limiter is None:
+            rate_limits = ConfigManager.get_setting('RATE_LIMITS') or {}
+            names = {key_name} | {name for name in rate_limits
+                                  if api_key and ConfigManager.get_api_key(name) == api_key}
+            limits = [rate_limits.get(name) or {} for name in sorted(names)]
+            limiter = RateLimiter(
+                requests_per_minute=_strictest(entry.get('requests_per_minute') for entry in limits),
+                tokens_per_minute=_strictest(entry.get('tokens_per_minute') for entry in limits)
+            )
+            _limiters[bucket_key] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Drop all limiters so the next run picks up the current configuration."""
+    with _limiters_lock:
+        _limiters.clear()
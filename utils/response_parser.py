@@ -1,84 +1,195 @@
 import json
-import re
+from typing import Dict, List, Optional, Tuple
+from utils.metrics import timed
+
+
+class ResponseSchema:
+    """
+    Fields an agent's JSON reply must contain.
+
+    ``fields`` maps each field name to (type, minimum, maximum), where type is
+    'integer', 'number', 'boolean' or 'string' and the bounds apply to numbers.
+    Backends use the schema to request structured output, and replies are
+    checked against it before they are parsed.
+    """
+
+    def __init__(self, fields: Dict[str, Tuple[str, Optional[float], Optional[float]]]):
+        self.fields = fields
+
+    @staticmethod
+    def _type_problem(value, field_type: str) -> Optional[str]:
+        if field_type == 'boolean':
+            return None if isinstance(value, bool) else "must be true or false"
+        if field_type == 'string':
+            return None if isinstance(value, str) else "must be a string"
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return f"must be a{'n integer' if field_type == 'integer' else ' number'}"
+        if field_type == 'integer' and not float(value).is_integer():
+            return "must be an integer"
+        return None
+
+    def _field_problems(self, parsed: dict) -> List[Tuple[str, str, bool]]:
+        """Return (field, problem, whether a repair can fix it) for every bad field."""
+        problems = []
+        for name, (field_type, minimum, maximum) in self.fields.items():
+            if name not in parsed:
+                problems.append((name, f"{name} is missing", False))
+                continue
+            problem = self._type_problem(parsed[name], field_type)
+            if problem:
+                # A quoted value such as "4" only needs reformatting; 2.5 for a band would need a new score
+                repairable = isinstance(parsed[name], str)
+                problems.append((name, f"{name} {problem} (got {json.dumps(parsed[name])})", repairable))
+                continue
+            if minimum is not None and parsed[name] < minimum:
+                problem = f"must be at least {minimum:g}"
+            elif maximum is not None and parsed[name] > maximum:
+                problem = f"must be at most {maximum:g}"
+            if problem:
+                problems.append((name, f"{name} {problem} (got {json.dumps(parsed[name])})", False))
+        return problems
+
+    def problems(self, parsed: Optional[dict]) -> List[str]:
+        """Return what is wrong with a parsed reply; an empty list means it is valid."""
+        if parsed is None:
+            return ["the reply is not a JSON object"]
+        return [problem for _, problem, _ in self._field_problems(parsed)]
+
+    def score_problems(self, parsed: Optional[dict]) -> List[str]:
+        """
+        Return the problems a repair request cannot fix: a value that is
+        missing, out of range or of the wrong type other than a quoted
+        string, which the model could only replace with a new score. A reply
+        that is not JSON or has quoted values only needs reformatting.
+        """
+        if parsed is None:
+            return []
+        return [problem for _, problem, repairable in self._field_problems(parsed) if not repairable]
+
+    def valid_values(self, parsed: Optional[dict]) -> dict:
+        """Return the fields of a parsed reply that are already valid, which a repair must keep."""
+        if parsed is None:
+            return {}
+        bad = {name for name, _, _ in self._field_problems(parsed)}
+        return {name: parsed[name] for name in self.fields if name not in bad}
+
+    def describe(self) -> str:
+        """Describe the expected reply, e.g. '{ grammar: integer 1-5, ... }'."""
+        parts = []
+        for name, (field_type, minimum, maximum) in self.fields.items():
+            bounds = f" {minimum:g}-{maximum:g}" if minimum is not None and maximum is not None else ""
+            parts.append(f"{name}: {field_type}{bounds}")
+        return "{ " + ", ".join(parts) + " }"
+
+    def __add__(self, other: 'ResponseSchema') -> 'ResponseSchema':
+        return ResponseSchema({**self.fields, **other.fields})
+
+
+ANALYTIC_SCHEMA = ResponseSchema({
+    domain: ('integer', 1, 5)
+    for domain in ('grammar', 'vocabulary', 'content', 'fluency', 'pronunciation', 'overall')
+})
+HOLISTIC_SCHEMA = ResponseSchema({'overall_score': ('number', 0, 100)})
+OFF_TOPIC_SCHEMA = ResponseSchema({
+    'off_topic': ('boolean', None, None),
+    'confidence': ('number', 0, 1),
+    'explanation': ('string', None, None)
+})
+COMBINED_SCHEMA = ANALYTIC_SCHEMA + HOLISTIC_SCHEMA + OFF_TOPIC_SCHEMA
+
 
 class ResponseParser:
     """
     Utility class to parse API responses for different scoring agents.
+
+    Every reply goes through the same path: the JSON object is read from the
+    reply, checked against the agent's schema and only then mapped to the
+    result fields.
     """
 
+    _decoder = json.JSONDecoder()
+
     @staticmethod
-    def parse_analytic_response(response: str) -> dict:
+    def _load_json(response: str) -> Optional[dict]:
+        """
+        Parse the reply as a JSON object, or find the first JSON object embedded
+        in surrounding text, e.g. prose or a Markdown code fence.
+        """
         try:
             parsed = json.loads(response)
-            return {
-                "grammar": parsed.get("grammar", 0),
-                "vocabulary": parsed.get("vocabulary", 0),
-                "content": parsed.get("content", 0),
-                "fluency": parsed.get("fluency", 0),
-                "pronunciation": parsed.get("pronunciation", 0),
-                "overall": parsed.get("overall", 0)
-            }
         except json.JSONDecodeError:
-            match = re.search(r'\{.*?\}', response, re.DOTALL)
-            if match:
-                json_str = match.group(0).replace('\n', '').replace('\\', '')
+            parsed = None
+            start = response.find('{')
+            while start != -1:
                 try:
-                    parsed = json.loads(json_str)
-                    return {
-                        "grammar": parsed.get("grammar", 0),
-                        "vocabulary": parsed.get("vocabulary", 0),
-                        "content": parsed.get("content", 0),
-                        "fluency": parsed.get("fluency", 0),
-                        "pronunciation": parsed.get("pronunciation", 0),
-                        "overall": parsed.get("overall", 0)
-                    }
+                    parsed, _ = ResponseParser._decoder.raw_decode(response, start)
                 except json.JSONDecodeError:
-                    return None
-            else:
-                return None
+                    start = response.find('{', start + 1)
+                    continue
+                if isinstance(parsed, dict):
+                    break
+                start = response.find('{', start + 1)
+        return parsed if isinstance(parsed, dict) else None
 
     @staticmethod
-    def parse_holistic_response(response: str) -> dict:
-        try:
-            parsed = json.loads(response)
-            return {
-                "overall_score": parsed.get("overall_score", 0)
-            }
-        except json.JSONDecodeError:
-            match = re.search(r'\{.*?\}', response, re.DOTALL)
-            if match:
-                json_str = match.group(0).replace('\n', '').replace('\\', '')
-                try:
-                    parsed = json.loads(json_str)
-                    return {
-                        "overall_score": parsed.get("overall_score", 0)
-                    }
-                except json.JSONDecodeError:
-                    return None
-            else:
-                return None
+    def load(response: str) -> Optional[dict]:
+        """Return the JSON object in a reply, or None when there is none."""
+        return ResponseParser._load_json(response)
 
     @staticmethod
-    def parse_off_topic_response(response: str) -> dict:
-        try:
-            parsed = json.loads(response)
-            return {
-                "is_off_topic": parsed.get("off_topic", False),
-                "confidence": parsed.get("confidence", 0.0),  
-                "explanation": parsed.get("explanation", "")  
-            }
-        except json.JSONDecodeError:
-            match = re.search(r'\{.*?\}', response, re.DOTALL)
-            if match:
-                json_str = match.group(0).replace('\n', '').replace('\\', '')
-                try:
-                    parsed = json.loads(json_str)
-                    return {
-                        "is_off_topic": parsed.get("off_topic", False),
-                        "confidence": parsed.get("confidence", 0.0),  
-                        "explanation": parsed.get("explanation", "")  
-                    }
-                except json.JSONDecodeError:
-                    return None
-            else:
-                return None 
\ No newline at end of file
+    def _load_valid(response: str, schema: ResponseSchema) -> Optional[dict]:
+        """Return the reply's JSON object if it matches schema, otherwise None."""
+        parsed = ResponseParser._load_json(response)
+        return None if schema.problems(parsed) else parsed
+
+    @staticmethod
+    def validate(response: str, schema: ResponseSchema) -> List[str]:
+        """Return what is wrong with a reply according to schema; an empty list means it is valid."""
+        return schema.problems(ResponseParser._load_json(response))
+
+    @staticmethod
+    def _analytic(parsed: dict) -> dict:
+        return {domain: parsed[domain] for domain in ANALYTIC_SCHEMA.fields}
+
+    @staticmethod
+    def _holistic(parsed: dict) -> dict:
+        return {"overall_score": parsed["overall_score"]}
+
+    @staticmethod
+    def _off_topic(parsed: dict) -> dict:
+        return {
+            "is_off_topic": parsed["off_topic"],
+            "confidence": parsed["confidence"],
+            "explanation": parsed["explanation"]
+        }
+
+    @staticmethod
+    @timed()
+    def parse_analytic_response(response: str) -> Optional[dict]:
+        parsed = ResponseParser._load_valid(response, ANALYTIC_SCHEMA)
+        return ResponseParser._analytic(parsed) if parsed is not None else None
+
+    @staticmethod
+    @timed()
+    def parse_holistic_response(response: str) -> Optional[dict]:
+        parsed = ResponseParser._load_valid(response, HOLISTIC_SCHEMA)
+        return ResponseParser._holistic(parsed) if parsed is not None else None
+
+    @staticmethod
+    @timed()
+    def parse_off_topic_response(response: str) -> Optional[dict]:
+        parsed = ResponseParser._load_valid(response, OFF_TOPIC_SCHEMA)
+        return ResponseParser._off_topic(parsed) if parsed is not None else None
+
+    @staticmethod
+    @timed()
+    def parse_combined_response(response: str) -> Optional[dict]:
+        """Split a combined reply into analytic, holistic and off-topic results."""
+        parsed = ResponseParser._load_valid(response, COMBINED_SCHEMA)
+        if parsed is None:
+            return None
+        return {
+            "analytic": ResponseParser._analytic(parsed),
+            "holistic": ResponseParser._holistic(parsed),
+            "off_topic": ResponseParser._off_topic(parsed)
+        }
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from utils.config_manager import ConfigManager
+
+CACHE_FILE = 'score_cache.sqlite3'
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_AGE_DAYS = 180
+
+
+class ResultCache:
+    """
+    On-disk cache of parsed agent results.
+
+    Entries are keyed by a hash of the audio content, the rendered prompt, the
+    model name and the agent type, so editing a prompt or a task definition
+    makes the old entries unreachable; they are then removed by age/size
+    eviction, or at once with invalidate().
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " agent_type TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    @classmethod
+    def from_config(cls) -> Optional['ResultCache']:
+        """
+        Open the cache described by the RESULT_CACHE setting, or return None when disabled.
+
+        The cache lives next to config.json unless RESULT_CACHE.path is set.
+        """
+        settings = ConfigManager.get_setting('RESULT_CACHE') or {}
+        if not settings.get('enabled', True):
+            return None
+        path = settings.get('path') or os.path.join(
+            os.path.dirname(ConfigManager.get_config_path()), CACHE_FILE)
+        return cls(path,
+                   max_entries=settings.get('max_entries', DEFAULT_MAX_ENTRIES),
+                   max_age_days=settings.get('max_age_days', DEFAULT_MAX_AGE_DAYS))
+
+    @staticmethod
+    def make_key(audio_bytes: bytes, prompt: str, model_name: str, agent_type: str) -> str:
+        """Hash everything that determines an agent's answer into one cache key."""
+        digest = hashlib.sha256()
+        for part in (audio_bytes, prompt.encode('utf-8'), model_name.encode('utf-8'), agent_type.encode('utf-8')):
+            digest.update(len(part).to_bytes(8, 'big'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached result for a key, or None."""
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, agent_type: str, result: dict) -> None:
+        """Store a parsed result."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, agent_type, result, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, agent_type, json.dumps(result), now, now)
+            )
+
+    def evict(self) -> int:
+        """Drop entries older than max_age_days and the least recently used beyond max_entries."""
+        removed = 0
+        with self._lock, self._connection:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._connection.execute("DELETE FROM results WHERE created < ?", (cutoff,)).rowcount
+            if self.max_entries:
+                removed += self._connection.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    " SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+        return removed
+
+    def invalidate(self, agent_type: Optional[str] = None) -> int:
+        """Remove every entry, or only those of one agent type."""
+        with self._lock, self._connection:
+            if agent_type:
+                return self._connection.execute("DELETE FROM results WHERE agent_type = ?", (agent_type,)).rowcount
+            return self._connection.execute("DELETE FROM results").rowcount
+
+    def close(self) -> None:
+        """Apply eviction and close the database."""
+        self.evict()
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,178 @@
+import asyncio
+import random
+import re
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+from utils.config_manager import ConfigManager
+
+
+class ErrorKind(Enum):
+    RATE_LIMIT = "rate_limit"
+    TRANSIENT = "transient"
+    DEADLINE = "deadline"
+    PERMANENT = "permanent"
+
+
+TRANSIENT_STATUS_CODES = {500, 502, 503}
+TRANSIENT_MESSAGE_PATTERNS = re.compile(
+    r'\b(500|502|503)\b|unavailable|internal error|bad gateway|connection (reset|aborted|refused)|'
+    r'broken pipe|socket closed',
+    re.IGNORECASE
+)
+DEADLINE_MESSAGE_PATTERNS = re.compile(r'\b504\b|deadline|timed? ?out', re.IGNORECASE)
+RATE_LIMIT_MESSAGE_PATTERNS = re.compile(r'\b429\b|resource.?exhausted|quota|rate limit', re.IGNORECASE)
+RETRY_DELAY_PATTERNS = (
+    re.compile(r'retry in ([\d.]+)\s*s', re.IGNORECASE),
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)', re.IGNORECASE),
+    re.compile(r'retry-after:?\s*([\d.]+)', re.IGNORECASE),
+)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attribute in ('status_code', 'code'):
+        value = getattr(exc, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def classify_error(exc: BaseException) -> ErrorKind:
+    """Decide whether a failed request is worth retrying, and how."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or type(exc).__name__ == 'DeadlineExceeded':
+        return ErrorKind.DEADLINE
+    if isinstance(exc, ConnectionError):
+        return ErrorKind.TRANSIENT
+
+    status = _status_code(exc)
+    if status == 429:
+        return ErrorKind.RATE_LIMIT
+    if status == 504:
+        return ErrorKind.DEADLINE
+    if status in TRANSIENT_STATUS_CODES:
+        return ErrorKind.TRANSIENT
+    if status is not None and 400 <= status < 500:
+        return ErrorKind.PERMANENT
+
+    message = str(exc)
+    if RATE_LIMIT_MESSAGE_PATTERNS.search(message):
+        return ErrorKind.RATE_LIMIT
+    if DEADLINE_MESSAGE_PATTERNS.search(message):
+        return ErrorKind.DEADLINE
+    if TRANSIENT_MESSAGE_PATTERNS.search(message):
+        return ErrorKind.TRANSIENT
+    return ErrorKind.PERMANENT
+
+
+def server_retry_delay(exc: BaseException) -> Optional[float]:
+    """Return the delay the server asked for, from RetryInfo details, a Retry-After value or the message."""
+    for detail in getattr(exc, 'details', None) or []:
+        delay = getattr(detail, 'retry_delay', None)
+        if isinstance(delay, timedelta):
+            return delay.total_seconds()
+        if delay is not None and hasattr(delay, 'seconds'):
+            return delay.seconds + getattr(delay, 'nanos', 0) / 1e9
+
+    retry_after = getattr(exc, 'retry_after', None)
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers and headers.get('Retry-After'):
+        try:
+            return float(headers['Retry-After'])
+        except (TypeError, ValueError):
+            pass
+
+    message = str(exc)
+    for pattern in RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with decorrelated jitter and a total time budget.
+
+    Rate-limit errors start from a longer base delay than other transient errors,
+    and a delay requested by the server always takes precedence over the backoff.
+    Permanent errors are raised straight away.
+    """
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 1.0,
+                 rate_limit_base_delay: float = 5.0, max_delay: float = 60.0,
+                 max_total_delay: float = 300.0, retry_deadlines: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.rate_limit_base_delay = rate_limit_base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+        self.retry_deadlines = retry_deadlines
+
+    @classmethod
+    def from_config(cls) -> 'RetryPolicy':
+        """Build the policy from the optional RETRY_POLICY setting in config.json."""
+        settings = ConfigManager.get_setting('RETRY_POLICY') or {}
+        return cls(**{key: value for key, value in settings.items()
+                      if key in ('max_attempts', 'base_delay', 'rate_limit_base_delay',
+                                 'max_delay', 'max_total_delay', 'retry_deadlines')})
+
+    def is_retryable(self, kind: ErrorKind) -> bool:
+        if kind == ErrorKind.PERMANENT:
+            return False
+        if kind == ErrorKind.DEADLINE:
+            return self.retry_deadlines
+        return True
+
+    def next_delay(self, kind: ErrorKind, previous_delay: Optional[float],
+                   requested_delay: Optional[float] = None) -> float:
+        """Pick the next sleep: the server's request if any, otherwise decorrelated jitter."""
+        base = self.rate_limit_base_delay if kind == ErrorKind.RATE_LIMIT else self.base_delay
+        if requested_delay is not None:
+            # Spread clients that were all told the same delay over a short window.
+            return requested_delay + random.uniform(0, base)
+        upper = max(base, (previous_delay or base) * 3)
+        return min(self.max_delay, random.uniform(base, upper))
+
+    async def run(self, attempt: Callable[[], Awaitable[Any]],
+                  on_retry: Optional[Callable[[ErrorKind, int, float, BaseException], None]] = None) -> Any:
+        """
+        Await ``attempt()`` until it succeeds or the error is not worth retrying.
+
+        Args:
+            attempt: Coroutine function performing one request
+            on_retry: Called as on_retry(kind, attempt_number, delay, error) before each sleep
+
+        Raises:
+            ValueError: When the error is permanent, or the attempt or time budget runs out
+        """
+        delay = None
+        slept = 0.0
+        started = time.monotonic()
+
+        for attempt_number in range(1, self.max_attempts + 1):
+            try:
+                return await attempt()
+            except Exception as e:
+                kind = classify_error(e)
+                if not self.is_retryable(kind):
+                    raise ValueError(f"Error generating content: {str(e)}")
+                if attempt_number == self.max_attempts:
+                    raise ValueError(f"Max retries ({self.max_attempts}) exceeded. Last error: {str(e)}")
+
+                delay = self.next_delay(kind, delay, server_retry_delay(e))
+                if slept + delay > self.max_total_delay:
+                    elapsed = time.monotonic() - started
+                    raise ValueError(f"Retry time budget ({self.max_total_delay:.0f}s) exhausted after "
+                                     f"{attempt_number} attempts in {elapsed:.0f}s. Last error: {str(e)}")
+                if on_retry:
+                    on_retry(kind, attempt_number, delay, e)
+                await asyncio.sleep(delay)
+                slept += delay
@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+JOURNAL_FILE = 'scoring_journal.jsonl'
+# Scoring options that change what the journaled results mean; a run may only
+# resume a journal written with the same values
+RESULT_OPTIONS = ('analytic', 'holistic', 'off_topic', 'combined')
+
+
+class RunJournal:
+    """
+    Append-only JSONL record of every completed or failed per-agent result in a folder.
+
+    Each record is flushed as soon as it is written, so a crash loses at most
+    the requests that were in flight; a background thread fsyncs the file
+    after every batch of records, so a power cut loses at most the last
+    batch as well. The first record of each run is a header with the scoring
+    options.
+
+    Opening the journal with resume=True loads the finished results and the
+    failures of the previous run and keeps appending to the same file, after
+    checking that the previous run used the same agents and options. Otherwise
+    an existing journal is renamed with a timestamp and a fresh one started,
+    so the checkpoint of an interrupted run is never overwritten.
+    """
+
+    def __init__(self, folder_path: str, scoring_options: dict, resume: bool = False):
+        self.path = os.path.join(folder_path, JOURNAL_FILE)
+        self.completed: Dict[str, Dict[str, dict]] = {}
+        self.failed: Dict[str, Dict[str, str]] = {}
+        self.rotated_path: Optional[str] = None
+        options = self._result_options(scoring_options)
+        if resume:
+            self.check_options(self.path, scoring_options)
+            self.completed, self.failed = self.load(self.path)
+        elif os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self.rotated_path = self._rotate(self.path)
+
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._unsynced = threading.Event()
+        self._closing = False
+        self._syncer = threading.Thread(target=self._sync_loop, name='journal-fsync', daemon=True)
+        self._syncer.start()
+        self._write({
+            'type': 'run',
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'resumed': resume,
+            'options': scoring_options,
+            'result_options': options
+        })
+
+    @staticmethod
+    def _result_options(scoring_options: dict) -> Dict[str, bool]:
+        return {option: bool(scoring_options.get(option)) for option in RESULT_OPTIONS}
+
+    @staticmethod
+    def check_options(path: str, scoring_options: dict) -> None:
+        """
+        Check that the journal at path may be resumed with these scoring options.
+
+        Raises:
+            ValueError: If the last recorded run used different agents or options
+        """
+        options = RunJournal._result_options(scoring_options)
+        previous = RunJournal.load_options(path)
+        if previous is not None and previous != options:
+            raise ValueError(f"The run recorded in {path} used different scoring options "
+                             f"({RunJournal._describe(previous)}) than this one ({RunJournal._describe(options)}); "
+                             "select the same options to resume it, or start a new run")
+
+    @staticmethod
+    def _describe(options: dict) -> str:
+        return ", ".join(option for option, enabled in options.items() if enabled) or "no agents"
+
+    @staticmethod
+    def _rotate(path: str) -> str:
+        """Rename an existing journal to scoring_journal_<timestamp>.jsonl and return the new path."""
+        base, extension = os.path.splitext(path)
+        timestamp = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y%m%d_%H%M%S")
+        rotated = f"{base}_{timestamp}{extension}"
+        suffix = 1
+        while os.path.exists(rotated):
+            rotated = f"{base}_{timestamp}_{suffix}{extension}"
+            suffix += 1
+        os.replace(path, rotated)
+        return rotated
+
+    @staticmethod
+    def load_options(path: str) -> Optional[Dict[str, bool]]:
+        """Return the agent options of the last run recorded in a journal, or None if there is none."""
+        options = None
+        if not os.path.exists(path):
+            return options
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('type') == 'run':
+                    recorded = record.get('result_options') or record.get('options') or {}
+                    options = {option: bool(recorded.get(option)) for option in RESULT_OPTIONS}
+        return options
+
+    @staticmethod
+    def load(path: str) -> Tuple[Dict[str, Dict[str, dict]], Dict[str, Dict[str, str]]]:
+        """
+        Read the completed results and the failures from a journal.
+
+        Returns:
+            tuple: ({file_name: {scoring option: result dict}},
+            {file_name: {scoring option: error}}). A failure is dropped once a
+            later run records a result for it. A torn final line left by a
+            crash is ignored.
+        """
+        completed: Dict[str, Dict[str, dict]] = {}
+        failed: Dict[str, Dict[str, str]] = {}
+        if not os.path.exists(path):
+            return completed, failed
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('type') == 'result':
+                    completed.setdefault(record['file'], {})[record['agent']] = record['result']
+                    failed.get(record['file'], {}).pop(record['agent'], None)
+                elif record.get('type') == 'failure':
+                    failed.setdefault(record['file'], {})[record['agent']] = record['error']
+        return completed, {file_name: errors for file_name, errors in failed.items() if errors}
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._unsynced.set()
+
+    def _sync_loop(self) -> None:
+        """fsync the journal whenever records were written since the last fsync, off the caller's thread."""
+        while True:
+            self._unsynced.wait()
+            if self._closing:
+                return
+            self._unsynced.clear()
+            try:
+                os.fsync(self._file.fileno())
+            except (OSError, ValueError) as e:
+                print(f"Could not sync the run journal: {e}")
+
+    def record(self, file_name: str, option: str, result: dict) -> None:
+        """Append one finished agent result."""
+        self._write({'type': 'result', 'file': file_name, 'agent': option, 'result': result})
+        self.completed.setdefault(file_name, {})[option] = result
+        if self.failed.get(file_name, {}).pop(option, None) is not None and not self.failed[file_name]:
+            del self.failed[file_name]
+
+    def record_failure(self, file_name: str, option: str, error: str) -> None:
+        """Append one failed agent call, so a later run can retry just that call."""
+        self._write({'type': 'failure', 'file': file_name, 'agent': option, 'error': error})
+        self.failed.setdefault(file_name, {})[option] = error
+
+    def attempted_files(self) -> Set[str]:
+        """Return the files with at least one recorded result or failure."""
+        return set(self.completed) | set(self.failed)
+
+    def completed_result(self, file_name: str, option: str) -> Optional[dict]:
+        """Return a result already recorded for a file and scoring option, or None."""
+        return self.completed.get(file_name, {}).get(option)
+
+    def close(self) -> None:
+        """Stop the background fsync, sync the remaining records and close the file."""
+        if self._file.closed:
+            return
+        self._closing = True
+        self._unsynced.set()
+        self._syncer.join()
+        os.fsync(self._file.fileno())
+        self._file.close()
@@ -0,0 +1,124 @@
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional, TextIO
+
+# Modules listed in each section of the report
+DEFAULT_TOP = 25
+
+
+class _TimedLoader:
+    """Wraps a module's loader while it executes; the original is put back afterwards."""
+
+    def __init__(self, loader, profile: 'ImportProfile'):
+        self._loader = loader
+        self._profile = profile
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        return create_module(spec) if create_module else None
+
+    def exec_module(self, module) -> None:
+        self._profile._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._exit(module.__name__)
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfile(MetaPathFinder):
+    """
+    Measures how long every module takes to import, like ``python -X importtime``
+    but in-process, so it also works in the frozen executable.
+
+    Install it before the imports to measure; each newly imported module then
+    records its self time (its own code) and cumulative time (including the
+    modules it imported).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # module name -> (self seconds, cumulative seconds)
+        self.timings: Dict[str, tuple] = {}
+        self.marks: List[tuple] = []
+        # [module name, start time, seconds spent importing other modules]
+        self._stack: List[list] = []
+        self._finding = False
+
+    @classmethod
+    def install(cls) -> 'ImportProfile':
+        profile = cls()
+        sys.meta_path.insert(0, profile)
+        return profile
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        _, started, nested = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        self.timings[name] = (cumulative - nested, cumulative)
+        if self._stack:
+            self._stack[-1][2] += cumulative
+
+    def mark(self, label: str) -> None:
+        """Record how long after installation a startup milestone was reached."""
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def report(self, top: int = DEFAULT_TOP) -> str:
+        """Format the milestones, the slowest top-level packages and the slowest modules."""
+        lines = ["Startup profile", ""]
+        for label, seconds in self.marks:
+            lines.append(f"{seconds * 1000:10.1f} ms  {label}")
+
+        packages: Dict[str, float] = {}
+        for name, (self_seconds, _) in self.timings.items():
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0.0) + self_seconds
+        total = sum(packages.values())
+        lines += ["", f"Import time by top-level package ({len(self.timings)} modules, {total * 1000:.1f} ms):"]
+        for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"{seconds * 1000:10.1f} ms  {package}")
+
+        lines += ["", "Slowest modules (self ms, cumulative ms):"]
+        for name, (self_seconds, cumulative) in sorted(self.timings.items(), key=lambda item: -item[1][1])[:top]:
+            lines.append(f"{self_seconds * 1000:10.1f} {cumulative * 1000:10.1f}  {name}")
+        return "\n".join(lines)
+
+    def write_report(self, stream: Optional[TextIO] = None, path: Optional[str] = None) -> None:
+        """Write the report to a stream (stderr by default) or, if given, a file."""
+        text = self.report() + "\n"
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            (stream or sys.stderr).write(text)
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+CANCEL_POLL_INTERVAL = 0.2  # seconds
+
+
+async def run_bounded(
+    items: Sequence[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    limit: int,
+    on_done: Optional[Callable[[int, int, Any, Any], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> List[Any]:
+    """
+    Run ``worker`` over ``items`` with at most ``limit`` calls in flight.
+
+    Args:
+        items: Inputs to process
+        worker: Coroutine function called once per item
+        limit: Maximum number of concurrent worker calls
+        on_done: Called as on_done(completed_count, index, item, result) after each item
+        is_cancelled: Polled flag; when it returns True no new items are started
+            and the items in flight are cancelled
+
+    Returns:
+        list: One entry per item in input order. Items whose worker raised hold the
+        exception instead of a result; items that never ran because of cancellation hold None.
+    """
+    results: List[Any] = [None] * len(items)
+    if not items:
+        return results
+
+    pending = iter(enumerate(items))
+    completed = 0
+
+    async def consume():
+        nonlocal completed
+        for index, item in pending:
+            if is_cancelled and is_cancelled():
+                return
+            try:
+                results[index] = await worker(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[index] = e
+            completed += 1
+            if on_done:
+                on_done(completed, index, item, results[index])
+
+    consumers = [asyncio.create_task(consume()) for _ in range(max(1, min(limit, len(items))))]
+
+    async def watch_cancellation():
+        while not all(task.done() for task in consumers):
+            if is_cancelled():
+                for task in consumers:
+                    task.cancel()
+                return
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+
+    watcher = asyncio.create_task(watch_cancellation()) if is_cancelled else None
+    try:
+        await asyncio.gather(*consumers, return_exceptions=True)
+    finally:
+        if watcher:
+            watcher.cancel()
+
+    return results
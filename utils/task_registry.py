@@ -0,0 +1,128 @@
+import json
+import re
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from utils.config_manager import ConfigManager
+
+# Session and task number in file names like 231101013-6-t1.mp3
+SESSION_TASK_PATTERN = re.compile(r'-(\d+)-t(\d+)\.mp3$')
+
+
+def parse_task_key(file_name: str) -> Optional[Tuple[str, str]]:
+    """Return (session_id, task_id) for a file name like 231101013-6-t1.mp3, or None."""
+    match = SESSION_TASK_PATTERN.search(file_name)
+    if not match:
+        return None
+    session_id, task_number = match.groups()
+    return session_id, f"t{task_number}"
+
+
+def normalize_task_definitions(raw: dict) -> Dict[str, Dict[str, str]]:
+    """
+    Return task definitions as {session_id: {task_id: text}}.
+
+    Older config dialogs stored each session as a JSON-encoded string with
+    escaped newlines; those sessions are decoded here once.
+    """
+    sessions = {}
+    for session_id, tasks in (raw or {}).items():
+        if isinstance(tasks, str):
+            try:
+                tasks = json.loads(tasks.rstrip(',').strip())
+            except json.JSONDecodeError as e:
+                print(f"Error parsing task data for session {session_id}: {e}")
+                continue
+            tasks = {task_id: text.replace('\\n', '\n') for task_id, text in tasks.items()}
+        if tasks:
+            sessions[str(session_id)] = {str(task_id): text for task_id, text in tasks.items()}
+    return sessions
+
+
+class TaskRegistry:
+    """
+    Task definitions indexed by (session_id, task_id).
+
+    The built-in definitions in task_definitions.py are merged with
+    TASK_DEFINITIONS from config.json, where a config entry replaces the
+    built-in text of the same session and task. They are indexed
+    once per config snapshot, so they are reloaded whenever ConfigManager
+    rereads a changed config.json.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._source: Optional[Mapping] = None
+        self._sessions: Dict[str, Dict[str, str]] = {}
+        self._index: Dict[Tuple[str, str], str] = {}
+        # Incremented on every reload so callers can drop anything derived from the old definitions
+        self.generation = 0
+
+    def _refresh(self) -> None:
+        config = ConfigManager.load_config()
+        with self._lock:
+            if config is self._source:
+                return
+            from task_definitions import TASK_DEFINITIONS
+            sessions = normalize_task_definitions(TASK_DEFINITIONS)
+            for session_id, tasks in normalize_task_definitions(config.get('TASK_DEFINITIONS')).items():
+                sessions[session_id] = {**sessions.get(session_id, {}), **tasks}
+            self._sessions = sessions
+            self._index = {(session_id, task_id): text
+                           for session_id, tasks in sessions.items()
+                           for task_id, text in tasks.items()}
+            self._source = config
+            self.generation += 1
+
+    def get(self, session_id: str, task_id: str) -> str:
+        """
+        Return the definition of a task.
+
+        Raises:
+            KeyError: When the session or task is not defined
+        """
+        self._refresh()
+        try:
+            return self._index[(session_id, task_id)]
+        except KeyError:
+            raise KeyError(f"No task definition for session {session_id}, task {task_id}") from None
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        self._refresh()
+        return key in self._index
+
+    def as_dict(self) -> Dict[str, Dict[str, str]]:
+        """Return a copy of the definitions as {session_id: {task_id: text}}."""
+        self._refresh()
+        return {session_id: dict(tasks) for session_id, tasks in self._sessions.items()}
+
+    def tasks_for(self, file_names: Iterable[str]) -> set:
+        """Return the defined (session_id, task_id) pairs used by the given files."""
+        self._refresh()
+        tasks = set()
+        for file_name in file_names:
+            key = parse_task_key(file_name)
+            if key in self._index:
+                tasks.add(key)
+        return tasks
+
+    def validate(self, file_names: Iterable[str]) -> Dict[str, str]:
+        """Return {file name: reason} for the files that cannot be matched to a task definition."""
+        self._refresh()
+        problems = {}
+        for file_name in file_names:
+            key = parse_task_key(file_name)
+            if key is None:
+                problems[file_name] = "File name does not match YYMMDDXXX-S-tT.mp3"
+            elif key[0] not in self._sessions:
+                problems[file_name] = f"No task definitions for session {key[0]}"
+            elif key not in self._index:
+                problems[file_name] = f"No task definition for session {key[0]}, task {key[1]}"
+        return problems
+
+
+_registry = TaskRegistry()
+
+
+def get_task_registry() -> TaskRegistry:
+    """Return the process-wide task registry."""
+    return _registry